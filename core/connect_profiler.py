@@ -0,0 +1,267 @@
+# core/connect_profiler.py
+# SSH 연결 과정을 단계별(DNS, TCP, 배너, 키 교환, 호스트 키, 인증, 터널)로 측정하고 서버별로 보관
+
+import collections
+import json
+import socket
+import threading
+import time
+
+import paramiko
+
+PHASE_DNS = "dns"
+PHASE_TCP = "tcp"
+PHASE_BANNER = "banner"
+PHASE_KEX = "kex"
+PHASE_HOST_KEY = "host_key"
+PHASE_AUTH = "auth"
+
+# 연결 순서대로 나열한 단계와 화면 표시용 이름
+PHASES = (PHASE_DNS, PHASE_TCP, PHASE_BANNER, PHASE_KEX, PHASE_HOST_KEY, PHASE_AUTH)
+PHASE_LABELS = {
+    PHASE_DNS: "DNS",
+    PHASE_TCP: "TCP",
+    PHASE_BANNER: "배너",
+    PHASE_KEX: "키 교환",
+    PHASE_HOST_KEY: "호스트 키",
+    PHASE_AUTH: "인증",
+}
+
+# 서버마다 보관하는 최근 연결 기록 수
+DEFAULT_PROFILE_HISTORY = 20
+
+
+class ConnectProfile:
+    """
+    한 번의 연결 시도에 대한 단계별 소요 시간 (초).
+
+    mark(phase)는 직전 단계가 끝난 시각부터 지금(또는 at)까지를 phase의 시간으로 기록한다.
+    실패하면 fail()로 실패한 단계와 사유를 남기며, 그 단계에는 실패까지 걸린 시간이 들어간다.
+    """
+
+    def __init__(self, server_info, clock=time.monotonic):
+        self.name = server_info.get("name", "")
+        self.host = server_info.get("host", "")
+        self.port = server_info.get("port")
+        self.username = server_info.get("username", "")
+        self.started_at = time.time()
+        self._clock = clock
+        self._last = clock()
+        self.phases = {}
+        self.tunnels = []
+        self.failed_phase = None
+        self.error = None
+
+    @property
+    def key(self):
+        return (str(self.host).lower(), self.port, self.username)
+
+    @property
+    def success(self):
+        return self.error is None and PHASE_AUTH in self.phases
+
+    @property
+    def connect_time(self):
+        """TCP 연결부터 인증까지 (터널 제외)"""
+        return sum(self.phases.values())
+
+    @property
+    def total_time(self):
+        return self.connect_time + sum(t["seconds"] for t in list(self.tunnels))
+
+    def mark(self, phase, at=None):
+        at = self._clock() if at is None else at
+        self.phases[phase] = max(0.0, at - self._last)
+        self._last = at
+
+    def mark_transport(self, transport):
+        """
+        ProfilingTransport가 남긴 시각으로 배너~호스트 키 단계를 채운다.
+        아직 끝나지 않은 첫 단계(성공했다면 PHASE_AUTH)를 반환한다.
+        """
+        steps = (
+            (PHASE_BANNER, getattr(transport, "banner_at", None)),
+            (PHASE_KEX, getattr(transport, "kex_done_at", None)),
+            (PHASE_HOST_KEY, getattr(transport, "auth_started_at", None)),
+        )
+        for i, (phase, at) in enumerate(steps):
+            if at is None:
+                # 배너 시각만 빠진 경우(paramiko 내부 변경)는 키 교환에 합쳐서 센다
+                if any(later is not None for _, later in steps[i + 1:]):
+                    continue
+                return phase
+            self.mark(phase, at)
+        return PHASE_AUTH
+
+    def fail(self, phase, error):
+        self.mark(phase)
+        self.failed_phase = phase
+        self.error = str(error) or type(error).__name__
+
+    def add_tunnel(self, tunnel, seconds, error=None):
+        self.tunnels.append({
+            "name": tunnel.get("name", ""),
+            "local": tunnel.get("local"),
+            "seconds": seconds,
+            "error": None if error is None else str(error),
+        })
+
+    def slowest_phase(self):
+        if not self.phases:
+            return None
+        return max(self.phases, key=self.phases.get)
+
+    def summary(self):
+        """'DNS 0.01s / TCP 0.05s / ...' 형태의 한 줄 요약"""
+        parts = [
+            f"{PHASE_LABELS[phase]} {self.phases[phase]:.2f}s"
+            for phase in PHASES
+            if phase in self.phases
+        ]
+        if self.tunnels:
+            parts.append(f"터널 {len(self.tunnels)}개 {sum(t['seconds'] for t in self.tunnels):.2f}s")
+        return " / ".join(parts)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "host": self.host,
+            "port": self.port,
+            "username": self.username,
+            "started_at": self.started_at,
+            "success": self.success,
+            "failed_phase": self.failed_phase,
+            "error": self.error,
+            "phases": {phase: self.phases[phase] for phase in PHASES if phase in self.phases},
+            "tunnels": [dict(t) for t in list(self.tunnels)],
+            "connect_time": self.connect_time,
+            "total_time": self.total_time,
+        }
+
+
+class ProfilingTransport(paramiko.Transport):
+    """
+    배너 수신, 키 교환 완료, 첫 인증 시도 시각을 기록하는 Transport.
+    SSHClient.connect(transport_factory=ProfilingTransport)로 사용한다.
+    호스트 키 검증은 키 교환이 끝난 뒤 첫 인증 시도 전까지의 구간으로 잰다.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.banner_at = None
+        self.kex_done_at = None
+        self.auth_started_at = None
+
+    def _check_banner(self):
+        # 트랜스포트 스레드에서 서버 배너를 읽은 직후
+        super()._check_banner()
+        self.banner_at = time.monotonic()
+
+    def start_client(self, event=None, timeout=None):
+        super().start_client(event, timeout)
+        self.kex_done_at = time.monotonic()
+
+    def _auth_started(self):
+        if self.auth_started_at is None:
+            self.auth_started_at = time.monotonic()
+
+    def auth_none(self, *args, **kwargs):
+        self._auth_started()
+        return super().auth_none(*args, **kwargs)
+
+    def auth_password(self, *args, **kwargs):
+        self._auth_started()
+        return super().auth_password(*args, **kwargs)
+
+    def auth_publickey(self, *args, **kwargs):
+        self._auth_started()
+        return super().auth_publickey(*args, **kwargs)
+
+    def auth_interactive(self, *args, **kwargs):
+        self._auth_started()
+        return super().auth_interactive(*args, **kwargs)
+
+
+def resolve(host, port):
+    """DNS 조회 (TCP 주소 목록)"""
+    return socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+
+
+def open_socket(addresses, timeout):
+    """getaddrinfo 결과를 순서대로 시도해 처음 연결된 소켓을 반환"""
+    last_error = None
+    for family, socktype, proto, _, address in addresses:
+        sock = socket.socket(family, socktype, proto)
+        try:
+            sock.settimeout(timeout)
+            sock.connect(address)
+            return sock
+        except OSError as e:
+            last_error = e
+            sock.close()
+    raise last_error or OSError("연결할 주소가 없습니다")
+
+
+class ConnectProfileStore:
+    """서버((host, port, username))별 최근 연결 기록. 여러 연결 스레드에서 동시에 기록한다."""
+
+    def __init__(self, history=DEFAULT_PROFILE_HISTORY):
+        self.history = history
+        self._profiles = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, profile):
+        with self._lock:
+            profiles = self._profiles.get(profile.key)
+            if profiles is None:
+                profiles = self._profiles[profile.key] = collections.deque(maxlen=self.history)
+            profiles.append(profile)
+
+    def latest(self):
+        """서버별 가장 최근 기록 (연결 시간이 긴 순서)"""
+        with self._lock:
+            profiles = [history[-1] for history in self._profiles.values() if history]
+        return sorted(profiles, key=lambda profile: -profile.total_time)
+
+    def history_for(self, key):
+        with self._lock:
+            return list(self._profiles.get(key, ()))
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+    def to_dict(self):
+        with self._lock:
+            histories = [list(history) for history in self._profiles.values()]
+        return {
+            "exported_at": time.time(),
+            "servers": [
+                {
+                    "name": history[-1].name,
+                    "host": history[-1].host,
+                    "port": history[-1].port,
+                    "username": history[-1].username,
+                    "profiles": [profile.to_dict() for profile in history],
+                }
+                for history in histories
+                if history
+            ],
+        }
+
+    def export_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=4)
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_connect_profile_store():
+    """앱 전체에서 공유하는 연결 기록 저장소"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ConnectProfileStore()
+        return _default_store
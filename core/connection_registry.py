@@ -0,0 +1,276 @@
+# core/connection_registry.py
+# (host, port, username, 인증 정보)마다 SSHManager 하나를 공유하는 연결 레지스트리
+
+import hashlib
+import hmac
+import os
+import threading
+
+from core.encryption import decrypt_password
+from core.ssh_manager import (
+    RECONNECT_STALL_TIMEOUT,
+    STATE_CONNECTED,
+    STATE_DISCONNECTED,
+    STATE_FAILED,
+    STATE_RECONNECTING,
+    SSHManager,
+)
+
+# 참조가 모두 반납된 연결을 닫기 전까지 유지하는 시간 (초)
+DEFAULT_IDLE_CLOSE_TIMEOUT = 60.0
+
+
+# 인증 정보 지문용 프로세스별 비밀값 (메모리의 키에 비밀번호 해시가 그대로 남지 않게)
+_FINGERPRINT_SECRET = os.urandom(32)
+
+
+def credential_fingerprint(server_info):
+    """
+    인증 정보(복호화한 비밀번호)의 지문. 암호문은 암호화할 때마다 달라지므로
+    복호화한 값으로 비교하며, 복호화에 실패하면 암호문 자체를 쓴다.
+    """
+    token = server_info.get("password") or ""
+    try:
+        secret = decrypt_password(token) if token else ""
+    except Exception:
+        secret = token
+    return hmac.new(_FINGERPRINT_SECRET, secret.encode(), hashlib.sha256).hexdigest()
+
+
+def connection_key(server_info):
+    """
+    공유 단위가 되는 (host, port, username, 인증 정보 지문) 키.
+    같은 계정이라도 인증 정보가 다른 서버 항목은 연결을 공유하지 않는다.
+    """
+    return (
+        str(server_info["host"]).lower(),
+        int(server_info["port"]),
+        server_info["username"],
+        credential_fingerprint(server_info),
+    )
+
+
+class _Entry:
+    def __init__(self, key, ssh_manager):
+        self.key = key
+        self.ssh_manager = ssh_manager
+        self.refs = 0
+        self.idle_timer = None
+        # 같은 키로 동시에 들어온 연결 요청이 connect()를 중복 호출하지 않도록 직렬화
+        self.connect_lock = threading.Lock()
+        # 터널 추가/제거와 소유 기록을 한 번에 처리하기 위한 잠금
+        self.tunnel_lock = threading.Lock()
+        # owner → 그 참조가 요청해 열려 있는 터널의 로컬 포트 집합
+        self.owners = {}
+        # connect()로 릴레이를 새로 띄울 때마다 증가 (이전 릴레이 기준의 소유 기록 무효화)
+        self.generation = 0
+        # 서버 정보가 바뀌어 새 acquire가 더는 재사용하지 않는 연결
+        self.retired = False
+
+
+class ConnectionRegistry:
+    """
+    같은 (host, port, username)에 같은 인증 정보로 향하는 터미널·터널·스크립트가
+    하나의 SSHManager(= paramiko Transport 하나)를 나누어 쓰도록 관리한다.
+
+    acquire()/retain()으로 참조를 얻고 release()로 반납한다. 참조가 0이 되면
+    idle_timeout 뒤에 연결을 닫으며, 그 전에 다시 acquire 되면 그대로 재사용한다.
+    사용자가 직접 연결을 끊는 경우에는 release(close=True)로 유예 없이 닫는다.
+
+    acquire(server_info, owner)는 server_info의 터널 중 아직 열리지 않은 로컬
+    포트만 추가하고, 그 포트들을 owner(서버 id 등)의 소유로 기록한다.
+    release(ssh_manager, owner)는 다른 owner가 쓰지 않는 그 owner의 터널을 바로
+    닫는다. owner 없이 연 터널은 공유 연결이 닫힐 때 함께 정리된다.
+
+    서버 정보가 수정되면 invalidate()로 그 키의 연결을 떼어 낸다. 이후의 acquire는
+    새 정보로 새 연결을 만들고, 기존 참조가 모두 반납되면 옛 연결은 바로 닫힌다.
+    재연결 중인 연결을 acquire 하면 connect()로 끊지 않고 그 재연결에 합류한다.
+    """
+
+    def __init__(self, idle_timeout=DEFAULT_IDLE_CLOSE_TIMEOUT, manager_factory=SSHManager):
+        self.idle_timeout = idle_timeout
+        self._manager_factory = manager_factory
+        self._entries = {}
+        self._by_manager = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def acquire(self, server_info, owner=None):
+        """
+        server_info에 해당하는 공유 연결의 참조를 하나 얻는다. 연결되어 있지 않으면
+        연결을 시도하므로 GUI 스레드가 아닌 곳에서 호출해야 한다.
+        owner: 이 참조가 연 터널의 소유자. release()에 같은 값을 넘기면 터널도 닫힌다.
+
+        (ssh_manager, 성공 여부, profile)을 반환하며, 실패한 경우 참조는 이미 반납되어 있다.
+        profile은 이번 호출이 connect()를 했을 때의 ConnectProfile이고, 이미 열린
+        공유 연결을 재사용했으면 None이다.
+        재연결이 RECONNECT_STALL_TIMEOUT 안에 끝나지 않으면 재연결 중인 매니저를
+        성공으로 돌려주므로 호출 측은 ssh_manager.state를 확인해야 한다.
+        """
+        key = connection_key(server_info)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry(key, self._manager_factory(server_info))
+                self._entries[key] = entry
+                self._by_manager[id(entry.ssh_manager)] = entry
+            self._retain_locked(entry)
+
+        ssh_manager = entry.ssh_manager
+        tunnels = server_info.get("tunnels", [])
+        profile = None
+        # 다른 참조가 쓰는 연결의 재연결을 connect()로 끊지 않도록 먼저 기다린다
+        if ssh_manager.state == STATE_RECONNECTING:
+            ssh_manager.wait_for_reconnect(RECONNECT_STALL_TIMEOUT)
+        with entry.connect_lock:
+            if ssh_manager.state == STATE_RECONNECTING or (
+                ssh_manager.state == STATE_CONNECTED and ssh_manager.transport is not None
+            ):
+                # 재연결 중에도 릴레이(리스닝 소켓)는 유지되므로 터널을 그대로 붙인다
+                with entry.tunnel_lock:
+                    ssh_manager.add_tunnels(tunnels)
+                    self._record_owner(entry, owner, tunnels)
+                success = True
+            else:
+                # 새 연결은 릴레이를 새로 띄우므로 이전 소유 기록은 의미가 없다
+                with self._lock:
+                    entry.owners.clear()
+                    entry.generation += 1
+                success = ssh_manager.connect(tunnels)
+                profile = ssh_manager.last_connect_profile
+                if success:
+                    with entry.tunnel_lock:
+                        self._record_owner(entry, owner, tunnels)
+
+        if not success:
+            self.release(ssh_manager)
+        return ssh_manager, success, profile
+
+    def retain(self, ssh_manager):
+        """
+        이미 얻은 공유 연결의 참조를 하나 더 늘린다 (터미널 탭 등).
+        등록되지 않은 매니저면 아무것도 하지 않고 False를 반환한다.
+        """
+        with self._lock:
+            entry = self._by_manager.get(id(ssh_manager))
+            if entry is None:
+                return False
+            self._retain_locked(entry)
+            return True
+
+    def release(self, ssh_manager, owner=None, close=False):
+        """
+        참조를 하나 반납한다. 마지막 참조이면 idle_timeout 뒤에 연결을 닫고,
+        close=True이거나 이미 끊어진 연결이면 즉시 정리한다.
+        등록되지 않은 매니저는 바로 disconnect 한다.
+
+        owner: acquire()에 넘긴 소유자. 다른 소유자가 쓰지 않는 그 터널은 바로 닫는다.
+        """
+        close_now = False
+        ports = set()
+        with self._lock:
+            entry = self._by_manager.get(id(ssh_manager))
+            if entry is None:
+                close_now = True
+            else:
+                if owner is not None:
+                    ports = entry.owners.pop(owner, set())
+                    generation = entry.generation
+                entry.refs = max(0, entry.refs - 1)
+                if entry.refs == 0:
+                    if (close or entry.retired
+                            or ssh_manager.state in (STATE_DISCONNECTED, STATE_FAILED)
+                            or self.idle_timeout <= 0):
+                        self._forget_locked(entry)
+                        close_now = True
+                    else:
+                        entry.idle_timer = threading.Timer(
+                            self.idle_timeout, self._close_if_idle, args=(entry,)
+                        )
+                        entry.idle_timer.daemon = True
+                        entry.idle_timer.start()
+        if close_now:
+            ssh_manager.disconnect()
+        elif ports:
+            with entry.tunnel_lock:
+                with self._lock:
+                    if entry.generation != generation:
+                        ports = set()
+                    else:
+                        ports = ports.difference(*entry.owners.values())
+                ssh_manager.remove_tunnels(ports)
+
+    def invalidate(self, server_info):
+        """
+        server_info(수정 전 정보)의 공유 연결을 새 acquire가 재사용하지 않도록 떼어 낸다.
+        남은 참조가 없으면 바로 닫고, 있으면 마지막 release() 때 유예 없이 닫는다.
+        """
+        with self._lock:
+            entry = self._entries.pop(connection_key(server_info), None)
+            if entry is None:
+                return
+            entry.retired = True
+            if entry.refs > 0:
+                return
+            self._forget_locked(entry)
+        entry.ssh_manager.disconnect()
+
+    def ref_count(self, ssh_manager):
+        with self._lock:
+            entry = self._by_manager.get(id(ssh_manager))
+            return entry.refs if entry is not None else 0
+
+    def close_all(self):
+        """앱 종료 시 모든 공유 연결을 참조 수와 무관하게 닫는다."""
+        with self._lock:
+            entries = list(self._entries.values())
+            for entry in entries:
+                self._forget_locked(entry)
+        for entry in entries:
+            entry.ssh_manager.disconnect()
+
+    def _record_owner(self, entry, owner, tunnels):
+        """tunnels 중 실제로 열려 있는 포트를 owner의 소유로 기록 (tunnel_lock 안에서 호출)"""
+        if owner is None:
+            return
+        ports = {tunnel.get("local") for tunnel in tunnels} & entry.ssh_manager.tunnel_ports()
+        with self._lock:
+            entry.owners.setdefault(owner, set()).update(ports)
+
+    def _retain_locked(self, entry):
+        entry.refs += 1
+        if entry.idle_timer is not None:
+            entry.idle_timer.cancel()
+            entry.idle_timer = None
+
+    def _forget_locked(self, entry):
+        if entry.idle_timer is not None:
+            entry.idle_timer.cancel()
+            entry.idle_timer = None
+        if self._entries.get(entry.key) is entry:
+            del self._entries[entry.key]
+        self._by_manager.pop(id(entry.ssh_manager), None)
+
+    def _close_if_idle(self, entry):
+        with self._lock:
+            if entry.refs > 0 or self._by_manager.get(id(entry.ssh_manager)) is not entry:
+                return
+            self._forget_locked(entry)
+        print(f"[-] {entry.ssh_manager.server_info.get('name', '')} 유휴 연결 종료")
+        entry.ssh_manager.disconnect()
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_connection_registry():
+    """앱 전체에서 공유하는 기본 레지스트리"""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = ConnectionRegistry()
+        return _default_registry
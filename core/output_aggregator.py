@@ -0,0 +1,105 @@
+# core/output_aggregator.py
+# 여러 서버의 명령 출력을 해시로 비교해 같은 결과끼리 묶는 집계기 (dshbak -c 방식)
+
+import collections
+import hashlib
+
+from core.remote_exec import STDERR, STDOUT
+
+# 그룹 대표 출력으로 보관하는 스트림별 최대 글자 수 (해시는 전체 출력으로 계산)
+DEFAULT_SAMPLE_CHARS = 64 * 1024
+
+# keys: 같은 결과를 낸 서버 key 목록 (완료 순서)
+# stdout/stderr: 대표 출력 (sample_chars까지), truncated: 대표 출력이 잘렸는지
+OutputGroup = collections.namedtuple(
+    "OutputGroup", "keys exit_code error stdout stderr truncated"
+)
+
+
+class _HostOutput:
+    __slots__ = ("hashers", "samples", "sizes")
+
+    def __init__(self):
+        self.hashers = {STDOUT: hashlib.blake2b(digest_size=16),
+                        STDERR: hashlib.blake2b(digest_size=16)}
+        self.samples = {STDOUT: [], STDERR: []}
+        self.sizes = {STDOUT: 0, STDERR: 0}
+
+
+class _Group:
+    __slots__ = ("keys", "exit_code", "error", "stdout", "stderr", "truncated")
+
+
+class OutputAggregator:
+    """
+    서버별 출력을 도착하는 대로 해시에 누적하고, 서버 실행이 끝나면
+    (stdout 해시, stderr 해시, 종료 코드, 오류)가 같은 서버끼리 한 그룹으로 묶는다.
+
+    출력 전체를 보관하지 않는다. 실행 중인 서버마다 스트림별 sample_chars까지만 두고,
+    완료 시 새 그룹이면 그 샘플을 대표 출력으로 넘기고 기존 그룹이면 버린다.
+    따라서 메모리는 서버 수가 아니라 (실행 중인 서버 + 서로 다른 결과) 수에 비례한다.
+    """
+
+    def __init__(self, sample_chars=DEFAULT_SAMPLE_CHARS):
+        self.sample_chars = sample_chars
+        self._running = {}
+        self._groups = {}
+        self.finished_count = 0
+
+    def __len__(self):
+        return len(self._groups)
+
+    def feed(self, key, stream, text):
+        """서버 key의 stream(STDOUT/STDERR) 출력 조각을 누적"""
+        host = self._running.get(key)
+        if host is None:
+            host = self._running[key] = _HostOutput()
+        host.hashers[stream].update(text.encode("utf-8", "surrogatepass"))
+        remaining = self.sample_chars - host.sizes[stream]
+        if remaining > 0:
+            host.samples[stream].append(text[:remaining])
+        host.sizes[stream] += len(text)
+
+    def finish(self, key, exit_code, error=None):
+        """
+        서버 key의 실행 완료. 새 그룹이 만들어졌으면 True를 반환한다.
+        """
+        host = self._running.pop(key, None) or _HostOutput()
+        digest = (
+            host.hashers[STDOUT].digest(),
+            host.hashers[STDERR].digest(),
+            exit_code,
+            error,
+        )
+        self.finished_count += 1
+
+        group = self._groups.get(digest)
+        created = group is None
+        if created:
+            group = _Group()
+            group.keys = []
+            group.exit_code = exit_code
+            group.error = error
+            group.stdout = "".join(host.samples[STDOUT])
+            group.stderr = "".join(host.samples[STDERR])
+            group.truncated = any(size > self.sample_chars for size in host.sizes.values())
+            self._groups[digest] = group
+        group.keys.append(key)
+        return created
+
+    def groups(self):
+        """그룹 목록 (서버가 많은 그룹부터)"""
+        groups = sorted(self._groups.values(), key=lambda group: -len(group.keys))
+        return [self._snapshot(group) for group in groups]
+
+    def clear(self):
+        self._running.clear()
+        self._groups.clear()
+        self.finished_count = 0
+
+    @staticmethod
+    def _snapshot(group):
+        return OutputGroup(
+            tuple(group.keys), group.exit_code, group.error,
+            group.stdout, group.stderr, group.truncated,
+        )
@@ -0,0 +1,88 @@
+# core/remote_exec.py
+# SSHManager의 공유 트랜스포트에서 명령을 실행하고 stdout/stderr를 스트리밍
+
+import codecs
+import collections
+import select
+import time
+
+# 한 번의 recv로 읽는 최대 바이트 수
+EXEC_READ_CHUNK = 32 * 1024
+
+# stderr는 fileno 알림이 없으므로 이 주기로도 확인한다
+EXEC_POLL_INTERVAL = 0.1
+
+STDOUT = "stdout"
+STDERR = "stderr"
+
+# exit_code: 원격 종료 코드 (취소/시간 초과/오류면 None)
+# duration: 실행 시간 (초), error: 실패 사유 문자열 또는 None
+ExecResult = collections.namedtuple("ExecResult", "exit_code duration error")
+
+
+def execute(ssh_manager, command, on_output, cancel=None, timeout=None):
+    """
+    ssh_manager의 트랜스포트에 세션 채널을 열어 command를 실행한다.
+
+    on_output(stream, text): 출력이 도착할 때마다 호출 (stream은 STDOUT/STDERR).
+        UTF-8은 증분 디코딩하므로 청크 경계에서 글자가 깨지지 않는다.
+    cancel: threading.Event. 설정되면 채널을 닫고 중단한다.
+    timeout: 전체 실행 제한 시간 (초). None이면 무제한.
+    """
+    start = time.monotonic()
+
+    def result(exit_code, error=None):
+        return ExecResult(exit_code, time.monotonic() - start, error)
+
+    try:
+        channel = ssh_manager.open_session()
+    except Exception as e:
+        return result(None, f"세션을 열 수 없습니다: {e}")
+
+    decoders = {
+        STDOUT: codecs.getincrementaldecoder("utf-8")(errors="replace"),
+        STDERR: codecs.getincrementaldecoder("utf-8")(errors="replace"),
+    }
+    readers = (
+        (STDOUT, channel.recv_ready, channel.recv),
+        (STDERR, channel.recv_stderr_ready, channel.recv_stderr),
+    )
+
+    try:
+        channel.exec_command(command)
+        channel.shutdown_write()
+
+        while True:
+            if cancel is not None and cancel.is_set():
+                return result(None, "취소됨")
+            if timeout is not None and time.monotonic() - start > timeout:
+                return result(None, "시간 초과")
+
+            select.select([channel], [], [], EXEC_POLL_INTERVAL)
+
+            for stream, ready, recv in readers:
+                while ready():
+                    data = recv(EXEC_READ_CHUNK)
+                    if not data:
+                        break
+                    text = decoders[stream].decode(data)
+                    if text:
+                        on_output(stream, text)
+
+            if channel.exit_status_ready() and not channel.recv_ready() \
+                    and not channel.recv_stderr_ready():
+                break
+
+        for stream, decoder in decoders.items():
+            text = decoder.decode(b"", final=True)
+            if text:
+                on_output(stream, text)
+        return result(channel.recv_exit_status())
+
+    except Exception as e:
+        return result(None, str(e))
+    finally:
+        try:
+            channel.close()
+        except Exception:
+            pass
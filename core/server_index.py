@@ -0,0 +1,220 @@
+# core/server_index.py
+# 서버 목록 검색용 메모리 인덱스 (이름·호스트·사용자 trigram, 태그·터널 포트 역색인)
+
+import collections
+import operator
+
+# 검색어에서 필드를 지정하는 접두어 (예: tag:web, port:8080)
+FIELD_NAME = "name"
+FIELD_HOST = "host"
+FIELD_USER = "user"
+FIELD_TAG = "tag"
+FIELD_PORT = "port"
+
+_TEXT_FIELDS = (FIELD_NAME, FIELD_HOST, FIELD_USER)
+_FIELDS = _TEXT_FIELDS + (FIELD_TAG, FIELD_PORT)
+
+# 남은 후보가 이 수 이하면 다음 토큰은 색인 대신 후보마다 직접 확인
+_DIRECT_CHECK_LIMIT = 2000
+_EMPTY = frozenset()
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _short_grams(text):
+    """한두 글자 검색어용: 모든 1글자·2글자 부분 문자열"""
+    grams = set(text)
+    grams.update(map(operator.add, text, text[1:]))
+    return grams
+
+
+class ServerSearchIndex:
+    """
+    ServerSummary 목록에 대한 검색 인덱스. add()/remove()로 한 대씩 갱신한다.
+
+    검색어는 공백으로 나눈 토큰을 모두 만족하는(AND) 서버를 찾는다.
+    - 일반 토큰: 이름·호스트·사용자에 부분 문자열로 포함되거나, 태그와 같거나,
+      터널 로컬 포트(또는 SSH 포트)와 같은 서버
+    - name:/host:/user: 해당 필드에서만 검색
+    - tag:/port: 태그·포트 역색인에서 정확히 일치
+
+    이름·호스트·사용자는 줄바꿈으로 이어 trigram 색인을 만들고(3글자 이상 토큰,
+    검색어에는 줄바꿈이 없으므로 필드 경계를 넘는 trigram은 맞지 않는다),
+    1~2글자 토큰은 같은 문자열의 unigram·bigram 색인으로 찾으므로 토큰 길이와
+    관계없이 부분 문자열이면 맞는다. 후보가 가장 적은 토큰으로 먼저 좁힌 뒤,
+    후보가 적으면 나머지 토큰은 색인 대신 후보마다 직접 확인한다.
+    """
+
+    def __init__(self, summaries=()):
+        # id -> (이름, 호스트, 사용자, 세 값을 줄바꿈으로 이은 문자열) 소문자
+        self._texts = {}
+        self._tags = {}
+        self._ports = {}
+        # 검색 결과 정렬용 순번 (목록 순서)
+        self._order = {}
+        self._next_order = 0
+        self._trigram_index = collections.defaultdict(set)
+        self._short_index = collections.defaultdict(set)
+        self._tag_index = collections.defaultdict(set)
+        self._port_index = collections.defaultdict(set)
+        for summary in summaries:
+            self.add(summary)
+
+    def __len__(self):
+        return len(self._texts)
+
+    def __contains__(self, server_id):
+        return server_id in self._texts
+
+    def add(self, summary):
+        """서버 하나를 색인 (이미 있으면 갱신하며 목록 순서는 유지)"""
+        server_id = summary.id
+        if server_id in self._texts:
+            self._unindex(server_id)
+        else:
+            self._order[server_id] = self._next_order
+            self._next_order += 1
+
+        fields = (summary.name.lower(), summary.host.lower(), summary.username.lower())
+        texts = fields + ("\n".join(fields),)
+        tags = {str(tag).lower() for tag in summary.tags}
+        ports = {str(port) for port in summary.tunnel_ports}
+        if summary.port is not None:
+            ports.add(str(summary.port))
+
+        self._texts[server_id] = texts
+        self._tags[server_id] = tags
+        self._ports[server_id] = ports
+        trigram_index = self._trigram_index
+        for gram in _trigrams(texts[-1]):
+            trigram_index[gram].add(server_id)
+        short_index = self._short_index
+        for gram in _short_grams(texts[-1]):
+            short_index[gram].add(server_id)
+        for tag in tags:
+            self._tag_index[tag].add(server_id)
+        for port in ports:
+            self._port_index[port].add(server_id)
+
+    def remove(self, server_id):
+        if server_id in self._texts:
+            self._unindex(server_id)
+            del self._texts[server_id]
+            del self._tags[server_id]
+            del self._ports[server_id]
+            del self._order[server_id]
+
+    def search(self, query):
+        """
+        검색어에 맞는 서버 id 목록 (목록 순서). 빈 검색어면 None (= 필터 없음).
+        """
+        tokens = [self._parse(token) for token in query.lower().split()]
+        if not tokens:
+            return None
+
+        tokens.sort(key=self._estimate)
+        result = None
+        for field, value in tokens:
+            if result is not None and len(result) <= _DIRECT_CHECK_LIMIT:
+                result = self._filter(result, field, value)
+            else:
+                candidates = self._candidates(field, value)
+                result = candidates if result is None else result & candidates
+                if self._needs_check(field, value):
+                    result = self._filter(result, field, value)
+            if not result:
+                return []
+        return sorted(result, key=self._order.__getitem__)
+
+    # ---------- 토큰 처리 ----------
+
+    @staticmethod
+    def _parse(token):
+        field, sep, value = token.partition(":")
+        if sep and value and field in _FIELDS:
+            return field, value
+        return None, token
+
+    def _estimate(self, token):
+        """토큰이 맞을 후보 수의 상한 (작은 토큰부터 처리)"""
+        field, value = token
+        if field == FIELD_TAG:
+            return len(self._tag_index.get(value, _EMPTY))
+        if field == FIELD_PORT:
+            return len(self._port_index.get(value, _EMPTY))
+        text = self._text_candidates_size(value)
+        if field is None:
+            text += len(self._tag_index.get(value, _EMPTY)) + len(self._port_index.get(value, _EMPTY))
+        return text
+
+    def _text_candidates_size(self, value):
+        if len(value) < 3:
+            return len(self._short_index.get(value, _EMPTY))
+        return min((len(self._trigram_index.get(gram, _EMPTY)) for gram in _trigrams(value)), default=0)
+
+    def _candidates(self, field, value):
+        """토큰에 맞을 수 있는 id 집합 (색인 집합 그대로일 수 있으니 수정하지 않는다)"""
+        if field == FIELD_TAG:
+            return self._tag_index.get(value, _EMPTY)
+        if field == FIELD_PORT:
+            return self._port_index.get(value, _EMPTY)
+        candidates = self._text_candidates(value)
+        if field is None:
+            candidates = candidates | self._tag_index.get(value, _EMPTY) | self._port_index.get(value, _EMPTY)
+        return candidates
+
+    @staticmethod
+    def _needs_check(field, value):
+        """색인 후보만으로는 정확하지 않은 토큰인지 (필드 지정 또는 4글자 이상)"""
+        if field in (FIELD_TAG, FIELD_PORT):
+            return False
+        return field is not None or len(value) > 3
+
+    def _text_candidates(self, value):
+        if len(value) < 3:
+            return self._short_index.get(value, _EMPTY)
+        grams = sorted(_trigrams(value), key=lambda gram: len(self._trigram_index.get(gram, _EMPTY)))
+        candidates = self._trigram_index.get(grams[0], _EMPTY)
+        for gram in grams[1:]:
+            if not candidates:
+                break
+            candidates = candidates & self._trigram_index.get(gram, _EMPTY)
+        return candidates
+
+    def _filter(self, ids, field, value):
+        """ids(set) 중 토큰을 실제로 만족하는 것만 (후보마다 확인하므로 비교를 인라인으로 둔다)"""
+        if field == FIELD_TAG:
+            return ids & self._tag_index.get(value, _EMPTY)
+        if field == FIELD_PORT:
+            return ids & self._port_index.get(value, _EMPTY)
+
+        texts = self._texts
+        column = -1 if field is None else _TEXT_FIELDS.index(field)
+        matched = {i for i in ids if value in texts[i][column]}
+        if field is None:
+            matched |= ids & self._tag_index.get(value, _EMPTY)
+            matched |= ids & self._port_index.get(value, _EMPTY)
+        return matched
+
+    # ---------- 색인 ----------
+
+    def _unindex(self, server_id):
+        texts = self._texts[server_id]
+        for gram in _trigrams(texts[-1]):
+            self._discard(self._trigram_index, gram, server_id)
+        for gram in _short_grams(texts[-1]):
+            self._discard(self._short_index, gram, server_id)
+        for tag in self._tags[server_id]:
+            self._discard(self._tag_index, tag, server_id)
+        for port in self._ports[server_id]:
+            self._discard(self._port_index, port, server_id)
+
+    @staticmethod
+    def _discard(index, key, server_id):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(server_id)
+            if not ids:
+                del index[key]
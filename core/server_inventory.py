@@ -0,0 +1,159 @@
+# core/server_inventory.py
+# 서버 목록을 필요한 만큼만 읽어 오는 인벤토리 (목록은 요약 페이지, 상세는 한 대씩)
+
+from core.server_index import ServerSearchIndex
+from core.tunnel_config import DEFAULT_PAGE_SIZE, get_server_store, make_summary
+
+
+class ServerInventory:
+    """
+    MainWindow가 인덱스로 다루는 서버 목록.
+
+    - len()과 전체 터널 수는 COUNT/SUM 한 번으로 얻는다.
+    - summary(i)는 요약 컬럼만 page_size 행씩 필요한 페이지까지 읽는다.
+    - inventory[i]는 비밀번호·터널을 포함한 전체 레코드를 그때 한 대만 읽고 캐시한다.
+      같은 인덱스는 같은 딕셔너리 객체를 돌려주므로 `is` 비교에 쓸 수 있다.
+    - add/replace/remove는 저장소의 해당 행만 쓰고 메모리 목록을 함께 고친다.
+      요약 페이지는 (position, id) 기준으로 이어 읽으므로 중간에 추가·삭제해도
+      이미 읽은 부분과 겹치거나 빠지지 않는다.
+    - 인덱스는 삭제하면 밀리므로, 오래 들고 있을 참조(연결 상태 등)는 저장소 id를 쓰고
+      필요할 때 index_of()/summary_for()/record_for()로 찾는다.
+    """
+
+    def __init__(self, store=None, page_size=DEFAULT_PAGE_SIZE):
+        self.store = store if store is not None else get_server_store()
+        self.page_size = page_size
+        self._count, self._total_tunnels = self.store.stats()
+        self._summaries = []
+        # id -> 인덱스 (읽어 온 요약만)
+        self._positions = {}
+        self._pages = None
+        self._records = {}
+        self._search_index = None
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        summary = self.summary(index)
+        record = self._records.get(summary.id)
+        if record is None:
+            record = self.store.get(summary.id)
+            if record is None:
+                raise IndexError(f"서버 id {summary.id}를 찾을 수 없습니다")
+            self._records[summary.id] = record
+        return record
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def total_tunnels(self):
+        return self._total_tunnels
+
+    def summary(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("서버 인덱스가 범위를 벗어났습니다")
+        self._load_summaries_until(index)
+        return self._summaries[index]
+
+    def summaries(self, start=0, stop=None):
+        """start~stop 범위의 요약을 차례로 (필요한 페이지만 읽는다)"""
+        stop = self._count if stop is None else min(stop, self._count)
+        for index in range(start, stop):
+            yield self.summary(index)
+
+    def search_index(self):
+        """
+        검색 인덱스. 처음 호출할 때 모든 요약을 읽어 만들고, 이후에는 add/replace/remove가
+        한 대씩 갱신한다.
+        """
+        if self._search_index is None:
+            self._search_index = ServerSearchIndex(self.summaries())
+        return self._search_index
+
+    def search(self, query):
+        """검색어에 맞는 서버 id 목록 (목록 순서). 빈 검색어면 None"""
+        return self.search_index().search(query)
+
+    def index_of(self, server_id):
+        """id의 현재 인덱스 (없으면 None). 아직 읽지 않은 페이지까지 읽을 수 있다."""
+        index = self._positions.get(server_id)
+        while index is None and len(self._summaries) < self._count:
+            self._load_summaries_until(len(self._summaries))
+            index = self._positions.get(server_id)
+        return index
+
+    def summary_for(self, server_id):
+        """id의 요약 (없으면 None)"""
+        index = self.index_of(server_id)
+        return None if index is None else self._summaries[index]
+
+    def record_for(self, server_id):
+        """id의 전체 레코드 (없으면 None)"""
+        index = self.index_of(server_id)
+        return None if index is None else self[index]
+
+    def add(self, record):
+        """새 서버를 저장하고 목록 끝에 추가. 인덱스를 반환"""
+        fully_loaded = len(self._summaries) == self._count
+        self.store.upsert(record)
+        # 아직 읽지 않은 페이지가 남아 있으면 새 행은 마지막 페이지에서 함께 읽힌다
+        if fully_loaded:
+            self._positions[record['id']] = len(self._summaries)
+            self._summaries.append(make_summary(record))
+        if self._search_index is not None:
+            self._search_index.add(make_summary(record))
+        self._records[record['id']] = record
+        self._count += 1
+        self._total_tunnels += len(record.get('tunnels') or [])
+        return self._count - 1
+
+    def replace(self, index, record):
+        """index의 서버를 record로 바꿔 저장 (저장소 id는 유지)"""
+        old = self.summary(index)
+        record['id'] = old.id
+        self.store.upsert(record)
+        self._summaries[index] = make_summary(record)
+        if self._search_index is not None:
+            self._search_index.add(self._summaries[index])
+        self._records[old.id] = record
+        self._total_tunnels += len(record.get('tunnels') or []) - old.tunnel_count
+
+    def remove(self, index):
+        """index의 서버를 저장소와 목록에서 삭제하고 그 레코드를 반환"""
+        record = self[index]
+        self.store.delete(record['id'])
+        summary = self._summaries.pop(index)
+        del self._positions[summary.id]
+        for position in range(index, len(self._summaries)):
+            self._positions[self._summaries[position].id] = position
+        self._records.pop(summary.id, None)
+        if self._search_index is not None:
+            self._search_index.remove(summary.id)
+        self._count -= 1
+        self._total_tunnels -= summary.tunnel_count
+        return record
+
+    def reload(self):
+        """저장소에서 다시 읽는다 (캐시된 레코드는 버린다)"""
+        self._count, self._total_tunnels = self.store.stats()
+        self._summaries = []
+        self._positions = {}
+        self._pages = None
+        self._records = {}
+        self._search_index = None
+
+    def _load_summaries_until(self, index):
+        if index < len(self._summaries):
+            return
+        if self._pages is None:
+            self._pages = self.store.iter_summaries(self.page_size)
+        for summary in self._pages:
+            self._positions[summary.id] = len(self._summaries)
+            self._summaries.append(summary)
+            if len(self._summaries) > index:
+                return
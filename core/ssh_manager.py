@@ -3,17 +3,55 @@
 
 import logging
 import os
-import select
-import socket
+import random
 import threading
+import time
 
 import paramiko
 
 from core.app_paths import get_app_data_dir
+from core.connect_profiler import (
+    PHASE_AUTH,
+    PHASE_DNS,
+    PHASE_TCP,
+    ConnectProfile,
+    ProfilingTransport,
+    get_connect_profile_store,
+    open_socket,
+    resolve,
+)
 from core.encryption import decrypt_password  # 🔐 복호화 함수 추가
+from core.tunnel_relay import (
+    DEFAULT_RELAY_BUFFER_SIZE,
+    DEFAULT_RELAY_WORKERS,
+    TunnelRelay,
+)
 
 logger = logging.getLogger(__name__)
 
+# 연결 상태
+STATE_DISCONNECTED = "disconnected"
+STATE_CONNECTING = "connecting"
+STATE_CONNECTED = "connected"
+STATE_RECONNECTING = "reconnecting"
+STATE_FAILED = "failed"
+
+# 재연결: 지수 백오프(+지터), 최대 시도 횟수, 모두 실패하면 일정 시간 재연결 차단(circuit breaker)
+RECONNECT_BASE_DELAY = 1.0
+RECONNECT_MAX_DELAY = 30.0
+RECONNECT_MAX_ATTEMPTS = 8
+RECONNECT_CIRCUIT_COOLDOWN = 300.0
+
+# 재연결 중 새 터널 접속이 트랜스포트 복구를 기다리는 최대 시간
+RECONNECT_STALL_TIMEOUT = 30.0
+
+# 재연결을 취소할 때 스레드 종료를 기다리는 시간. 접속 시도 중이면 더 걸릴 수 있지만
+# 취소 뒤에 연 클라이언트는 재연결 스레드가 직접 닫으므로 기다리지 않아도 안전하다
+RECONNECT_CANCEL_WAIT = 1.0
+
+# TCP 연결·배너·키 교환 각각의 제한 시간
+CONNECT_TIMEOUT = 5
+
 
 class PersistingHostKeyPolicy(paramiko.MissingHostKeyPolicy):
     """
@@ -39,31 +77,169 @@ class PersistingHostKeyPolicy(paramiko.MissingHostKeyPolicy):
 
 
 class SSHManager:
-    def __init__(self, server_info):
+    def __init__(self, server_info, relay_workers=DEFAULT_RELAY_WORKERS,
+                 relay_buffer_size=DEFAULT_RELAY_BUFFER_SIZE):
         """
         server_info: servers.json에서 불러온 하나의 서버 딕셔너리
+        relay_workers: 모든 터널을 중계할 이벤트 루프 스레드 수
+        relay_buffer_size: 연결별 포워딩 버퍼 크기 (바이트)
         """
         self.server_info = server_info
         self.client = None
         self.transport = None
-        self.tunnel_threads = []
-        self._tunnel_controls = []
-        self._tunnel_servers = []
-        self._tunnel_lock = threading.Lock()
+        self.relay_workers = relay_workers
+        self.relay_buffer_size = relay_buffer_size
+        self._relay = None
         self.known_hosts_file = os.path.join(get_app_data_dir(), "known_hosts")
 
-    def connect(self):
+        self.state = STATE_DISCONNECTED
+        self._state_lock = threading.Lock()
+        self._state_listeners = []
+        self._transport_ready = threading.Event()
+        self._reconnect_cancel = threading.Event()
+        self._reconnect_thread = None
+        self._circuit_open_until = 0.0
+        # 마지막 연결 시도의 단계별 소요 시간 (core.connect_profiler.ConnectProfile)
+        self.last_connect_profile = None
+
+    # ---------- 상태 관리 ----------
+
+    def add_state_listener(self, callback):
         """
-        SSH 연결을 시도하고, 연결되면 터널링 스레드 시작
+        상태 변화 알림 등록: callback(ssh_manager, old_state, new_state)
+        재연결 스레드에서 호출될 수 있으므로 GUI에서는 시그널로 넘겨야 한다.
         """
-        try:
-            self._stop_all_tunnels()
+        if callback not in self._state_listeners:
+            self._state_listeners.append(callback)
+
+    def remove_state_listener(self, callback):
+        if callback in self._state_listeners:
+            self._state_listeners.remove(callback)
+
+    def _set_state(self, new_state):
+        with self._state_lock:
+            old_state = self.state
+            self.state = new_state
+        if old_state != new_state:
+            self._notify_state(old_state, new_state)
+
+    def _notify_state(self, old_state, new_state):
+        for callback in list(self._state_listeners):
+            try:
+                callback(self, old_state, new_state)
+            except Exception:
+                logger.exception("상태 알림 처리 중 오류")
+
+    # ---------- 연결 ----------
+
+    def connect(self, tunnels=None):
+        """
+        SSH 연결을 시도하고, 연결되면 터널 릴레이 시작
+        tunnels: 열 터널 목록 (None이면 server_info의 터널)
+        """
+        self._cancel_reconnect()
+        self._stop_all_tunnels()
+        self._circuit_open_until = 0.0
+        self.last_connect_profile = None
+        self._set_state(STATE_CONNECTING)
+
+        if not self._open_client():
+            self._set_state(STATE_DISCONNECTED)
+            return False
 
-            self.client = paramiko.SSHClient()
-            self.client.load_system_host_keys()
+        # 터널링 정보가 있으면 모두 하나의 릴레이 엔진에 등록
+        self._relay = TunnelRelay(
+            self._open_tunnel_channel,
+            workers=self.relay_workers,
+            buffer_size=self.relay_buffer_size,
+        )
+        if tunnels is None:
+            tunnels = self.server_info.get("tunnels", [])
+        self.add_tunnels(tunnels, self.last_connect_profile)
+
+        self._transport_ready.set()
+        self._set_state(STATE_CONNECTED)
+        return True
+
+    def add_tunnels(self, tunnels, profile=None):
+        """
+        아직 열리지 않은 로컬 포트의 터널만 릴레이에 추가한다.
+        같은 연결을 공유하는 다른 서버 항목의 터널을 붙일 때도 사용한다.
+        profile: 터널별 소요 시간을 기록할 ConnectProfile (이번 연결 시도의 것만 넘긴다)
+        """
+        relay = self._relay
+        if relay is None:
+            return
+        bound = relay.local_ports()
+        for tunnel in tunnels:
+            if tunnel.get("local") in bound:
+                continue
+            start = time.monotonic()
+            error = None
+            try:
+                relay.add_tunnel(tunnel)
+                bound.add(tunnel["local"])
+            except Exception as e:
+                error = e
+                print(f"[!] [{tunnel.get('name', 'Unnamed')}] 터널링 실패: {e}")
+            if profile is not None:
+                profile.add_tunnel(tunnel, time.monotonic() - start, error)
+
+    def remove_tunnels(self, local_ports):
+        """주어진 로컬 포트의 터널과 그 위의 중계 연결을 닫는다"""
+        relay = self._relay
+        if relay is None:
+            return
+        for local_port in local_ports:
+            relay.remove_tunnel(local_port)
+
+    def tunnel_ports(self):
+        """현재 열려 있는 터널의 로컬 포트 집합"""
+        relay = self._relay
+        return relay.local_ports() if relay is not None else set()
+
+    # ---------- 채널 ----------
+
+    def open_shell(self, term="vt100", width=80, height=24):
+        """
+        공유 트랜스포트 위에 PTY 셸 채널을 연다 (터미널 탭/창마다 하나).
+        새 TCP 연결이나 키 교환 없이 채널만 추가된다.
+        """
+        channel = self.open_session()
+        channel.get_pty(term=term, width=width, height=height)
+        channel.invoke_shell()
+        return channel
+
+    def open_session(self):
+        """공유 트랜스포트 위에 세션 채널을 연다 (exec_command 등 스크립트 실행용)"""
+        transport = self.transport
+        if transport is None or not transport.is_active():
+            raise paramiko.SSHException("SSH 연결이 활성 상태가 아닙니다")
+        return transport.open_session()
+
+    def _open_client(self):
+        """
+        SSH 클라이언트/트랜스포트만 새로 연다. 터널(리스닝 소켓)은 건드리지 않는다.
+        """
+        self._close_client()
+        client = self._dial()
+        if client is None:
+            return False
+        self.client = client
+        self.transport = client.get_transport()
+        return True
+
+    def _dial(self):
+        """
+        새 SSHClient로 접속·인증까지 마치고 돌려준다 (실패하면 None).
+        self.client/self.transport에는 반영하지 않으므로 호출 측이 게시한다.
+        """
+        try:
+            client = paramiko.SSHClient()
+            client.load_system_host_keys()
             if os.path.exists(self.known_hosts_file):
-                self.client.load_host_keys(self.known_hosts_file)
-            self.client.set_missing_host_key_policy(
+                client.load_host_keys(self.known_hosts_file)
+            client.set_missing_host_key_policy(
                 PersistingHostKeyPolicy(self.known_hosts_file)
             )
 
@@ -72,151 +248,213 @@ class SSHManager:
                 decrypted_password = decrypt_password(self.server_info["password"])
             except Exception as e:
                 print(f"[!] 비밀번호 복호화 실패: {e}")
-                return False
+                return None
 
-            self.client.connect(
-                hostname=self.server_info["host"],
-                port=self.server_info["port"],
-                username=self.server_info["username"],
-                password=decrypted_password,
-                timeout=5
-            )
+        except Exception as e:
+            print(f"[!] {self.server_info['name']} 서버 연결 실패: {e}")
+            return None
 
-            self.transport = self.client.get_transport()
-            self.transport.set_keepalive(30)
+        # DNS/TCP는 직접 열고, 배너~인증 시각은 ProfilingTransport가 기록
+        profile = ConnectProfile(self.server_info)
+        self.last_connect_profile = profile
+        phase = PHASE_DNS
+        sock = None
+        try:
+            addresses = resolve(self.server_info["host"], self.server_info["port"])
+            profile.mark(PHASE_DNS)
 
-            print(f"[+] {self.server_info['name']} 서버 연결 성공!")
+            phase = PHASE_TCP
+            sock = open_socket(addresses, CONNECT_TIMEOUT)
+            profile.mark(PHASE_TCP)
 
-            # 터널링 정보가 있으면 모두 시작
-            for tunnel in self.server_info.get("tunnels", []):
-                stop_event = threading.Event()
-                thread = threading.Thread(
-                    target=self._start_tunnel,
-                    args=(tunnel, stop_event),
-                    daemon=True,
+            try:
+                client.connect(
+                    hostname=self.server_info["host"],
+                    port=self.server_info["port"],
+                    username=self.server_info["username"],
+                    password=decrypted_password,
+                    timeout=CONNECT_TIMEOUT,
+                    sock=sock,
+                    transport_factory=ProfilingTransport,
                 )
-                thread.start()
-                self.tunnel_threads.append(thread)
-                self._tunnel_controls.append((thread, stop_event))
+            finally:
+                phase = profile.mark_transport(client.get_transport())
+            profile.mark(PHASE_AUTH)
 
-            return True
+            client.get_transport().set_keepalive(30)
+            print(f"[+] {self.server_info['name']} 서버 연결 성공! ({profile.connect_time:.2f}s)")
+            return client
 
         except Exception as e:
+            profile.fail(phase, e)
+            client.close()
+            if sock is not None:
+                sock.close()
             print(f"[!] {self.server_info['name']} 서버 연결 실패: {e}")
-            return False
+            return None
+        finally:
+            get_connect_profile_store().record(profile)
 
-    def _start_tunnel(self, tunnel_info, stop_event: threading.Event):
-        """
-        로컬 → 원격 포트 포워딩 수행
-        """
-        local_port = tunnel_info["local"]
-        remote_host = tunnel_info["remote_host"]
-        remote_port = tunnel_info["remote_port"]
-        tunnel_name = tunnel_info.get("name", "Unnamed")
-        server = None
+    def _close_client(self):
+        with self._state_lock:
+            client = self.client
+            self.client = None
+            self.transport = None
+        self._close_quietly(client)
 
-        try:
-            print(f"[*] [{tunnel_name}] 포트포워딩 시작: localhost:{local_port} → {remote_host}:{remote_port}")
-
-            # 로컬 서버 소켓 열기
-            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            server.bind(('127.0.0.1', local_port))
-            server.listen(100)
-            server.settimeout(1)
-
-            with self._tunnel_lock:
-                self._tunnel_servers.append(server)
-
-            while not stop_event.is_set():
-                try:
-                    client_socket, addr = server.accept()
-                except socket.timeout:
-                    continue
-                except OSError:
-                    break
-
-                print(f"[+] [{tunnel_name}] 클라이언트 접속됨: {addr}")
-                threading.Thread(
-                    target=self._handle_connection,
-                    args=(client_socket, remote_host, remote_port, tunnel_name),
-                    daemon=True,
-                ).start()
+    @staticmethod
+    def _close_quietly(client):
+        if client is not None:
+            try:
+                client.close()
+            except Exception:
+                pass
 
-        except Exception as e:
-            print(f"[!] [{tunnel_name}] 터널링 실패: {e}")
-        finally:
-            if server is not None:
-                with self._tunnel_lock:
-                    if server in self._tunnel_servers:
-                        self._tunnel_servers.remove(server)
-                try:
-                    server.close()
-                except OSError:
-                    pass
+    # ---------- 재연결 ----------
 
-    def _handle_connection(self, client_socket, remote_host, remote_port, tunnel_name):
+    def start_reconnect(self):
         """
-        클라이언트와 원격 서버 간 데이터 전송 중계
+        트랜스포트가 끊겼을 때 백그라운드 재연결을 시작한다.
+        터널의 로컬 리스닝 소켓은 그대로 유지되므로, 그 사이 들어온 접속은
+        재연결이 끝날 때까지 잠시 대기한다.
+
+        재연결이 진행 중이거나 시작되면 True, 사용자가 연결을 끊었거나
+        circuit breaker가 열려 있으면 False를 반환한다.
         """
-        chan = None
-        try:
-            chan = self.transport.open_channel(
-                "direct-tcpip",
-                (remote_host, remote_port),
-                client_socket.getsockname()
+        with self._state_lock:
+            if self.state in (STATE_RECONNECTING, STATE_CONNECTING):
+                return True
+            if self.state == STATE_DISCONNECTED:
+                return False
+            if time.monotonic() < self._circuit_open_until:
+                return False
+            old_state = self.state
+            self.state = STATE_RECONNECTING
+            self._transport_ready.clear()
+            # 재연결마다 새 취소 신호를 쓰므로, 취소된 이전 스레드가 늦게 끝나도 게시하지 않는다
+            self._reconnect_cancel = threading.Event()
+            self._reconnect_thread = threading.Thread(
+                target=self._reconnect_loop,
+                args=(self._reconnect_cancel,),
+                name=f"reconnect-{self.server_info.get('name', '')}",
+                daemon=True,
             )
-
-            while True:
-                r, _, _ = select.select([client_socket, chan], [], [])
-                if client_socket in r:
-                    data = client_socket.recv(1024)
-                    if not data:
-                        break
-                    chan.send(data)
-                if chan in r:
-                    data = chan.recv(1024)
-                    if not data:
-                        break
-                    client_socket.send(data)
-        except Exception as e:
-            print(f"[!] [{tunnel_name}] 포워딩 중 오류 발생: {e}")
-        finally:
-            client_socket.close()
-            if chan:
-                chan.close()
-            print(f"[-] [{tunnel_name}] 연결 종료")
+            self._reconnect_thread.start()
+
+        print(f"[*] {self.server_info['name']} 서버 재연결 시작")
+        self._notify_state(old_state, STATE_RECONNECTING)
+        return True
+
+    def wait_for_reconnect(self, timeout=None):
+        """진행 중인 재연결이 끝날 때까지 최대 timeout초 기다린 뒤 현재 상태를 반환"""
+        thread = self._reconnect_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        return self.state
+
+    @staticmethod
+    def _backoff_delay(attempt):
+        if attempt == 0:
+            return 0.0
+        delay = min(RECONNECT_MAX_DELAY, RECONNECT_BASE_DELAY * (2 ** (attempt - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _reconnect_loop(self, cancel):
+        for attempt in range(RECONNECT_MAX_ATTEMPTS):
+            if cancel.wait(self._backoff_delay(attempt)):
+                return
+
+            print(f"[*] {self.server_info['name']} 재연결 시도 {attempt + 1}/{RECONNECT_MAX_ATTEMPTS}")
+            client = self._dial()
+            if client is None:
+                continue
+
+            # 취소 확인과 연결 게시를 한 번에 처리해, disconnect()와 엇갈려도
+            # 닫힌 클라이언트로 CONNECTED가 되거나 새 클라이언트가 남지 않게 한다
+            with self._state_lock:
+                cancelled = cancel.is_set()
+                if not cancelled:
+                    stale = self.client
+                    self.client = client
+                    self.transport = client.get_transport()
+                    old_state = self.state
+                    self.state = STATE_CONNECTED
+                    self._transport_ready.set()
+            if cancelled:
+                self._close_quietly(client)
+                return
+            self._close_quietly(stale)
+            self._notify_state(old_state, STATE_CONNECTED)
+            print(f"[+] {self.server_info['name']} 서버 재연결 성공")
+            return
+
+        # 모든 시도 실패: 일정 시간 재연결을 막고 터널을 내린다
+        with self._state_lock:
+            if cancel.is_set():
+                return
+            self._circuit_open_until = time.monotonic() + RECONNECT_CIRCUIT_COOLDOWN
+            relay, self._relay = self._relay, None
+            client, self.client, self.transport = self.client, None, None
+            old_state = self.state
+            self.state = STATE_FAILED
+        print(f"[!] {self.server_info['name']} 서버 재연결 실패 - 터널을 종료합니다")
+        if relay is not None:
+            relay.stop()
+        self._close_quietly(client)
+        self._notify_state(old_state, STATE_FAILED)
+
+    def _cancel_reconnect(self, new_state=None):
+        """
+        진행 중인 재연결을 취소한다. new_state가 있으면 취소와 같은 잠금 안에서 상태를
+        바꾸므로, 재연결 스레드는 취소를 보거나 바뀐 상태보다 먼저 게시를 끝낸다.
+        재연결 스레드가 취소 뒤에 연 클라이언트는 그 스레드가 스스로 닫는다.
+        """
+        with self._state_lock:
+            self._reconnect_cancel.set()
+            thread = self._reconnect_thread
+            self._reconnect_thread = None
+            old_state = self.state
+            if new_state is not None:
+                self.state = new_state
+        if new_state is not None and old_state != new_state:
+            self._notify_state(old_state, new_state)
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=RECONNECT_CANCEL_WAIT)
+
+    def _open_tunnel_channel(self, remote_host, remote_port, src_addr):
+        """
+        릴레이 엔진이 새 클라이언트마다 호출하는 direct-tcpip 채널 열기
+        """
+        transport = self.transport
+        if transport is None or not transport.is_active():
+            # 재연결이 끝날 때까지 접속을 잠시 붙잡아 둔다
+            if not self.start_reconnect() or not self._transport_ready.wait(RECONNECT_STALL_TIMEOUT):
+                raise paramiko.SSHException("SSH 연결이 활성 상태가 아닙니다")
+            transport = self.transport
+            if transport is None:
+                raise paramiko.SSHException("SSH 연결이 활성 상태가 아닙니다")
+        return transport.open_channel("direct-tcpip", (remote_host, remote_port), src_addr)
 
     def disconnect(self):
         """
-        SSH 연결 종료
+        SSH 연결 종료 (진행 중인 재연결도 중단)
         """
+        self._cancel_reconnect(STATE_DISCONNECTED)
+        self._transport_ready.clear()
         self._stop_all_tunnels()
         if self.client:
-            self.client.close()
+            self._close_client()
             print(f"[-] {self.server_info['name']} 서버 연결 종료됨.")
-            self.client = None
-            self.transport = None
-            self.tunnel_threads = []
+
+    def tunnel_metrics(self):
+        """터널별 트래픽 지표 (core.tunnel_metrics.TunnelStats 목록). 터널이 없으면 빈 목록"""
+        relay = self._relay
+        return relay.metrics_snapshot() if relay is not None else []
 
     def _stop_all_tunnels(self):
-        for _, stop_event in self._tunnel_controls:
-            stop_event.set()
-
-        with self._tunnel_lock:
-            for server in list(self._tunnel_servers):
-                try:
-                    server.close()
-                except OSError:
-                    pass
-            self._tunnel_servers.clear()
-
-        for thread, _ in self._tunnel_controls:
-            if thread.is_alive():
-                thread.join(timeout=2)
-
-        self._tunnel_controls.clear()
-        self.tunnel_threads = []
+        if self._relay is not None:
+            self._relay.stop()
+            self._relay = None
 
     def is_connected(self):
         """
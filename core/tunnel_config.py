@@ -1,44 +1,421 @@
 # core/tunnel_config.py
-# 서버 목록을 JSON 파일에서 로드/저장하는 기능을 담당
+# 서버 목록을 SQLite(WAL) 저장소에서 로드/저장하는 기능을 담당
 
+import collections
 import json
 import os
+import sqlite3
+import threading
 
 from core.app_paths import get_app_data_dir
 
-# 서버 목록 파일 경로
+# 서버 목록 저장소 경로
+DB_FILE = os.path.join(get_app_data_dir(), 'servers.db')
+
+# 이전 버전의 서버 목록 파일 (처음 실행 시 DB로 옮긴 뒤 .bak으로 남긴다)
 DATA_FILE = os.path.join(get_app_data_dir(), 'servers.json')
 
+# 목록 화면에 필요한 필드만 담은 서버 요약 (비밀번호·터널 상세는 get()으로 따로 읽는다)
+ServerSummary = collections.namedtuple(
+    "ServerSummary", "id name host port username tags tunnel_count tunnel_ports"
+)
+
+# 요약을 한 번에 읽는 기본 행 수
+DEFAULT_PAGE_SIZE = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS servers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+)
+"""
+
+# 전체 JSON을 파싱하지 않고 목록을 읽기 위한 요약 컬럼 (data에서 파생)
+_SUMMARY_COLUMNS = (
+    ("name", "TEXT NOT NULL DEFAULT ''"),
+    ("host", "TEXT NOT NULL DEFAULT ''"),
+    ("port", "INTEGER"),
+    ("username", "TEXT NOT NULL DEFAULT ''"),
+    ("tags", "TEXT NOT NULL DEFAULT '[]'"),
+    ("tunnel_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("tunnel_ports", "TEXT NOT NULL DEFAULT '[]'"),
+)
+_SUMMARY_FIELDS = ", ".join(name for name, _ in _SUMMARY_COLUMNS)
+_SUMMARY_ASSIGN = ", ".join(f"{name} = ?" for name, _ in _SUMMARY_COLUMNS)
+
+_INDEX = "CREATE INDEX IF NOT EXISTS servers_order ON servers (position, id)"
+
+_SUMMARY_SELECT = f"SELECT id, {_SUMMARY_FIELDS} FROM servers"
+
+
+def _encode(server):
+    """id를 뺀 서버 딕셔너리를 비교 가능한 JSON 문자열로"""
+    record = {key: value for key, value in server.items() if key != 'id'}
+    return json.dumps(record, ensure_ascii=False, sort_keys=True)
+
+
+def _tunnel_ports(server):
+    return tuple(
+        tunnel['local'] for tunnel in server.get('tunnels') or () if tunnel.get('local') is not None
+    )
+
+
+def _summary_values(server):
+    """_SUMMARY_COLUMNS 순서의 컬럼 값"""
+    return (
+        str(server.get('name', '')),
+        str(server.get('host', '')),
+        server.get('port'),
+        str(server.get('username', '')),
+        json.dumps(list(server.get('tags') or []), ensure_ascii=False),
+        len(server.get('tunnels') or []),
+        json.dumps(list(_tunnel_ports(server))),
+    )
+
+
+def make_summary(server):
+    """저장된('id'가 있는) 서버 딕셔너리의 ServerSummary"""
+    return ServerSummary(
+        server['id'],
+        str(server.get('name', '')),
+        str(server.get('host', '')),
+        server.get('port'),
+        str(server.get('username', '')),
+        tuple(server.get('tags') or ()),
+        len(server.get('tunnels') or []),
+        _tunnel_ports(server),
+    )
+
+
+def _json_tuple(text):
+    return tuple(json.loads(text)) if text != '[]' else ()
+
+
+def _summary_from_row(row):
+    server_id, name, host, port, username, tags, tunnel_count, tunnel_ports = row
+    return ServerSummary(
+        server_id, name, host, port, username,
+        _json_tuple(tags), tunnel_count, _json_tuple(tunnel_ports),
+    )
+
+
+class ServerStore:
+    """
+    서버 한 대를 한 행(JSON)으로 저장하는 SQLite 저장소.
+
+    WAL 모드 + synchronous=FULL이므로 커밋된 변경은 저장 도중 프로세스가 죽어도
+    유지되고, 한 번의 저장은 전부 반영되거나 전혀 반영되지 않는다.
+    각 서버 딕셔너리에는 저장소가 부여한 고정 'id'가 들어 있으며, upsert()/delete()는
+    해당 행만 건드리므로 목록 크기와 무관하게 O(1)이다.
+
+    목록 화면은 iter_summaries()/load_page()로 요약 컬럼만 페이지 단위로 읽고,
+    비밀번호·터널이 필요할 때 get()으로 한 대씩 전체 레코드를 읽는다.
+    """
+
+    def __init__(self, path=DB_FILE, legacy_json_path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        # id -> (position, 저장된 JSON). 바뀐 행만 쓰기 위한 캐시 (읽거나 쓴 행만)
+        self._rows = {}
+        self._next_position = None
+        self._loaded = False
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        with self._conn:
+            self._conn.execute(_SCHEMA)
+            self._add_summary_columns()
+            self._conn.execute(_INDEX)
+
+        if legacy_json_path:
+            self._migrate_json(legacy_json_path)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM servers").fetchone()[0]
+
+    def stats(self):
+        """(서버 수, 전체 터널 수)"""
+        with self._lock:
+            count, tunnels = self._conn.execute(
+                "SELECT COUNT(*), SUM(tunnel_count) FROM servers"
+            ).fetchone()
+        return count, tunnels or 0
+
+    def iter_summaries(self, page_size=DEFAULT_PAGE_SIZE):
+        """
+        저장된 순서대로 ServerSummary를 page_size 행씩 읽어 내보낸다.
+        (position, id) 기준 keyset 페이지네이션이라 뒤쪽 페이지도 비용이 같다.
+        """
+        last = (-1, -1)
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    _SUMMARY_SELECT.replace("SELECT id,", "SELECT position, id,")
+                    + " WHERE (position, id) > (?, ?) ORDER BY position, id LIMIT ?",
+                    (*last, page_size),
+                ).fetchall()
+            for row in rows:
+                yield _summary_from_row(row[1:])
+            if len(rows) < page_size:
+                return
+            last = (rows[-1][0], rows[-1][1])
+
+    def load_page(self, offset, limit):
+        """offset번째부터 limit개의 ServerSummary"""
+        with self._lock:
+            rows = self._conn.execute(
+                _SUMMARY_SELECT + " ORDER BY position, id LIMIT ? OFFSET ?", (limit, offset)
+            ).fetchall()
+        return [_summary_from_row(row) for row in rows]
+
+    def get(self, server_id):
+        """id에 해당하는 전체 서버 딕셔너리 ('id' 포함). 없으면 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM servers WHERE id = ?", (server_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        server = json.loads(row[0])
+        server['id'] = server_id
+        return server
+
+    def load_all(self):
+        """저장된 순서대로 서버 딕셔너리 목록 ('id' 포함)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, position, data FROM servers ORDER BY position, id"
+            ).fetchall()
+            self._rows = {}
+            servers = []
+            for server_id, position, data in rows:
+                try:
+                    server = json.loads(data)
+                except json.JSONDecodeError:
+                    print(f"⚠️ 손상된 서버 항목을 건너뜁니다 (id={server_id})")
+                    continue
+                server['id'] = server_id
+                self._rows[server_id] = (position, data)
+                servers.append(server)
+            self._next_position = rows[-1][1] + 1 if rows else 0
+            self._loaded = True
+            return servers
+
+    def upsert(self, server):
+        """
+        서버 하나를 추가하거나 수정한다. 새 서버는 목록 맨 뒤에 붙고 server['id']가 채워진다.
+        """
+        with self._lock, self._conn:
+            self._upsert_locked(server, None)
+        return server['id']
+
+    def delete(self, server_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM servers WHERE id = ?", (server_id,))
+            self._rows.pop(server_id, None)
+
+    def replace_all(self, servers):
+        """
+        목록 전체를 한 트랜잭션으로 저장한다. 바뀐 행만 쓰고, 목록에 없는 행은 지우며,
+        순서는 앞 항목보다 position이 작아진 항목만 다시 매긴다.
+        """
+        with self._lock, self._conn:
+            self._load_rows()
+            keep = set()
+            previous = -1
+            for server in servers:
+                position = self._rows.get(server.get('id'), (None,))[0]
+                if position is None or position <= previous:
+                    position = previous + 1
+                self._upsert_locked(server, position)
+                keep.add(server['id'])
+                previous = position
+
+            removed = [server_id for server_id in self._rows if server_id not in keep]
+            if removed:
+                self._conn.executemany(
+                    "DELETE FROM servers WHERE id = ?", [(server_id,) for server_id in removed]
+                )
+                for server_id in removed:
+                    del self._rows[server_id]
+
+    def _load_rows(self):
+        """목록 전체를 비교해야 할 때(replace_all)만 모든 행을 캐시에 올린다."""
+        if not self._loaded:
+            self._rows = {
+                server_id: (position, data)
+                for server_id, position, data in self._conn.execute(
+                    "SELECT id, position, data FROM servers"
+                )
+            }
+            self._next_position = max((p for p, _ in self._rows.values()), default=-1) + 1
+            self._loaded = True
+
+    def _row(self, server_id):
+        if server_id is None:
+            return None
+        row = self._rows.get(server_id)
+        if row is None and not self._loaded:
+            row = self._conn.execute(
+                "SELECT position, data FROM servers WHERE id = ?", (server_id,)
+            ).fetchone()
+            if row is not None:
+                row = self._rows[server_id] = tuple(row)
+        return row
+
+    def _upsert_locked(self, server, position):
+        data = _encode(server)
+        server_id = server.get('id')
+        row = self._row(server_id)
+        if row is None:
+            if position is None:
+                if self._next_position is None:
+                    self._next_position = self._conn.execute(
+                        "SELECT COALESCE(MAX(position), -1) + 1 FROM servers"
+                    ).fetchone()[0]
+                position = self._next_position
+            cursor = self._conn.execute(
+                f"INSERT INTO servers (position, data, {_SUMMARY_FIELDS})"
+                f" VALUES (?, ?{', ?' * len(_SUMMARY_COLUMNS)})",
+                (position, data, *_summary_values(server)),
+            )
+            server['id'] = cursor.lastrowid
+        else:
+            if position is None:
+                position = row[0]
+            if row == (position, data):
+                return
+            self._conn.execute(
+                f"UPDATE servers SET position = ?, data = ?, {_SUMMARY_ASSIGN} WHERE id = ?",
+                (position, data, *_summary_values(server), server_id),
+            )
+        self._rows[server['id']] = (position, data)
+        if self._next_position is not None:
+            self._next_position = max(self._next_position, position + 1)
+
+    def _add_summary_columns(self):
+        """요약 컬럼이 없는 이전 DB에 컬럼을 추가하고 data에서 채운다."""
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(servers)")}
+        missing = [(name, spec) for name, spec in _SUMMARY_COLUMNS if name not in existing]
+        if not missing:
+            return
+        for name, spec in missing:
+            self._conn.execute(f"ALTER TABLE servers ADD COLUMN {name} {spec}")
+        rows = self._conn.execute("SELECT id, data FROM servers").fetchall()
+        updates = []
+        for server_id, data in rows:
+            try:
+                server = json.loads(data)
+            except json.JSONDecodeError:
+                continue
+            updates.append((*_summary_values(server), server_id))
+        self._conn.executemany(
+            f"UPDATE servers SET {_SUMMARY_ASSIGN} WHERE id = ?", updates
+        )
+
+    def _migrate_json(self, json_path):
+        """DB가 비어 있고 이전 servers.json이 있으면 한 번에 옮긴다."""
+        if not os.path.exists(json_path):
+            return
+        if self._conn.execute("SELECT 1 FROM servers LIMIT 1").fetchone():
+            return
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                servers = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ 이전 서버 설정 파일을 옮기지 못했습니다: {e}")
+            return
+
+        self.replace_all(servers)
+        try:
+            os.replace(json_path, json_path + '.bak')
+        except OSError:
+            pass
+        print(f"[*] 서버 {len(servers)}개를 {os.path.basename(self.path)}로 옮겼습니다.")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_server_store():
+    """앱 전체에서 공유하는 서버 저장소"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ServerStore(DB_FILE, legacy_json_path=DATA_FILE)
+        return _store
+
+
 def load_server_list():
     """
-    JSON 파일에서 서버 목록을 불러온다.
-    파일이 없으면 빈 리스트를 반환.
+    저장소에서 서버 목록을 불러온다. 각 서버 딕셔너리에는 고정 'id'가 들어 있다.
+    저장소를 열 수 없으면 빈 리스트를 반환.
     """
-    if not os.path.exists(DATA_FILE):
+    try:
+        return get_server_store().load_all()
+    except Exception as e:
+        print(f"⚠️ 서버 설정을 불러오는 중 오류 발생: {e}")
         return []
 
+
+def load_server_summaries(page_size=DEFAULT_PAGE_SIZE):
+    """
+    목록 표시용 ServerSummary를 페이지 단위로 읽어 내보내는 제너레이터.
+    저장소를 열 수 없으면 아무것도 내보내지 않는다.
+    """
     try:
-        with open(DATA_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except json.JSONDecodeError:
-        print("⚠️ 서버 설정 파일이 손상되었거나 잘못된 형식입니다.")
-        return []
+        store = get_server_store()
     except Exception as e:
-        print(f"⚠️ 서버 설정 파일을 불러오는 중 오류 발생: {e}")
-        return []
+        print(f"⚠️ 서버 설정을 불러오는 중 오류 발생: {e}")
+        return
+    yield from store.iter_summaries(page_size)
+
+
+def load_server(server_id):
+    """id에 해당하는 전체 서버 레코드 (없으면 None)"""
+    return get_server_store().get(server_id)
+
 
 def save_server_list(server_list):
     """
-    서버 목록을 JSON 파일에 저장한다.
-    
+    서버 목록 전체를 저장한다 (바뀐 항목만 기록, 한 트랜잭션).
+    한 대만 바뀌었다면 upsert_server()/remove_server()를 쓰는 편이 빠르다.
+
     :param server_list: 서버 딕셔너리 리스트
     """
     try:
-        # 데이터 디렉토리가 없으면 생성
-        os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
-        
-        with open(DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(server_list, f, ensure_ascii=False, indent=4)
+        get_server_store().replace_all(server_list)
+    except Exception as e:
+        print(f"⚠️ 서버 설정을 저장하는 중 오류 발생: {e}")
+        raise
+
+
+def upsert_server(server):
+    """
+    서버 하나를 추가/수정한다. 새 서버에는 'id'가 채워진다.
+
+    :return: 서버 id
+    """
+    try:
+        return get_server_store().upsert(server)
+    except Exception as e:
+        print(f"⚠️ 서버 설정을 저장하는 중 오류 발생: {e}")
+        raise
+
+
+def remove_server(server_id):
+    """id에 해당하는 서버 하나를 삭제한다."""
+    try:
+        get_server_store().delete(server_id)
     except Exception as e:
-        print(f"⚠️ 서버 설정 파일을 저장하는 중 오류 발생: {e}")
+        print(f"⚠️ 서버 설정을 삭제하는 중 오류 발생: {e}")
         raise
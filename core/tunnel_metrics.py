@@ -0,0 +1,132 @@
+# core/tunnel_metrics.py
+# 터널별 트래픽 지표 (바이트, 연결 수, 채널 열기 지연, 오류) 수집
+
+import collections
+import threading
+import time
+
+# 한 시점의 터널 지표. 바이트/횟수는 터널이 열린 뒤의 누적값이다.
+# bytes_in: 원격 → 로컬 클라이언트, bytes_out: 로컬 클라이언트 → 원격
+TunnelStats = collections.namedtuple(
+    "TunnelStats",
+    "name local_port remote_host remote_port bytes_in bytes_out "
+    "active_connections total_connections open_failures errors "
+    "open_latency_avg open_latency_max timestamp",
+)
+
+# ThroughputMeter가 계산한 초당 전송량이 붙은 지표
+TunnelRates = collections.namedtuple("TunnelRates", "stats rate_in rate_out")
+
+
+class ConnectionCounters:
+    """
+    중계 연결 하나의 바이트 수. 연결이 등록된 루프 스레드만 증가시키므로 잠금이 없다.
+    다른 스레드의 스냅샷은 약간 늦은 값을 읽을 수 있다.
+    """
+
+    __slots__ = ("bytes_in", "bytes_out")
+
+    def __init__(self):
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+
+class TunnelMetrics:
+    """
+    리스닝 포트 하나의 지표.
+
+    데이터 경로(루프 스레드)에서는 연결별 ConnectionCounters에 더하기만 하고,
+    연결이 닫힐 때 그 값을 터널 누적값으로 합친다. 연결 수·지연·오류처럼 드물게
+    바뀌는 값만 잠금으로 보호한다.
+    """
+
+    def __init__(self, name, local_port, remote_host, remote_port):
+        self.name = name
+        self.local_port = local_port
+        self.remote_host = remote_host
+        self.remote_port = remote_port
+        self._lock = threading.Lock()
+        self._live = set()
+        self._closed_in = 0
+        self._closed_out = 0
+        self._total_connections = 0
+        self._open_failures = 0
+        self._errors = 0
+        self._open_count = 0
+        self._open_latency_sum = 0.0
+        self._open_latency_max = 0.0
+
+    def channel_opened(self, latency):
+        """채널 열기 성공. 연결별 카운터를 반환"""
+        counters = ConnectionCounters()
+        with self._lock:
+            self._live.add(counters)
+            self._total_connections += 1
+            self._open_count += 1
+            self._open_latency_sum += latency
+            if latency > self._open_latency_max:
+                self._open_latency_max = latency
+        return counters
+
+    def channel_open_failed(self):
+        with self._lock:
+            self._open_failures += 1
+
+    def connection_error(self):
+        with self._lock:
+            self._errors += 1
+
+    def connection_closed(self, counters):
+        with self._lock:
+            if counters in self._live:
+                self._live.discard(counters)
+                self._closed_in += counters.bytes_in
+                self._closed_out += counters.bytes_out
+
+    def snapshot(self):
+        with self._lock:
+            live = list(self._live)
+            bytes_in = self._closed_in + sum(c.bytes_in for c in live)
+            bytes_out = self._closed_out + sum(c.bytes_out for c in live)
+            latency_avg = self._open_latency_sum / self._open_count if self._open_count else 0.0
+            return TunnelStats(
+                self.name, self.local_port, self.remote_host, self.remote_port,
+                bytes_in, bytes_out,
+                len(live), self._total_connections, self._open_failures, self._errors,
+                latency_avg, self._open_latency_max, time.monotonic(),
+            )
+
+
+class ThroughputMeter:
+    """
+    주기적으로 받은 스냅샷을 직전 스냅샷과 비교해 터널별 초당 전송량을 계산한다.
+    터널은 로컬 포트로 구분하며, 누적값이 줄었으면(릴레이 재생성) 0부터 다시 센다.
+    """
+
+    def __init__(self):
+        self._previous = {}
+
+    def update(self, snapshots):
+        rates = []
+        previous = {}
+        for stats in snapshots:
+            last = self._previous.get(stats.local_port)
+            rate_in = rate_out = 0.0
+            if last is not None:
+                elapsed = stats.timestamp - last.timestamp
+                if elapsed > 0:
+                    rate_in = max(0, stats.bytes_in - last.bytes_in) / elapsed
+                    rate_out = max(0, stats.bytes_out - last.bytes_out) / elapsed
+            previous[stats.local_port] = stats
+            rates.append(TunnelRates(stats, rate_in, rate_out))
+        self._previous = previous
+        return rates
+
+
+def format_bytes(count):
+    """바이트 수를 B/KB/MB/GB로 표시"""
+    for unit in ("B", "KB", "MB"):
+        if count < 1024:
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GB"
@@ -0,0 +1,616 @@
+# core/tunnel_relay.py
+# 모든 터널의 리스닝 소켓과 SSH 채널을 소수의 이벤트 루프 스레드에서 중계
+
+import collections
+import itertools
+import logging
+import selectors
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.tunnel_metrics import TunnelMetrics
+
+logger = logging.getLogger(__name__)
+
+# 기본 이벤트 루프(워커) 스레드 수
+DEFAULT_RELAY_WORKERS = 1
+
+# 채널 열기(direct-tcpip 요청)는 응답을 기다리며 블로킹되므로 별도 풀에서 처리
+CHANNEL_OPEN_WORKERS = 4
+
+# 기본 읽기 버퍼 크기 (한 번의 recv로 읽어들이는 최대 바이트 수)
+DEFAULT_RELAY_BUFFER_SIZE = 128 * 1024
+MIN_RELAY_BUFFER_SIZE = 4 * 1024
+
+# 채널은 쓰기 가능 알림(fd)이 없으므로, 송신 윈도우가 가득 찬 연결은 이 주기로 재시도
+CHANNEL_WRITE_POLL_INTERVAL = 0.005
+
+# 터널 하나를 내릴 때 루프 스레드가 리스닝 소켓을 닫기를 기다리는 최대 시간 (초)
+LISTENER_CLOSE_TIMEOUT = 1.0
+
+# 한 번의 readable 이벤트에서 연속으로 accept 하는 최대 클라이언트 수
+_ACCEPT_BACKLOG_BATCH = 32
+
+# sendmsg 한 번에 모아 보내는 최대 버퍼 수 (Windows 등 sendmsg가 없으면 send 사용)
+_MAX_SENDMSG_BUFFERS = 64
+_HAS_SENDMSG = hasattr(socket.socket, "sendmsg")
+
+
+class _RelayLoop:
+    """
+    selector 하나를 소유하고, 등록된 소켓/채널 이벤트를 처리하는 이벤트 루프 스레드.
+    다른 스레드에서는 call_soon()으로만 작업을 전달한다.
+    """
+
+    def __init__(self, name):
+        self.selector = selectors.DefaultSelector()
+        self._calls = collections.deque()
+        self._write_waiters = set()
+        self._running = False
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+        self.selector.register(self._wakeup_r, selectors.EVENT_READ, self._drain_wakeup)
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self._running = True
+        self._thread.start()
+
+    def stop(self, timeout=2):
+        """
+        루프를 멈춘다. 이미 예약된 작업은 루프 스레드가 종료 직전에 실행하며,
+        스레드가 시작되지 않았거나 이미 끝났으면 호출한 스레드에서 대신 실행한다.
+        """
+        self._running = False
+        self._wakeup()
+        if self.is_current():
+            return
+        if self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        if not self._thread.is_alive():
+            self._run_calls()
+
+    def is_current(self):
+        """호출한 스레드가 이 루프 스레드인지"""
+        return self._thread is threading.current_thread()
+
+    def call_soon(self, callback, *args):
+        """루프 스레드에서 callback(*args)를 실행하도록 예약 (스레드 안전)"""
+        self._calls.append((callback, args))
+        self._wakeup()
+
+    def register(self, fileobj, events, handler):
+        self.selector.register(fileobj, events, handler)
+
+    def modify(self, fileobj, events, handler):
+        self.selector.modify(fileobj, events, handler)
+
+    def unregister(self, fileobj):
+        try:
+            self.selector.unregister(fileobj)
+        except (KeyError, ValueError, OSError):
+            pass
+
+    def add_write_waiter(self, conn):
+        """채널 송신 윈도우가 열리기를 기다리는 연결을 등록 (루프 스레드 전용)"""
+        self._write_waiters.add(conn)
+
+    def discard_write_waiter(self, conn):
+        self._write_waiters.discard(conn)
+
+    def _wakeup(self):
+        try:
+            self._wakeup_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            # 이미 깨울 신호가 쌓여 있거나 루프가 종료됨
+            pass
+
+    def _drain_wakeup(self, mask):
+        try:
+            while self._wakeup_r.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _run_calls(self):
+        while self._calls:
+            callback, args = self._calls.popleft()
+            try:
+                callback(*args)
+            except Exception:
+                logger.exception("릴레이 예약 작업 실행 중 오류")
+
+    def _run(self):
+        try:
+            while self._running:
+                self._run_calls()
+                timeout = CHANNEL_WRITE_POLL_INTERVAL if self._write_waiters else 1.0
+                for key, mask in self.selector.select(timeout=timeout):
+                    try:
+                        key.data(mask)
+                    except Exception:
+                        logger.exception("릴레이 이벤트 처리 중 오류")
+                for conn in list(self._write_waiters):
+                    conn.on_channel_writable()
+            self._run_calls()
+        finally:
+            self.selector.close()
+            for sock in (self._wakeup_r, self._wakeup_w):
+                try:
+                    sock.close()
+                except OSError:
+                    pass
+
+
+class _TunnelListener:
+    """로컬 포트에서 대기하는 리스닝 소켓 하나"""
+
+    def __init__(self, tunnel_info, server_socket, loop):
+        self.local_port = tunnel_info["local"]
+        self.remote_host = tunnel_info["remote_host"]
+        self.remote_port = tunnel_info["remote_port"]
+        self.name = tunnel_info.get("name", "Unnamed")
+        self.socket = server_socket
+        self.loop = loop
+        self.metrics = TunnelMetrics(self.name, self.local_port, self.remote_host, self.remote_port)
+
+
+class _ForwardBuffer:
+    """
+    연결마다 한 번만 할당하는 고정 크기 버퍼.
+    recv_into로 [end:]에 채우고, memoryview로 [start:end)를 그대로 내보낸다.
+    """
+
+    __slots__ = ("data", "view", "start", "end")
+
+    def __init__(self, size):
+        self.data = bytearray(size)
+        self.view = memoryview(self.data)
+        self.start = 0
+        self.end = 0
+
+    def __len__(self):
+        return self.end - self.start
+
+    @property
+    def full(self):
+        return self.end - self.start >= len(self.data)
+
+    def writable(self):
+        """비어 있는 뒷부분의 memoryview (필요하면 남은 데이터를 앞으로 당긴다)"""
+        if self.start == self.end:
+            self.start = self.end = 0
+        elif self.end == len(self.data) and self.start > 0:
+            pending = self.end - self.start
+            self.view[:pending] = self.view[self.start:self.end]
+            self.start, self.end = 0, pending
+        return self.view[self.end:]
+
+    def pending(self):
+        return self.view[self.start:self.end]
+
+    def produce(self, n):
+        self.end += n
+
+    def consume(self, n):
+        self.start += n
+        if self.start == self.end:
+            self.start = self.end = 0
+
+
+class _RelayConnection:
+    """
+    클라이언트 소켓 하나와 SSH 채널 하나를 잇는 논블로킹 중계 연결.
+
+    방향마다 대기 중인 쓰기 버퍼를 두고, buffer_size만큼 쌓이면
+    (= 상대편 소켓 버퍼나 채널 송신 윈도우가 가득 차면) 해당 방향의 읽기를 멈춘다.
+    한쪽이 EOF를 보내면 남은 데이터를 모두 전달한 뒤 반대편 쓰기만 닫는다(half-close).
+
+    클라이언트 → 채널 방향은 미리 할당한 버퍼에 recv_into로 읽어 복사 없이 전달하고,
+    채널 → 클라이언트 방향은 paramiko가 돌려준 bytes를 memoryview로 잘라 보낸다.
+
+    읽은 바이트 수는 연결 전용 counters에 더하고, 닫힐 때 터널 metrics로 합친다.
+    """
+
+    def __init__(self, relay, loop, client_socket, channel, tunnel_name, buffer_size,
+                 metrics, counters):
+        self.relay = relay
+        self.loop = loop
+        self.client_socket = client_socket
+        self.channel = channel
+        self.tunnel_name = tunnel_name
+        self.buffer_size = buffer_size
+        self.metrics = metrics
+        self.counters = counters
+        self.closed = False
+
+        self._to_client = collections.deque()
+        self._to_client_size = 0
+        self._to_channel = _ForwardBuffer(buffer_size)
+        self._client_eof = False
+        self._channel_eof = False
+        self._client_write_shut = False
+        self._channel_write_shut = False
+        self._client_events = 0
+        self._channel_events = 0
+
+    def start(self):
+        if self.closed:
+            return
+        self.client_socket.setblocking(False)
+        self.channel.setblocking(False)
+        self._update_interest()
+
+    # ---------- 이벤트 핸들러 ----------
+
+    def _on_client_event(self, mask):
+        self._guarded(self._handle_client_event, mask)
+
+    def _on_channel_event(self, mask):
+        self._guarded(self._handle_channel_event, mask)
+
+    def on_channel_writable(self):
+        self._guarded(self._flush_to_channel)
+
+    def _guarded(self, handler, *args):
+        if self.closed:
+            return
+        try:
+            handler(*args)
+            self._update_interest()
+        except Exception as e:
+            print(f"[!] [{self.tunnel_name}] 포워딩 중 오류 발생: {e}")
+            self.metrics.connection_error()
+            self.close()
+
+    def _handle_client_event(self, mask):
+        if mask & selectors.EVENT_WRITE:
+            self._flush_to_client()
+        if mask & selectors.EVENT_READ:
+            self._read_client()
+
+    def _handle_channel_event(self, mask):
+        self._read_channel()
+
+    # ---------- 클라이언트 → 채널 ----------
+
+    def _read_client(self):
+        if self._to_channel.full:
+            return
+        try:
+            n = self.client_socket.recv_into(self._to_channel.writable())
+        except (BlockingIOError, InterruptedError):
+            return
+        if n == 0:
+            self._client_eof = True
+        else:
+            self._to_channel.produce(n)
+            self.counters.bytes_out += n
+        self._flush_to_channel()
+
+    def _flush_to_channel(self):
+        buf = self._to_channel
+        while buf:
+            try:
+                sent = self.channel.send(buf.pending())
+            except socket.timeout:
+                # 송신 윈도우 소진 - 루프가 주기적으로 재시도
+                break
+            if sent == 0:
+                raise EOFError("채널이 닫혔습니다")
+            buf.consume(sent)
+
+        if self._client_eof and not buf and not self._channel_write_shut:
+            self._channel_write_shut = True
+            self.channel.shutdown_write()
+
+    # ---------- 채널 → 클라이언트 ----------
+
+    def _read_channel(self):
+        try:
+            data = self.channel.recv(self.buffer_size)
+        except socket.timeout:
+            return
+        if not data:
+            self._channel_eof = True
+        else:
+            self._to_client.append(memoryview(data))
+            self._to_client_size += len(data)
+            self.counters.bytes_in += len(data)
+        self._flush_to_client()
+
+    def _flush_to_client(self):
+        queue = self._to_client
+        while queue:
+            if _HAS_SENDMSG and len(queue) > 1:
+                buffers = list(itertools.islice(queue, _MAX_SENDMSG_BUFFERS))
+            else:
+                buffers = [queue[0]]
+            try:
+                if len(buffers) > 1:
+                    sent = self.client_socket.sendmsg(buffers)
+                else:
+                    sent = self.client_socket.send(buffers[0])
+            except (BlockingIOError, InterruptedError):
+                break
+
+            self._to_client_size -= sent
+            partial = sent < sum(len(b) for b in buffers)
+            while sent:
+                head = queue[0]
+                if sent >= len(head):
+                    sent -= len(head)
+                    queue.popleft()
+                else:
+                    queue[0] = head[sent:]
+                    sent = 0
+            if partial:
+                # 소켓 버퍼가 찼으므로 다음 writable 이벤트를 기다린다
+                break
+
+        if self._channel_eof and not queue and not self._client_write_shut:
+            self._client_write_shut = True
+            try:
+                self.client_socket.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+
+    # ---------- 이벤트 관심사(backpressure) 갱신 ----------
+
+    def _update_interest(self):
+        if self.closed:
+            return
+
+        if self._client_write_shut and self._channel_write_shut:
+            self.close()
+            return
+
+        client_events = 0
+        if not self._client_eof and not self._to_channel.full:
+            client_events |= selectors.EVENT_READ
+        if self._to_client:
+            client_events |= selectors.EVENT_WRITE
+        self._client_events = self._set_events(
+            self.client_socket, self._client_events, client_events, self._on_client_event
+        )
+
+        channel_events = 0
+        if not self._channel_eof and self._to_client_size < self.buffer_size:
+            channel_events |= selectors.EVENT_READ
+        self._channel_events = self._set_events(
+            self.channel, self._channel_events, channel_events, self._on_channel_event
+        )
+
+        if self._to_channel:
+            self.loop.add_write_waiter(self)
+        else:
+            self.loop.discard_write_waiter(self)
+
+    def _set_events(self, fileobj, current, wanted, handler):
+        if wanted == current:
+            return current
+        if current == 0:
+            self.loop.register(fileobj, wanted, handler)
+        elif wanted == 0:
+            self.loop.unregister(fileobj)
+        else:
+            self.loop.modify(fileobj, wanted, handler)
+        return wanted
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.loop.discard_write_waiter(self)
+        self.loop.unregister(self.client_socket)
+        self.loop.unregister(self.channel)
+        for endpoint in (self.client_socket, self.channel):
+            try:
+                endpoint.close()
+            except Exception:
+                pass
+        self._to_client.clear()
+        self.metrics.connection_closed(self.counters)
+        self.relay._forget_connection(self)
+        print(f"[-] [{self.tunnel_name}] 연결 종료")
+
+
+class TunnelRelay:
+    """
+    SSHManager 하나의 모든 터널을 중계하는 이벤트 기반 릴레이 엔진.
+
+    리스닝 소켓과 (클라이언트 소켓, 채널) 쌍을 workers 개의 이벤트 루프 스레드에
+    나누어 등록하므로, 동시 접속 수와 무관하게 스레드 수가 일정하게 유지된다.
+
+    open_channel: (remote_host, remote_port, src_addr) -> paramiko.Channel
+    buffer_size: 연결·방향별 읽기 크기이자 쓰기 대기 큐의 상한 (backpressure 기준)
+    """
+
+    def __init__(self, open_channel, workers=DEFAULT_RELAY_WORKERS,
+                 channel_open_workers=CHANNEL_OPEN_WORKERS,
+                 buffer_size=DEFAULT_RELAY_BUFFER_SIZE):
+        self._open_channel = open_channel
+        self._workers = max(1, int(workers))
+        self._buffer_size = max(MIN_RELAY_BUFFER_SIZE, int(buffer_size))
+        self._loops = []
+        self._loop_cycle = None
+        self._listeners = []
+        self._connections = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, int(channel_open_workers)),
+            thread_name_prefix="tunnel-open",
+        )
+        self._stopped = False
+
+    @property
+    def connection_count(self):
+        with self._lock:
+            return len(self._connections)
+
+    def metrics_snapshot(self):
+        """터널(리스닝 포트)별 TunnelStats 목록"""
+        with self._lock:
+            listeners = list(self._listeners)
+        return [listener.metrics.snapshot() for listener in listeners]
+
+    def local_ports(self):
+        """현재 리스닝 중인 로컬 포트 집합"""
+        with self._lock:
+            return {listener.local_port for listener in self._listeners}
+
+    def start(self):
+        if self._loops:
+            return
+        for i in range(self._workers):
+            loop = _RelayLoop(name=f"tunnel-relay-{i}")
+            loop.start()
+            self._loops.append(loop)
+        self._loop_cycle = itertools.cycle(self._loops)
+
+    def add_tunnel(self, tunnel_info):
+        """
+        로컬 포트를 바인딩하고 릴레이 루프에 등록한다.
+        바인딩 실패 시 OSError를 그대로 전달한다.
+        """
+        self.start()
+
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            server.bind(('127.0.0.1', tunnel_info["local"]))
+            server.listen(100)
+            server.setblocking(False)
+        except OSError:
+            server.close()
+            raise
+
+        listener = _TunnelListener(tunnel_info, server, self._next_loop())
+        with self._lock:
+            self._listeners.append(listener)
+        listener.loop.call_soon(
+            listener.loop.register,
+            server,
+            selectors.EVENT_READ,
+            lambda mask: self._on_accept(listener),
+        )
+        print(
+            f"[*] [{listener.name}] 포트포워딩 시작: "
+            f"localhost:{listener.local_port} → {listener.remote_host}:{listener.remote_port}"
+        )
+        return listener
+
+    def remove_tunnel(self, local_port):
+        """
+        로컬 포트의 리스닝 소켓과 그 터널로 들어온 중계 연결을 닫는다.
+        해당 포트의 터널이 없으면 False를 반환한다.
+        """
+        with self._lock:
+            listener = next((l for l in self._listeners if l.local_port == local_port), None)
+            if listener is None:
+                return False
+            self._listeners.remove(listener)
+            connections = [conn for conn in self._connections if conn.metrics is listener.metrics]
+
+        # 같은 포트를 곧바로 다시 바인딩할 수 있도록 리스닝 소켓이 닫힐 때까지 기다린다
+        closed = threading.Event()
+        listener.loop.call_soon(self._close_listener, listener, closed)
+        for conn in connections:
+            conn.loop.call_soon(conn.close)
+        if not listener.loop.is_current():
+            closed.wait(LISTENER_CLOSE_TIMEOUT)
+        print(f"[-] [{listener.name}] 포트포워딩 종료: localhost:{listener.local_port}")
+        return True
+
+    def stop(self):
+        """모든 리스닝 소켓과 중계 연결을 닫고 루프 스레드를 종료한다."""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            listeners = list(self._listeners)
+            connections = list(self._connections)
+            self._listeners.clear()
+
+        # 소켓은 자신을 등록한 루프 스레드에서 닫아야 selector와 경합하지 않는다
+        for listener in listeners:
+            listener.loop.call_soon(self._close_listener, listener)
+        for conn in connections:
+            conn.loop.call_soon(conn.close)
+
+        for loop in self._loops:
+            loop.stop()
+
+        self._executor.shutdown(wait=False)
+        self._loops = []
+
+    @staticmethod
+    def _close_listener(listener, closed=None):
+        listener.loop.unregister(listener.socket)
+        try:
+            listener.socket.close()
+        except OSError:
+            pass
+        if closed is not None:
+            closed.set()
+
+    def _next_loop(self):
+        with self._lock:
+            return next(self._loop_cycle)
+
+    def _on_accept(self, listener):
+        for _ in range(_ACCEPT_BACKLOG_BATCH):
+            try:
+                client_socket, addr = listener.socket.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                listener.loop.unregister(listener.socket)
+                return
+
+            print(f"[+] [{listener.name}] 클라이언트 접속됨: {addr}")
+            try:
+                self._executor.submit(self._open_and_attach, listener, client_socket)
+            except RuntimeError:
+                # 릴레이가 종료되는 중
+                client_socket.close()
+                return
+
+    def _open_and_attach(self, listener, client_socket):
+        start = time.monotonic()
+        try:
+            channel = self._open_channel(
+                listener.remote_host,
+                listener.remote_port,
+                client_socket.getsockname(),
+            )
+            if channel is None:
+                raise OSError("채널을 열 수 없습니다")
+        except Exception as e:
+            print(f"[!] [{listener.name}] 포워딩 중 오류 발생: {e}")
+            listener.metrics.channel_open_failed()
+            client_socket.close()
+            print(f"[-] [{listener.name}] 연결 종료")
+            return
+
+        counters = listener.metrics.channel_opened(time.monotonic() - start)
+        loop = self._next_loop()
+        conn = _RelayConnection(
+            self, loop, client_socket, channel, listener.name, self._buffer_size,
+            listener.metrics, counters,
+        )
+        with self._lock:
+            if self._stopped or listener not in self._listeners:
+                client_socket.close()
+                channel.close()
+                listener.metrics.connection_closed(counters)
+                return
+            self._connections.add(conn)
+        loop.call_soon(conn.start)
+
+    def _forget_connection(self, conn):
+        with self._lock:
+            self._connections.discard(conn)
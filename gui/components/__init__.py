@@ -5,8 +5,10 @@
 
 from .header_bar import HeaderBar
 from .server_card import ServerCard
+from .server_list_view import ServerListModel, ServerListView
 from .bottom_panel import BottomPanel
 from .server_form_card import ServerFormCard
+from .terminal_view import TerminalView
 
-__all__ = ['HeaderBar', 'ServerCard', 'BottomPanel', 'ServerFormCard']
+__all__ = ['HeaderBar', 'ServerCard', 'ServerListModel', 'ServerListView', 'BottomPanel', 'ServerFormCard', 'TerminalView']
 
@@ -0,0 +1,384 @@
+# gui/components/server_list_view.py
+"""
+서버 카드 목록을 모델/뷰로 그리는 가상화 리스트.
+화면에 보이는 행만 델리게이트가 직접 그리고, 상태가 바뀐 행만 다시 그린다.
+"""
+
+from PyQt5.QtCore import QAbstractListModel, QEvent, QModelIndex, QRect, QRectF, QSize, Qt, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen
+from PyQt5.QtWidgets import QAbstractItemView, QFrame, QListView, QStyle, QStyledItemDelegate
+
+from core.ssh_manager import (
+    STATE_CONNECTED, STATE_CONNECTING, STATE_DISCONNECTED, STATE_FAILED, STATE_RECONNECTING,
+)
+from gui.connection_state import ACTIVE_STATES
+from gui.theme import Theme
+
+# 모델 데이터 역할
+SUMMARY_ROLE = Qt.UserRole + 1    # ServerSummary
+STATE_ROLE = Qt.UserRole + 2      # 연결 상태 (core.ssh_manager.STATE_*)
+TRAFFIC_ROLE = Qt.UserRole + 3    # 터널 트래픽 문구
+SERVER_ID_ROLE = Qt.UserRole + 4  # 저장소 id
+
+# 카드 버튼 동작
+ACTION_CONNECT = "connect"
+ACTION_DISCONNECT = "disconnect"
+ACTION_SSH = "ssh"
+ACTION_EDIT = "edit"
+ACTION_DELETE = "delete"
+
+# 카드 배치 (px)
+CARD_PADDING = 20
+CARD_SPACING = 12
+HEADER_HEIGHT = 26
+INFO_HEIGHT = 18
+TUNNEL_HEIGHT = 22
+BUTTON_HEIGHT = 32
+LINE_GAP = 10
+CARD_HEIGHT = (CARD_PADDING * 2 + HEADER_HEIGHT + INFO_HEIGHT + TUNNEL_HEIGHT
+               + BUTTON_HEIGHT + 1 + LINE_GAP * 5)
+
+# 연결 상태별 배지 (글자, 배경, 글자색)
+_STATE_BADGES = {
+    STATE_DISCONNECTED: ("연결 안됨", Theme.STATUS_INACTIVE_BG, Theme.STATUS_INACTIVE_TEXT),
+    STATE_CONNECTING: ("연결 중", "#dbeafe", "#1e40af"),
+    STATE_CONNECTED: ("연결됨", Theme.STATUS_ACTIVE_BG, Theme.STATUS_ACTIVE_TEXT),
+    STATE_RECONNECTING: ("재연결 중", "#fef3c7", "#92400e"),
+    STATE_FAILED: ("연결 실패", "#fee2e2", "#991b1b"),
+}
+
+# 버튼 모양별 (배경, 글자, 테두리, 마우스를 올렸을 때 배경)
+_BUTTON_COLORS = {
+    "primary": (Theme.PRIMARY, Theme.PRIMARY_FOREGROUND, None, "#1a1a2e"),
+    "outline": (None, Theme.FOREGROUND, Theme.BORDER_SOLID, Theme.ACCENT),
+    "destructive": (Theme.DESTRUCTIVE, Theme.DESTRUCTIVE_FOREGROUND, None, "#b81636"),
+}
+
+
+def _px(value):
+    """Theme의 "14px" 같은 값을 정수로"""
+    return int(str(value).replace("px", ""))
+
+
+def _font(size, weight=QFont.Normal):
+    font = QFont()
+    font.setPixelSize(_px(size))
+    font.setWeight(weight)
+    return font
+
+
+class ServerListModel(QAbstractListModel):
+    """
+    서버 목록(ServerInventory)을 행으로 보여 주는 모델.
+
+    data()가 불린 행의 요약만 읽으므로 화면에 보이는 행만 읽힌다. rows를 주면
+    (검색 결과) 그 인덱스들만 그 순서로 보여 준다. 연결 상태는 ConnectionStateModel에서
+    읽고, state_changed가 오면 그 서버의 행에만 dataChanged를 보내므로 카드 한 장만
+    다시 그려진다. 트래픽 문구도 서버 id별로 들고 있다가 바뀐 행만 알린다.
+    """
+
+    def __init__(self, states=None, parent=None):
+        super().__init__(parent)
+        self._servers = None
+        self._rows = None
+        self._row_of = None
+        self._traffic = {}
+        self._states = states
+        if states is not None:
+            states.state_changed.connect(self._on_state_changed)
+
+    def set_servers(self, servers, rows=None):
+        """목록을 통째로 바꾼다 (서버 추가·수정·삭제, 검색어 변경)"""
+        self.beginResetModel()
+        self._servers = servers
+        self._rows = rows
+        self._row_of = None
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self._servers is None:
+            return 0
+        return len(self._servers) if self._rows is None else len(self._rows)
+
+    def source_index(self, row):
+        """행 → 서버 목록 인덱스"""
+        return row if self._rows is None else self._rows[row]
+
+    def row_of(self, server_id):
+        """서버 id → 행 (목록에 없거나 검색으로 가려졌으면 None)"""
+        if self._servers is None:
+            return None
+        source = self._servers.index_of(server_id)
+        if source is None or self._rows is None:
+            return source
+        if self._row_of is None:
+            self._row_of = {index: row for row, index in enumerate(self._rows)}
+        return self._row_of.get(source)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        summary = self._servers.summary(self.source_index(index.row()))
+        if role == SUMMARY_ROLE:
+            return summary
+        if role == Qt.DisplayRole:
+            return summary.name
+        if role == STATE_ROLE:
+            return self._states.state(summary.id) if self._states is not None else STATE_DISCONNECTED
+        if role == TRAFFIC_ROLE:
+            return self._traffic.get(summary.id, "")
+        if role == SERVER_ID_ROLE:
+            return summary.id
+        return None
+
+    def set_traffic(self, server_id, text):
+        if self._traffic.get(server_id, "") != text:
+            self._traffic[server_id] = text
+            self.server_changed(server_id)
+
+    def server_changed(self, server_id):
+        """그 서버의 카드만 다시 그린다"""
+        row = self.row_of(server_id)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+    def _on_state_changed(self, server_id, old_state, new_state):
+        if new_state not in ACTIVE_STATES:
+            self._traffic.pop(server_id, None)
+        self.server_changed(server_id)
+
+
+class ServerCardDelegate(QStyledItemDelegate):
+    """
+    서버 카드 한 장을 위젯·스타일시트 없이 직접 그리는 델리게이트.
+    버튼도 그림이며, 클릭 위치로 어떤 버튼인지 찾아 action_triggered를 보낸다.
+    """
+
+    action_triggered = pyqtSignal(str, object)  # 동작, 서버 id
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._title_font = _font(Theme.FONT_SIZE_LG, QFont.DemiBold)
+        self._text_font = _font(Theme.FONT_SIZE_SM)
+        self._badge_font = _font(Theme.FONT_SIZE_SM, QFont.Medium)
+        self._title_metrics = QFontMetrics(self._title_font)
+        self._text_metrics = QFontMetrics(self._text_font)
+        self._badge_metrics = QFontMetrics(self._badge_font)
+        # 마우스가 올라가 있는 (행, 버튼 동작)
+        self._hover = None
+
+    def sizeHint(self, option, index):
+        # 가로는 뷰 너비에 맞춰 늘어나므로 세로만 의미가 있다
+        return QSize(200, CARD_HEIGHT + CARD_SPACING)
+
+    # ---------- 배치 ----------
+
+    @staticmethod
+    def _card_rect(rect):
+        return QRect(rect.left(), rect.top(), rect.width() - 1, CARD_HEIGHT)
+
+    def _buttons(self, card, connected):
+        """[(동작, 글자, 모양, 사각형)] 왼쪽은 연결 버튼, 오른쪽은 수정·삭제"""
+        if connected:
+            left = [(ACTION_DISCONNECT, "⏹ 중지", "outline"), (ACTION_SSH, "SSH", "primary")]
+        else:
+            left = [(ACTION_CONNECT, "▶ 시작", "primary")]
+        right = [(ACTION_EDIT, "✏ 수정", "outline"), (ACTION_DELETE, "🗑 삭제", "destructive")]
+
+        top = card.bottom() - CARD_PADDING - BUTTON_HEIGHT + 1
+        buttons = []
+        x = card.left() + CARD_PADDING
+        for action, text, style in left:
+            width = self._badge_metrics.horizontalAdvance(text) + 32
+            buttons.append((action, text, style, QRect(x, top, width, BUTTON_HEIGHT)))
+            x += width + 8
+        x = card.right() - CARD_PADDING + 1
+        for action, text, style in reversed(right):
+            width = self._badge_metrics.horizontalAdvance(text) + 32
+            x -= width
+            buttons.append((action, text, style, QRect(x, top, width, BUTTON_HEIGHT)))
+            x -= 8
+        return buttons
+
+    def _button_at(self, rect, index, pos):
+        active = index.data(STATE_ROLE) in ACTIVE_STATES
+        for action, _, _, button in self._buttons(self._card_rect(rect), active):
+            if button.contains(pos):
+                return action
+        return None
+
+    # ---------- 그리기 ----------
+
+    def paint(self, painter, option, index):
+        summary = index.data(SUMMARY_ROLE)
+        state = index.data(STATE_ROLE)
+        connected = state in ACTIVE_STATES
+        card = self._card_rect(option.rect)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        radius = _px(Theme.RADIUS_LG)
+        painter.setPen(QPen(QColor(Theme.PRIMARY if hovered else Theme.BORDER_SOLID), 1))
+        painter.setBrush(QColor(Theme.CARD))
+        painter.drawRoundedRect(QRectF(card).adjusted(0.5, 0.5, -0.5, -0.5), radius, radius)
+
+        left = card.left() + CARD_PADDING
+        width = card.width() - CARD_PADDING * 2
+        y = card.top() + CARD_PADDING
+
+        # 헤더: 서버명 + 상태 배지
+        badge_text, badge_background, badge_foreground = _STATE_BADGES.get(
+            state, _STATE_BADGES[STATE_DISCONNECTED])
+        badge_width = self._badge_metrics.horizontalAdvance(badge_text) + 24
+        name = self._title_metrics.elidedText(summary.name, Qt.ElideRight, max(0, width - badge_width - 12))
+        name_width = self._title_metrics.horizontalAdvance(name)
+        painter.setFont(self._title_font)
+        painter.setPen(QColor(Theme.FOREGROUND))
+        painter.drawText(QRect(left, y, name_width, HEADER_HEIGHT), Qt.AlignLeft | Qt.AlignVCenter, name)
+        self._draw_badge(
+            painter, QRect(left + name_width + 12, y, badge_width, HEADER_HEIGHT), badge_text,
+            badge_background, badge_foreground,
+        )
+        y += HEADER_HEIGHT + LINE_GAP
+
+        # 서버 정보
+        info = self._text_metrics.elidedText(
+            f"{summary.username}@{summary.host}:{summary.port}", Qt.ElideRight, width)
+        painter.setFont(self._text_font)
+        painter.setPen(QColor(Theme.MUTED_FOREGROUND))
+        painter.drawText(QRect(left, y, width, INFO_HEIGHT), Qt.AlignLeft | Qt.AlignVCenter, info)
+        y += INFO_HEIGHT + LINE_GAP
+
+        # 터널 배지 + 실시간 트래픽
+        if summary.tunnel_count:
+            text = f"{summary.tunnel_count}개 터널"
+            tunnel_width = self._badge_metrics.horizontalAdvance(text) + 16
+            self._draw_badge(painter, QRect(left, y, tunnel_width, TUNNEL_HEIGHT), text,
+                             Theme.SECONDARY, Theme.FOREGROUND, Theme.BORDER_SOLID)
+            traffic = index.data(TRAFFIC_ROLE) if connected else ""
+            if traffic:
+                traffic_left = left + tunnel_width + 12
+                traffic = self._text_metrics.elidedText(
+                    traffic, Qt.ElideRight, max(0, left + width - traffic_left))
+                painter.setFont(self._text_font)
+                painter.setPen(QColor(Theme.MUTED_FOREGROUND))
+                painter.drawText(QRect(traffic_left, y, left + width - traffic_left, TUNNEL_HEIGHT),
+                                 Qt.AlignLeft | Qt.AlignVCenter, traffic)
+        y += TUNNEL_HEIGHT + LINE_GAP
+
+        # 구분선
+        painter.setPen(QPen(QColor(Theme.BORDER_SOLID), 1))
+        painter.drawLine(left, y, left + width, y)
+
+        # 버튼
+        for action, text, style, rect in self._buttons(card, connected):
+            button_hovered = self._hover == (index.row(), action)
+            self._draw_button(painter, rect, text, style, button_hovered)
+
+        painter.restore()
+
+    def _draw_badge(self, painter, rect, text, background, foreground, border=None):
+        radius = _px(Theme.RADIUS_SM)
+        painter.setPen(QPen(QColor(border), 1) if border else Qt.NoPen)
+        painter.setBrush(QColor(background))
+        painter.drawRoundedRect(QRectF(rect).adjusted(0.5, 0.5, -0.5, -0.5), radius, radius)
+        painter.setFont(self._badge_font)
+        painter.setPen(QColor(foreground))
+        painter.drawText(rect, Qt.AlignCenter, text)
+
+    def _draw_button(self, painter, rect, text, style, hovered):
+        background, foreground, border, hover_background = _BUTTON_COLORS[style]
+        if hovered:
+            background = hover_background
+        radius = _px(Theme.RADIUS_MD)
+        painter.setPen(QPen(QColor(border), 1) if border else Qt.NoPen)
+        painter.setBrush(QColor(background) if background else Qt.NoBrush)
+        painter.drawRoundedRect(QRectF(rect).adjusted(0.5, 0.5, -0.5, -0.5), radius, radius)
+        painter.setFont(self._badge_font)
+        painter.setPen(QColor(foreground))
+        painter.drawText(rect, Qt.AlignCenter, text)
+
+    # ---------- 마우스 ----------
+
+    def editorEvent(self, event, model, option, index):
+        event_type = event.type()
+        if event_type in (QEvent.MouseButtonPress, QEvent.MouseButtonDblClick):
+            return event.button() == Qt.LeftButton and self._button_at(option.rect, index, event.pos()) is not None
+        if event_type == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            action = self._button_at(option.rect, index, event.pos())
+            if action is not None:
+                self.action_triggered.emit(action, index.data(SERVER_ID_ROLE))
+                return True
+        return False
+
+    def update_hover(self, view, index, pos):
+        """마우스 위치의 버튼을 강조 (강조가 바뀐 행만 다시 그린다)"""
+        hover = None
+        if index.isValid():
+            action = self._button_at(view.visualRect(index), index, pos)
+            if action is not None:
+                hover = (index.row(), action)
+        if hover == self._hover:
+            return
+        rows = {row for row, _ in filter(None, (self._hover, hover))}
+        self._hover = hover
+        for row in rows:
+            view.update(view.model().index(row, 0))
+
+
+class ServerListView(QListView):
+    """
+    서버 카드 목록 뷰. 카드 버튼은 ServerCard와 같은 이름의 시그널로 서버 id를 보낸다
+    (인덱스는 삭제하면 밀리므로).
+    """
+
+    edit_clicked = pyqtSignal(object)
+    delete_clicked = pyqtSignal(object)
+    connect_clicked = pyqtSignal(object)
+    disconnect_clicked = pyqtSignal(object)
+    ssh_clicked = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.card_delegate = ServerCardDelegate(self)
+        self.card_delegate.action_triggered.connect(self._on_action)
+        self.setItemDelegate(self.card_delegate)
+
+        self.setObjectName("serverListView")
+        self.setStyleSheet("QListView#serverListView { background: transparent; border: none; }")
+        self.setFrameShape(QFrame.NoFrame)
+        # 모든 카드 높이가 같으므로 행마다 크기를 묻지 않는다
+        self.setUniformItemSizes(True)
+        self.setResizeMode(QListView.Adjust)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.verticalScrollBar().setSingleStep(24)
+        self.setMouseTracking(True)
+
+    def mouseMoveEvent(self, event):
+        self.card_delegate.update_hover(self, self.indexAt(event.pos()), event.pos())
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self.card_delegate.update_hover(self, QModelIndex(), None)
+        super().leaveEvent(event)
+
+    def reset(self):
+        # 행이 통째로 바뀌면 기억해 둔 강조 위치도 무효
+        self.card_delegate.update_hover(self, QModelIndex(), None)
+        super().reset()
+
+    def _on_action(self, action, server_id):
+        signal = {
+            ACTION_CONNECT: self.connect_clicked,
+            ACTION_DISCONNECT: self.disconnect_clicked,
+            ACTION_SSH: self.ssh_clicked,
+            ACTION_EDIT: self.edit_clicked,
+            ACTION_DELETE: self.delete_clicked,
+        }[action]
+        signal.emit(server_id)
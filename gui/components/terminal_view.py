@@ -0,0 +1,203 @@
+# gui/components/terminal_view.py
+"""
+pyte 화면을 글리프 격자로 직접 그리는 터미널 뷰.
+바뀐 줄만 전달받아 해당 줄 영역만 다시 그린다.
+"""
+
+from PyQt5.QtCore import QRect, Qt
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter
+from PyQt5.QtWidgets import QWidget
+
+DEFAULT_FOREGROUND = "#10b981"
+DEFAULT_BACKGROUND = "#1a1a1a"
+CURSOR_COLOR = "#10b981"
+
+# pyte 색상 이름 → 표시 색상
+_NAMED_COLORS = {
+    "black": "#1e293b",
+    "red": "#ef4444",
+    "green": "#10b981",
+    "brown": "#f59e0b",
+    "yellow": "#f59e0b",
+    "blue": "#3b82f6",
+    "magenta": "#a855f7",
+    "cyan": "#06b6d4",
+    "white": "#e2e8f0",
+    "brightblack": "#64748b",
+    "brightred": "#f87171",
+    "brightgreen": "#34d399",
+    "brightbrown": "#fbbf24",
+    "brightyellow": "#fbbf24",
+    "brightblue": "#60a5fa",
+    "brightmagenta": "#c084fc",
+    "brightcyan": "#22d3ee",
+    "brightwhite": "#f8fafc",
+}
+
+
+def _resolve_color(name, default):
+    if not name or name == "default":
+        return default
+    named = _NAMED_COLORS.get(name)
+    if named is not None:
+        return QColor(named)
+    if len(name) == 6:
+        color = QColor("#" + name)
+        if color.isValid():
+            return color
+    return default
+
+
+class TerminalView(QWidget):
+    """
+    고정 폭 글꼴 격자에 줄 단위 span을 그리는 위젯.
+
+    update_lines()로 바뀐 줄만 넘기면 해당 줄 사각형만 무효화되므로,
+    화면 전체를 텍스트로 다시 만드는 비용 없이 변경분만 다시 그린다.
+    """
+
+    def __init__(self, columns=80, rows=24, font=None, parent=None):
+        super().__init__(parent)
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.setAttribute(Qt.WA_InputMethodEnabled)
+
+        self._foreground = QColor(DEFAULT_FOREGROUND)
+        self._background = QColor(DEFAULT_BACKGROUND)
+        self._columns = columns
+        self._rows = rows
+        self._lines = [()] * rows
+        self._cursor = (0, 0)
+        self._cursor_visible = True
+
+        if font is None:
+            font = QFont("Consolas")
+            font.setStyleHint(QFont.Monospace)
+            font.setPointSize(11)
+        self.set_terminal_font(font)
+
+    # ---------- 설정 ----------
+
+    def set_terminal_font(self, font):
+        font.setFixedPitch(True)
+        self._font = font
+        self._bold_font = QFont(font)
+        self._bold_font.setBold(True)
+        metrics = QFontMetrics(font)
+        self._cell_width = max(1, metrics.horizontalAdvance("M"))
+        self._cell_height = max(1, metrics.height())
+        self._ascent = metrics.ascent()
+        self.update()
+
+    def cell_size(self):
+        return self._cell_width, self._cell_height
+
+    def grid_size(self):
+        return self._columns, self._rows
+
+    def fitting_grid_size(self, min_columns=20, min_rows=5):
+        """현재 위젯 크기와 글꼴 크기로 들어가는 (열, 행) 수"""
+        return (
+            max(min_columns, self.width() // self._cell_width),
+            max(min_rows, self.height() // self._cell_height),
+        )
+
+    def set_grid_size(self, columns, rows):
+        if (columns, rows) == (self._columns, self._rows):
+            return
+        self._columns = columns
+        if rows > self._rows:
+            self._lines = self._lines + [()] * (rows - self._rows)
+        else:
+            self._lines = self._lines[:rows]
+        self._rows = rows
+        self.update()
+
+    # ---------- 내용 갱신 ----------
+
+    def update_lines(self, lines, cursor=None, cursor_visible=True):
+        """
+        lines: {줄 번호: span 튜플}  (바뀐 줄만, 형식은 terminal_emulator.line_spans 참고)
+        cursor: (x, y) 커서 위치. 이전 위치와 새 위치의 줄도 다시 그린다.
+        """
+        for y, spans in lines.items():
+            if 0 <= y < self._rows:
+                self._lines[y] = spans
+                self.update(self._row_rect(y))
+
+        if cursor is not None and (cursor != self._cursor or cursor_visible != self._cursor_visible):
+            self.update(self._row_rect(self._cursor[1]))
+            self._cursor = cursor
+            self._cursor_visible = cursor_visible
+            self.update(self._row_rect(cursor[1]))
+
+    def clear(self):
+        self._lines = [()] * self._rows
+        self.update()
+
+    def screen_text(self):
+        """현재 화면 내용을 줄 단위 텍스트로 반환 (복사 등)"""
+        rows = []
+        for spans in self._lines:
+            row = [" "] * self._columns
+            for col, cells, text, *_ in spans:
+                if cells != len(text):
+                    if col < self._columns:
+                        row[col] = text
+                    continue
+                for i, ch in enumerate(text):
+                    if col + i < self._columns:
+                        row[col + i] = ch
+            rows.append("".join(row).rstrip())
+        return "\n".join(rows)
+
+    # ---------- 그리기 ----------
+
+    def _row_rect(self, y):
+        return QRect(0, y * self._cell_height, self.width(), self._cell_height)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        rect = event.rect()
+        painter.fillRect(rect, self._background)
+
+        cw, ch = self._cell_width, self._cell_height
+        first = max(0, rect.top() // ch)
+        last = min(self._rows - 1, rect.bottom() // ch)
+
+        for y in range(first, last + 1):
+            top = y * ch
+            for col, cells, text, fg, bg, bold, underscore, reverse in self._lines[y]:
+                fg_color = _resolve_color(fg, self._foreground)
+                bg_color = _resolve_color(bg, self._background)
+                if reverse:
+                    fg_color, bg_color = bg_color, fg_color
+                width = cw * cells
+                if bg_color != self._background:
+                    painter.fillRect(col * cw, top, width, ch, bg_color)
+                if text.isspace() and not underscore:
+                    continue
+                painter.setFont(self._bold_font if bold else self._font)
+                painter.setPen(fg_color)
+                painter.drawText(col * cw, top + self._ascent, text)
+                if underscore:
+                    painter.drawLine(col * cw, top + ch - 1, col * cw + width - 1, top + ch - 1)
+
+        cx, cy = self._cursor
+        if self._cursor_visible and first <= cy <= last:
+            cursor_rect = QRect(cx * cw, cy * ch, cw, ch)
+            if self.hasFocus():
+                color = QColor(CURSOR_COLOR)
+                color.setAlpha(160)
+                painter.fillRect(cursor_rect, color)
+            else:
+                painter.setPen(QColor(CURSOR_COLOR))
+                painter.drawRect(cursor_rect.adjusted(0, 0, -1, -1))
+
+    def focusInEvent(self, event):
+        super().focusInEvent(event)
+        self.update(self._row_rect(self._cursor[1]))
+
+    def focusOutEvent(self, event):
+        super().focusOutEvent(event)
+        self.update(self._row_rect(self._cursor[1]))
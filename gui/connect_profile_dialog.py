@@ -0,0 +1,118 @@
+# gui/connect_profile_dialog.py
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
+    QHeaderView, QFileDialog, QLabel
+)
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor
+
+from core.connect_profiler import PHASE_LABELS, PHASES, get_connect_profile_store
+from gui.icon_data import get_icon
+from gui.theme import Theme
+from gui.styled_message_box import StyledMessageBox
+
+# 이 시간(초)을 넘은 단계는 강조 표시
+SLOW_PHASE_SECONDS = 1.0
+
+
+class ConnectProfileDialog(QDialog):
+    """
+    서버별 마지막 연결 시도의 단계별 소요 시간 표.
+    연결 시간이 긴 서버가 위에 오며, 전체 기록을 JSON으로 내보낼 수 있다.
+    """
+
+    HEADERS = ["서버", "호스트", "결과"] + [PHASE_LABELS[phase] for phase in PHASES] + ["터널", "합계"]
+
+    def __init__(self, store=None, parent=None):
+        super().__init__(parent)
+        self.store = store if store is not None else get_connect_profile_store()
+        self.setWindowTitle("연결 분석")
+        self.setWindowIcon(get_icon())
+        self.setMinimumSize(960, 420)
+        self.setStyleSheet(f"""
+            QDialog {{
+                background-color: {Theme.BACKGROUND};
+            }}
+            QLabel {{
+                color: {Theme.MUTED_FOREGROUND};
+                font-size: {Theme.FONT_SIZE_SM};
+            }}
+        """)
+
+        layout = QVBoxLayout(self)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget(0, len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table, stretch=1)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        refresh_btn = QPushButton("새로고침")
+        refresh_btn.clicked.connect(self.refresh)
+        button_layout.addWidget(refresh_btn)
+        export_btn = QPushButton("JSON 내보내기")
+        export_btn.clicked.connect(self.export_json)
+        button_layout.addWidget(export_btn)
+        close_btn = QPushButton("닫기")
+        close_btn.clicked.connect(self.close)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+        self.refresh()
+
+    def refresh(self):
+        profiles = self.store.latest()
+        self.table.setRowCount(len(profiles))
+        for row, profile in enumerate(profiles):
+            if profile.success:
+                result = "성공"
+            else:
+                result = f"실패 ({PHASE_LABELS.get(profile.failed_phase, '-')}): {profile.error}"
+            values = [profile.name, f"{profile.username}@{profile.host}:{profile.port}", result]
+            values += [
+                f"{profile.phases[phase]:.3f}" if phase in profile.phases else ""
+                for phase in PHASES
+            ]
+            tunnel_seconds = sum(tunnel["seconds"] for tunnel in profile.tunnels)
+            values += [
+                f"{tunnel_seconds:.3f} ({len(profile.tunnels)})" if profile.tunnels else "",
+                f"{profile.total_time:.3f}",
+            ]
+
+            slowest = profile.slowest_phase()
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col >= 3:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                phase_col = col - 3
+                if 0 <= phase_col < len(PHASES) and PHASES[phase_col] == slowest \
+                        and profile.phases[slowest] >= SLOW_PHASE_SECONDS:
+                    item.setForeground(QColor(Theme.DESTRUCTIVE))
+                if col == 2 and not profile.success:
+                    item.setForeground(QColor(Theme.DESTRUCTIVE))
+                self.table.setItem(row, col, item)
+
+        failed = sum(1 for profile in profiles if not profile.success)
+        self.summary_label.setText(
+            f"서버 {len(profiles)}개 | 실패 {failed}개 | 단위: 초, 연결 시간이 긴 순서"
+        )
+
+    def export_json(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "연결 기록 내보내기", "hshell_connect_profile.json", "JSON (*.json)"
+        )
+        if not path:
+            return
+        try:
+            self.store.export_json(path)
+        except Exception as e:
+            StyledMessageBox.critical(self, "오류", f"내보내기에 실패했습니다: {e}")
@@ -0,0 +1,109 @@
+# gui/connection_pool.py
+"""
+SSH 연결을 GUI 스레드 밖에서 병렬로 수행하는 연결 풀
+"""
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from core.connection_registry import get_connection_registry
+
+# 동시에 연결을 시도할 최대 서버 수
+DEFAULT_MAX_PARALLEL_CONNECTS = 8
+
+
+class _ConnectTask(QRunnable):
+    """레지스트리에서 공유 연결을 얻는 작업 (필요하면 connect())을 워커 스레드에서 실행"""
+
+    def __init__(self, pool, index, server_info):
+        super().__init__()
+        self.pool = pool
+        self.index = index
+        self.server_info = server_info
+
+    def run(self):
+        ssh_manager = None
+        profile = None
+        try:
+            ssh_manager, success, profile = self.pool.registry.acquire(self.server_info, owner=self.index)
+        except Exception as e:
+            print(f"[!] {self.server_info.get('name', '')} 서버 연결 실패: {e}")
+            success = False
+        # 시그널은 GUI 스레드의 수신 측으로 큐잉되어 전달된다
+        self.pool._task_done.emit(self.index, self.server_info, ssh_manager, success, profile)
+
+
+class ConnectionPool(QObject):
+    """
+    서버 연결 요청을 QThreadPool에 넘겨 병렬로 처리하고, 결과를 시그널로 알린다.
+
+    connect_started(index)                    : 연결 시도 시작
+    connect_finished(index, server_info, ssh_manager, ok, profile)
+                                              : 서버 하나의 연결 시도 완료
+                                                (profile: 이번 시도의 ConnectProfile,
+                                                 공유 연결을 재사용했으면 None)
+    batch_progress(done, total)               : 여러 서버 연결 진행률
+
+    같은 (host, port, username)·인증 정보의 서버들은 레지스트리를 통해 SSHManager
+    하나를 공유하므로, 성공한 결과마다 registry.release(ssh_manager, owner=index)로
+    참조와 그 서버가 연 터널을 반납해야 한다.
+    """
+    connect_started = pyqtSignal(int)
+    connect_finished = pyqtSignal(int, object, object, bool, object)
+    batch_progress = pyqtSignal(int, int)
+
+    _task_done = pyqtSignal(int, object, object, bool, object)
+
+    def __init__(self, max_parallel=DEFAULT_MAX_PARALLEL_CONNECTS, parent=None, registry=None):
+        super().__init__(parent)
+        self.registry = registry if registry is not None else get_connection_registry()
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(max(1, int(max_parallel)))
+        self._pending = set()
+        self._batch_total = 0
+        self._batch_done = 0
+        self._task_done.connect(self._on_task_done)
+
+    @property
+    def max_parallel(self):
+        return self._thread_pool.maxThreadCount()
+
+    def set_max_parallel(self, max_parallel):
+        self._thread_pool.setMaxThreadCount(max(1, int(max_parallel)))
+
+    def is_pending(self, index):
+        return index in self._pending
+
+    def connect_server(self, index, server_info):
+        """서버 하나를 백그라운드에서 연결. 이미 진행 중이면 False"""
+        if index in self._pending:
+            return False
+
+        self._pending.add(index)
+        if self._batch_done >= self._batch_total:
+            self._batch_total = 0
+            self._batch_done = 0
+        self._batch_total += 1
+
+        self.connect_started.emit(index)
+        self._thread_pool.start(_ConnectTask(self, index, server_info))
+        return True
+
+    def connect_many(self, servers):
+        """
+        servers: (index, server_info) 목록. 최대 max_parallel개씩 동시에 연결한다.
+        실제로 연결을 시작한 서버 수를 반환한다.
+        """
+        started = 0
+        for index, server_info in servers:
+            if self.connect_server(index, server_info):
+                started += 1
+        return started
+
+    def wait_for_done(self, msecs=-1):
+        return self._thread_pool.waitForDone(msecs)
+
+    def _on_task_done(self, index, server_info, ssh_manager, success, profile):
+        self._pending.discard(index)
+        self._batch_done += 1
+        self.connect_finished.emit(index, server_info, ssh_manager, success, profile)
+        self.batch_progress.emit(self._batch_done, self._batch_total)
@@ -0,0 +1,65 @@
+# gui/connection_state.py
+"""
+서버 id별 연결 상태를 들고, 바뀔 때마다 (server_id, old_state, new_state)를 알리는 모델
+"""
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from core.ssh_manager import STATE_CONNECTED, STATE_DISCONNECTED, STATE_RECONNECTING
+
+# SSHManager를 들고 있는(세션이 살아 있거나 되살리는 중인) 상태
+ACTIVE_STATES = (STATE_CONNECTED, STATE_RECONNECTING)
+
+
+class ConnectionStateModel(QObject):
+    """
+    서버 목록 인덱스가 아닌 저장소 id로 상태를 기억하므로 서버를 지우거나 추가해도
+    다른 서버의 상태가 밀리지 않는다.
+
+    state_changed(server_id, old_state, new_state): 상태가 실제로 바뀐 경우에만 보낸다.
+    목록은 이 시그널로 해당 카드 한 장만 다시 그린다.
+
+    상태: disconnected → connecting → connected ⇄ reconnecting, 실패하면 failed
+    """
+
+    state_changed = pyqtSignal(object, str, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # disconnected가 아닌 서버만 보관
+        self._states = {}
+
+    def __len__(self):
+        return len(self._states)
+
+    def state(self, server_id):
+        return self._states.get(server_id, STATE_DISCONNECTED)
+
+    def is_active(self, server_id):
+        return self.state(server_id) in ACTIVE_STATES
+
+    def ids(self, *states):
+        """주어진 상태(없으면 disconnected가 아닌 모든 상태)의 서버 id 목록"""
+        if not states:
+            return list(self._states)
+        return [server_id for server_id, state in self._states.items() if state in states]
+
+    def count(self, *states):
+        return len(self.ids(*states))
+
+    def set_state(self, server_id, state):
+        """상태를 바꾸고 바뀌었으면 True"""
+        old_state = self.state(server_id)
+        if old_state == state:
+            return False
+        if state == STATE_DISCONNECTED:
+            self._states.pop(server_id, None)
+        else:
+            self._states[server_id] = state
+        self.state_changed.emit(server_id, old_state, state)
+        return True
+
+    def forget(self, server_id):
+        """삭제된 서버의 상태를 지운다"""
+        return self.set_state(server_id, STATE_DISCONNECTED)
+
@@ -0,0 +1,151 @@
+# gui/health_monitor.py
+"""
+연결 상태(liveness)를 GUI 스레드 밖에서 주기적으로 확인하는 헬스 모니터
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+# 정상 연결 확인 주기: 처음엔 짧게, 안정적이면 점점 늘린다
+MIN_PROBE_INTERVAL = 5.0
+MAX_PROBE_INTERVAL = 60.0
+PROBE_BACKOFF_FACTOR = 1.5
+
+# 확인 실패 시 재확인 주기와, 끊김으로 판정하기까지의 연속 실패 횟수
+FAILURE_PROBE_INTERVAL = 1.0
+FAILURE_THRESHOLD = 2
+
+# 한 번에 동시에 확인할 최대 연결 수
+PROBE_WORKERS = 8
+
+
+class _ProbeTarget:
+    def __init__(self, key, ssh_manager, now):
+        self.key = key
+        self.ssh_manager = ssh_manager
+        self.alive = True
+        self.interval = MIN_PROBE_INTERVAL
+        self.failures = 0
+        self.next_probe = now + self.interval
+
+
+class HealthMonitor(QObject):
+    """
+    등록된 SSHManager들의 is_connected()를 백그라운드 스레드에서 일괄 확인한다.
+
+    - 확인 시점이 된 연결들을 모아 워커 풀에서 동시에 확인 (배치)
+    - 안정적인 연결은 확인 주기를 MAX_PROBE_INTERVAL까지 늘리고,
+      실패하면 FAILURE_PROBE_INTERVAL로 줄여 빠르게 재확인
+    - 상태가 바뀐 경우에만 state_changed(key, ssh_manager, alive)를 보낸다
+    """
+    state_changed = pyqtSignal(object, object, bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._targets = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running = False
+        self._thread = None
+        self._executor = None
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._executor = ThreadPoolExecutor(max_workers=PROBE_WORKERS,
+                                            thread_name_prefix="health-probe")
+        self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def watch(self, key, ssh_manager):
+        """연결 상태 감시 시작 (같은 key가 있으면 교체)"""
+        with self._lock:
+            self._targets[key] = _ProbeTarget(key, ssh_manager, time.monotonic())
+        self._wakeup.set()
+
+    def unwatch(self, key):
+        with self._lock:
+            self._targets.pop(key, None)
+
+    def probe_now(self, key=None):
+        """다음 주기를 기다리지 않고 바로 확인 (key가 없으면 전체)"""
+        now = time.monotonic()
+        with self._lock:
+            for target in self._targets.values():
+                if key is None or target.key == key:
+                    target.next_probe = now
+        self._wakeup.set()
+
+    def _run(self):
+        while self._running:
+            self._wakeup.clear()
+            now = time.monotonic()
+            with self._lock:
+                due = [t for t in self._targets.values() if t.next_probe <= now]
+                upcoming = [t.next_probe for t in self._targets.values() if t.next_probe > now]
+
+            if due:
+                self._probe_batch(due)
+                continue
+
+            timeout = (min(upcoming) - now) if upcoming else MAX_PROBE_INTERVAL
+            self._wakeup.wait(timeout=max(0.05, timeout))
+
+    def _probe_batch(self, targets):
+        executor = self._executor
+        if executor is None:
+            return
+        try:
+            futures = [(t, executor.submit(t.ssh_manager.is_connected)) for t in targets]
+        except RuntimeError:
+            # 종료 중
+            return
+
+        for target, future in futures:
+            try:
+                ok = bool(future.result())
+            except Exception:
+                ok = False
+            self._apply_result(target, ok)
+
+    def _apply_result(self, target, ok):
+        now = time.monotonic()
+        with self._lock:
+            # 확인 중에 감시가 해제되었거나 교체되었으면 무시
+            if self._targets.get(target.key) is not target:
+                return
+
+            changed = False
+            if ok:
+                target.failures = 0
+                if not target.alive:
+                    target.alive = True
+                    target.interval = MIN_PROBE_INTERVAL
+                    changed = True
+                else:
+                    target.interval = min(target.interval * PROBE_BACKOFF_FACTOR,
+                                          MAX_PROBE_INTERVAL)
+            else:
+                target.failures += 1
+                target.interval = FAILURE_PROBE_INTERVAL
+                if target.alive and target.failures >= FAILURE_THRESHOLD:
+                    target.alive = False
+                    changed = True
+            target.next_probe = now + target.interval
+
+        if changed:
+            self.state_changed.emit(target.key, target.ssh_manager, target.alive)
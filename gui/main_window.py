@@ -2,34 +2,52 @@
 
 from PyQt5.QtWidgets import (
     QDialog, QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton,
-    QListWidget, QHBoxLayout, QMessageBox, QTextEdit, QTabWidget, QScrollArea,
+    QListWidget, QHBoxLayout, QMessageBox, QTextEdit, QTabWidget,
     QFrame
 )
 from PyQt5.QtGui import QIcon
-from PyQt5.QtCore import QFile, QIODevice, QTimer, Qt
-from core.tunnel_config import load_server_list, save_server_list
-from core.ssh_manager import SSHManager
+from PyQt5.QtCore import QFile, QIODevice, Qt, pyqtSignal
+from core.ssh_manager import (
+    STATE_CONNECTED, STATE_CONNECTING, STATE_DISCONNECTED, STATE_FAILED, STATE_RECONNECTING,
+)
+from core.server_inventory import ServerInventory
+from gui.connection_pool import ConnectionPool
+from gui.connection_state import ConnectionStateModel
+from gui.health_monitor import HealthMonitor
 from gui.add_server_dialog import AddServerDialog
 from gui.ssh_terminal_dialog import SSHTerminalDialog
 from gui.icon_data import get_icon
 from gui.ssh_terminal_widget import SSHTerminalWidget
 from gui.theme import Theme
-from gui.components import HeaderBar, ServerCard, ServerFormCard
+from gui.components import HeaderBar, ServerFormCard, ServerListModel, ServerListView
 from gui.components.bottom_panel import ConnectionStatus
 from gui.styled_message_box import StyledMessageBox
 
 
 class MainWindow(QMainWindow):
+    # SSHManager 상태 변화 (재연결 스레드에서 GUI 스레드로 전달)
+    manager_state_changed = pyqtSignal(object, str, str)
+
     def __init__(self):
         super().__init__()
 
         self.setWindowIcon(get_icon())
 
-        self.ssh_managers = {}  # 서버별 SSH 매니저 저장 {index: SSHManager}
-        self.connected_indices = set()  # 연결된 서버 인덱스 집합
-        self.server_cards = []  # 서버 카드 위젯 리스트
+        # 목록 인덱스는 삭제하면 밀리므로 연결은 저장소 id로 기억한다
+        self.ssh_managers = {}  # 서버별 SSH 매니저 저장 {server_id: SSHManager}
         self.server_form_card = None  # 서버 추가/수정 폼 카드
-        self.editing_server_index = None  # 수정 중인 서버 인덱스
+        self.editing_server_id = None  # 수정 중인 서버 id
+
+        # 서버별 연결 상태 (바뀐 서버의 카드만 다시 그린다)
+        self.connection_states = ConnectionStateModel(self)
+        self.connection_states.state_changed.connect(self.on_connection_state_changed)
+
+        # 백그라운드 병렬 연결 풀
+        self.connection_pool = ConnectionPool(parent=self)
+        self.connection_pool.connect_started.connect(self.on_connect_started)
+        self.connection_pool.connect_finished.connect(self.on_connect_finished)
+        self.connection_pool.batch_progress.connect(self.on_connect_progress)
+        self.manager_state_changed.connect(self.on_manager_state_changed)
 
         self.setWindowTitle("Hshell")
         self.setGeometry(100, 100, 1200, 800)
@@ -214,40 +232,40 @@ class MainWindow(QMainWindow):
             }}
         """)
         self.add_button.clicked.connect(self.add_server)
-        server_header.addWidget(self.add_button)
 
-        server_panel.addLayout(server_header)
-
-        # 서버 카드 컨테이너
-        self.server_container = QWidget()
-        self.server_container.setObjectName("serverContainer")
-        self.server_container.setStyleSheet(f"""
-            QWidget#serverContainer {{
+        # 전체 연결 버튼
+        self.connect_all_button = QPushButton("▶ 전체 연결")
+        self.connect_all_button.setStyleSheet(f"""
+            QPushButton {{
                 background-color: {Theme.CARD};
+                color: {Theme.FOREGROUND};
+                border: 2px solid {Theme.BORDER_SOLID};
+                border-radius: {Theme.RADIUS_MD};
+                padding: {Theme.SPACING_SM} {Theme.SPACING_LG};
+                font-weight: {Theme.FONT_WEIGHT_MEDIUM};
+                font-size: {Theme.FONT_SIZE_SM};
+                min-height: 40px;
+            }}
+            QPushButton:hover {{
+                background-color: {Theme.ACCENT};
+                border: 2px solid {Theme.PRIMARY};
             }}
         """)
+        self.connect_all_button.clicked.connect(self.connect_all_servers)
+        server_header.addWidget(self.connect_all_button)
+        server_header.addWidget(self.add_button)
+
+        server_panel.addLayout(server_header)
+
+        # 서버 카드 목록 (보이는 카드만 그리는 가상화 뷰, 추가/수정 폼은 그 위에 끼운다)
         self.server_layout = QVBoxLayout()
         self.server_layout.setSpacing(16)
         self.server_layout.setContentsMargins(0, 0, 0, 0)
-        self.server_container.setLayout(self.server_layout)
-        
-        server_panel.addWidget(self.server_container)
-        
-        card_body_layout.addLayout(server_panel)
-        card_body.setLayout(card_body_layout)
-        
-        # 스크롤 영역으로 카드 본문 감싸기
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setFrameShape(QFrame.NoFrame)
-        scroll_area.setStyleSheet(f"""
-            QScrollArea {{
-                background-color: {Theme.CARD};
-                border: none;
-            }}
-            QScrollArea > QWidget {{
-                background-color: {Theme.CARD};
-            }}
+
+        self.server_model = ServerListModel(self.connection_states, self)
+        self.server_list = ServerListView()
+        self.server_list.setModel(self.server_model)
+        self.server_list.setStyleSheet(self.server_list.styleSheet() + f"""
             QScrollBar:vertical {{
                 border: none;
                 background: {Theme.MUTED};
@@ -266,8 +284,19 @@ class MainWindow(QMainWindow):
                 height: 0px;
             }}
         """)
-        scroll_area.setWidget(card_body)
-        main_card_layout.addWidget(scroll_area)
+        self.server_list.edit_clicked.connect(self.edit_server)
+        self.server_list.delete_clicked.connect(self.delete_server)
+        self.server_list.connect_clicked.connect(self.connect_server)
+        self.server_list.disconnect_clicked.connect(self.disconnect_server)
+        self.server_list.ssh_clicked.connect(self.open_ssh_console)
+        self.server_layout.addWidget(self.server_list, stretch=1)
+
+        server_panel.addLayout(self.server_layout, stretch=1)
+        
+        card_body_layout.addLayout(server_panel, stretch=1)
+        card_body.setLayout(card_body_layout)
+        
+        main_card_layout.addWidget(card_body, stretch=1)
         
         main_card.setLayout(main_card_layout)
         content_layout.addWidget(main_card, stretch=1)
@@ -515,13 +544,13 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(content_widget, stretch=1)
 
         # 서버 목록 불러오기
-        self.servers = load_server_list()
+        self.servers = ServerInventory()
         self.refresh_server_list()
 
-        # 연결 상태 확인 타이머 추가
-        self.connection_check_timer = QTimer(self)
-        self.connection_check_timer.timeout.connect(self.check_all_connections)
-        self.connection_check_timer.start(5000)  # 5초마다 확인
+        # 연결 상태 감시 (백그라운드 헬스 모니터)
+        self.health_monitor = HealthMonitor(parent=self)
+        self.health_monitor.state_changed.connect(self.on_connection_health_changed)
+        self.health_monitor.start()
     
     def toggle_script_panel(self):
         """스크립트 패널 토글"""
@@ -554,36 +583,16 @@ class MainWindow(QMainWindow):
             self.script_btn.style().polish(self.script_btn)
 
     def refresh_server_list(self):
-        """서버 목록을 카드 형태로 갱신"""
-        # 기존 카드 제거
-        for card in self.server_cards:
-            card.deleteLater()
-        self.server_cards.clear()
+        """서버 목록 자체(추가·수정·삭제)가 바뀌었을 때 모델을 다시 채운다"""
+        self.server_model.set_servers(self.servers)
+        self.update_connection_summary()
 
-        # 폼 카드가 있으면 먼저 추가
-        if self.server_form_card:
-            self.server_layout.addWidget(self.server_form_card)
+    def on_connection_state_changed(self, server_id, old_state, new_state):
+        """서버 하나의 연결 상태 변화 (카드는 모델이 그 행만 다시 그린다)"""
+        self.update_connection_summary()
 
-        # 새로운 카드 생성
-        for i, server in enumerate(self.servers):
-            is_connected = i in self.connected_indices
-            card = ServerCard(i, server, is_connected)
-            
-            # 시그널 연결
-            card.edit_clicked.connect(self.edit_server)
-            card.delete_clicked.connect(self.delete_server)
-            card.connect_clicked.connect(self.connect_server)
-            card.disconnect_clicked.connect(self.disconnect_server)
-            card.ssh_clicked.connect(self.open_ssh_console)
-            
-            self.server_layout.addWidget(card)
-            self.server_cards.append(card)
-
-        # 스페이서 추가 (아래쪽 여백)
-        self.server_layout.addStretch()
-        
-        # 연결 상태 업데이트
-        self.connection_status.update_status(len(self.connected_indices))
+    def update_connection_summary(self):
+        self.connection_status.update_status(len(self.ssh_managers))
         self.update_dashboard_header()
 
     def add_server(self):
@@ -593,98 +602,134 @@ class MainWindow(QMainWindow):
             self.close_server_form()
             return
         
-        self.editing_server_index = None
+        self.editing_server_id = None
         self.server_form_card = ServerFormCard()
         self.server_form_card.save_clicked.connect(self.on_server_form_save)
         self.server_form_card.cancel_clicked.connect(self.close_server_form)
         
-        # 기존 카드들을 모두 제거하고 폼을 맨 위에 추가
-        for card in self.server_cards:
-            self.server_layout.removeWidget(card)
-        
+        # 카드 목록 위에 폼 추가
         self.server_layout.insertWidget(0, self.server_form_card)
-        
-        # 카드들을 다시 추가
-        for card in self.server_cards:
-            self.server_layout.addWidget(card)
 
-    def connect_server(self, index):
-        if index < 0 or index >= len(self.servers):
-            self.terminal_output.append("\n[오류] 잘못된 서버 인덱스입니다.")
+    def _server_name(self, server_id):
+        server = self.servers.summary_for(server_id)
+        return server.name if server is not None else str(server_id)
+
+    def connect_server(self, server_id):
+        server_info = self.servers.record_for(server_id)
+        if server_info is None:
+            self.terminal_output.append("\n[오류] 알 수 없는 서버입니다.")
             return
 
-        if index in self.connected_indices:
-            self.terminal_output.append(f"\n[경고] {self.servers[index]['name']} 서버는 이미 연결되어 있습니다.")
+        if server_id in self.ssh_managers:
+            self.terminal_output.append(f"\n[경고] {server_info['name']} 서버는 이미 연결되어 있습니다.")
             return
 
-        server_info = self.servers[index]
-        ssh_manager = SSHManager(server_info)
+        if self.connection_pool.is_pending(server_id):
+            self.terminal_output.append(f"\n[경고] {server_info['name']} 서버는 연결 시도 중입니다.")
+            return
 
         self.terminal_output.append(f"\n[연결 시도] {server_info['name']} 서버 연결 시도 중...")
-        success = ssh_manager.connect()
-        
+        self.connection_pool.connect_server(server_id, server_info)
+
+    def connect_all_servers(self):
+        """연결되지 않은 모든 서버를 병렬로 연결"""
+        targets = [
+            (server['id'], server) for server in self.servers
+            if server['id'] not in self.ssh_managers and not self.connection_pool.is_pending(server['id'])
+        ]
+        if not targets:
+            self.terminal_output.append("\n[정보] 연결할 서버가 없습니다.")
+            return
+
+        self.terminal_output.append(
+            f"\n[전체 연결] {len(targets)}개 서버 연결 시작 "
+            f"(동시 {self.connection_pool.max_parallel}개)"
+        )
+        self.connection_pool.connect_many(targets)
+
+    def on_connect_started(self, server_id):
+        self.connection_states.set_state(server_id, STATE_CONNECTING)
+
+    def on_connect_finished(self, server_id, server_info, ssh_manager, success, profile):
+        """백그라운드 연결 결과 반영"""
+        # 연결 중에 서버가 삭제/수정되었으면 결과를 버린다
+        if self.servers.record_for(server_id) is not server_info:
+            if success:
+                self.connection_pool.registry.release(ssh_manager, owner=server_id, close=True)
+            self.connection_states.set_state(server_id, STATE_DISCONNECTED)
+            return
+
         if success:
-            self.ssh_managers[index] = ssh_manager
-            self.connected_indices.add(index)
-            self.refresh_server_list()
+            self.ssh_managers[server_id] = ssh_manager
+            self.health_monitor.watch(server_id, ssh_manager)
+            ssh_manager.add_state_listener(self._emit_manager_state)
+            # 재연결 중인 공유 연결에 합류했으면 재연결이 끝날 때 상태 알림으로 갱신된다
+            if ssh_manager.state == STATE_RECONNECTING:
+                self.connection_states.set_state(server_id, STATE_RECONNECTING)
+            else:
+                self.connection_states.set_state(server_id, STATE_CONNECTED)
             self.terminal_output.append(f"\n[연결 성공] {server_info['name']} 서버에 연결되었습니다.")
         else:
+            self.connection_states.set_state(server_id, STATE_FAILED)
             self.terminal_output.append(f"\n[연결 실패] {server_info['name']} 서버 연결에 실패했습니다.")
 
-    def disconnect_server(self, index):
-        if index < 0 or index >= len(self.servers):
-            self.terminal_output.append("\n[오류] 잘못된 서버 인덱스입니다.")
+    def on_connect_progress(self, done, total):
+        if total > 1:
+            self.terminal_output.append(f"[전체 연결] {done}/{total} 완료")
+
+    def disconnect_server(self, server_id):
+        if self.servers.summary_for(server_id) is None:
+            self.terminal_output.append("\n[오류] 알 수 없는 서버입니다.")
             return
 
-        if index not in self.connected_indices:
-            self.terminal_output.append(f"\n[경고] {self.servers[index]['name']} 서버는 연결되어 있지 않습니다.")
+        if server_id not in self.ssh_managers:
+            self.terminal_output.append(f"\n[경고] {self._server_name(server_id)} 서버는 연결되어 있지 않습니다.")
             return
 
-        if index in self.ssh_managers:
-            self.ssh_managers[index].disconnect()
-            del self.ssh_managers[index]
-            self.connected_indices.remove(index)
-            self.refresh_server_list()
-            self.terminal_output.append(f"\n[연결 종료] {self.servers[index]['name']} 서버 연결이 종료되었습니다.")
+        self._release_manager(server_id, close=True)
+        self.connection_states.set_state(server_id, STATE_DISCONNECTED)
+        self.terminal_output.append(f"\n[연결 종료] {self._server_name(server_id)} 서버 연결이 종료되었습니다.")
 
-    def edit_server(self, index):
+    def edit_server(self, server_id):
         """서버 수정 폼 표시"""
-        if index < 0 or index >= len(self.servers):
-            self.terminal_output.append("\n[오류] 잘못된 서버 인덱스입니다.")
+        current_data = self.servers.record_for(server_id)
+        if current_data is None:
+            self.terminal_output.append("\n[오류] 알 수 없는 서버입니다.")
             return
         
         if self.server_form_card:
             # 이미 폼이 열려있으면 닫기
             self.close_server_form()
         
-        current_data = self.servers[index]
-        self.editing_server_index = index
+        self.editing_server_id = server_id
         self.server_form_card = ServerFormCard(server_data=current_data)
         self.server_form_card.save_clicked.connect(self.on_server_form_save)
         self.server_form_card.cancel_clicked.connect(self.close_server_form)
         
-        # 기존 카드들을 모두 제거하고 폼을 맨 위에 추가
-        for card in self.server_cards:
-            self.server_layout.removeWidget(card)
-        
+        # 카드 목록 위에 폼 추가
         self.server_layout.insertWidget(0, self.server_form_card)
-        
-        # 카드들을 다시 추가
-        for card in self.server_cards:
-            self.server_layout.addWidget(card)
     
     def on_server_form_save(self, server_data):
         """서버 폼 저장"""
-        if self.editing_server_index is not None:
+        index = None
+        if self.editing_server_id is not None:
+            server_id = self.editing_server_id
+            # 바뀐 접속 정보로 다시 연결하도록 기존 연결을 끊는다
+            if server_id in self.ssh_managers:
+                self.disconnect_server(server_id)
+            index = self.servers.index_of(server_id)
+
+        if index is not None:
             # 수정
-            self.servers[self.editing_server_index] = server_data
+            # 공유 연결이 옛 정보로 재사용되지 않도록 떼어 낸 뒤 저장소의 같은 행(id)을 덮어쓴다
+            self.connection_pool.registry.invalidate(self.servers[index])
+            self.servers.replace(index, server_data)
             self.terminal_output.append(f"\n[성공] {server_data['name']} 서버 정보가 수정되었습니다.")
         else:
-            # 추가
-            self.servers.append(server_data)
+            # 추가 (수정 중에 삭제된 서버도 새로 추가)
+            self.servers.add(server_data)
             self.terminal_output.append(f"\n[성공] {server_data['name']} 서버가 추가되었습니다.")
         
-        save_server_list(self.servers)
         self.close_server_form()
         self.refresh_server_list()
     
@@ -694,71 +739,100 @@ class MainWindow(QMainWindow):
             self.server_layout.removeWidget(self.server_form_card)
             self.server_form_card.deleteLater()
             self.server_form_card = None
-            self.editing_server_index = None
+            self.editing_server_id = None
 
-    def delete_server(self, index):
-        if index < 0 or index >= len(self.servers):
-            self.terminal_output.append("\n[오류] 잘못된 서버 인덱스입니다.")
+    def delete_server(self, server_id):
+        index = self.servers.index_of(server_id)
+        if index is None:
+            self.terminal_output.append("\n[오류] 알 수 없는 서버입니다.")
             return
 
-        name = self.servers[index]['name']
+        name = self.servers.summary(index).name
         confirm = StyledMessageBox.question(self, "삭제 확인", f"{name} 서버를 삭제할까요?",
                                     QMessageBox.Yes | QMessageBox.No)
         if confirm == QMessageBox.Yes:
             # 연결된 상태라면 먼저 연결 해제
-            if index in self.connected_indices:
-                self.ssh_managers[index].disconnect()
-                del self.ssh_managers[index]
-                self.connected_indices.remove(index)
+            if server_id in self.ssh_managers:
+                self._release_manager(server_id, close=True)
             
-            del self.servers[index]
-            save_server_list(self.servers)
+            # 다른 서버의 연결은 id로 기억하므로 인덱스가 밀려도 그대로다
+            self.connection_states.forget(server_id)
+            self.servers.remove(self.servers.index_of(server_id))
             self.refresh_server_list()
             self.terminal_output.append(f"\n[삭제] {name} 서버가 삭제되었습니다.")
 
-    def open_ssh_console(self, index):
+    def open_ssh_console(self, server_id):
         """SSH 콘솔을 터미널 패널에서 엽니다"""
-        if index < 0 or index >= len(self.servers):
-            self.terminal_output.append("\n[오류] 잘못된 서버 인덱스입니다.")
+        if self.servers.summary_for(server_id) is None:
+            self.terminal_output.append("\n[오류] 알 수 없는 서버입니다.")
             return
 
-        if index not in self.connected_indices or index not in self.ssh_managers:
+        if server_id not in self.ssh_managers:
             self.terminal_output.append("\n[경고] 먼저 서버에 연결하세요.")
             return
 
-        server_name = self.servers[index]['name']
+        server_name = self._server_name(server_id)
         self.terminal_output.append(f"\n[SSH] {server_name} 서버 SSH 콘솔 시작...")
         
         # 터미널 패널 열기
         if not self.terminal_panel.isVisible():
             self.toggle_terminal_panel()
 
-    def check_all_connections(self):
+    def on_connection_health_changed(self, server_id, ssh_manager, alive):
         """
-        모든 연결의 상태를 주기적으로 확인하고 업데이트
+        헬스 모니터가 감지한 연결 상태 변화를 반영 (변화가 있을 때만 호출됨)
         """
-        disconnected_indices = set()
-        
-        # 각 연결의 상태 확인
-        for index in list(self.connected_indices):
-            if index in self.ssh_managers:
-                ssh_manager = self.ssh_managers[index]
-                if not ssh_manager.is_connected():
-                    disconnected_indices.add(index)
-                    self.terminal_output.append(f"\n[경고] {self.servers[index]['name']} 서버 연결이 끊어졌습니다.")
-        
-        # 끊어진 연결 정리
-        for index in disconnected_indices:
-            if index in self.ssh_managers:
-                self.ssh_managers[index].disconnect()
-                del self.ssh_managers[index]
-            if index in self.connected_indices:
-                self.connected_indices.remove(index)
-        
-        # UI 업데이트
-        if disconnected_indices:
-            self.refresh_server_list()
-    
+        if alive or self.ssh_managers.get(server_id) is not ssh_manager:
+            return
+
+        self.terminal_output.append(f"\n[경고] {self._server_name(server_id)} 서버 연결이 끊어졌습니다.")
+        # 재연결은 SSHManager가 백오프로 처리하고, 불가능한 경우에만 정리한다
+        if not ssh_manager.start_reconnect():
+            self._drop_connection(server_id, STATE_FAILED)
+
+    def on_manager_state_changed(self, ssh_manager, old_state, new_state):
+        """SSHManager 재연결 상태 변화 반영"""
+        # 같은 연결을 공유하는 서버 항목 모두에 반영
+        server_ids = [i for i, m in self.ssh_managers.items() if m is ssh_manager]
+        for server_id in server_ids:
+            name = self._server_name(server_id)
+            if new_state == STATE_RECONNECTING:
+                self.connection_states.set_state(server_id, STATE_RECONNECTING)
+                self.terminal_output.append(f"\n[재연결] {name} 서버 재연결 중...")
+            elif new_state == STATE_CONNECTED and old_state == STATE_RECONNECTING:
+                self.connection_states.set_state(server_id, STATE_CONNECTED)
+                self.terminal_output.append(f"\n[재연결 성공] {name} 서버에 다시 연결되었습니다.")
+            elif new_state == STATE_FAILED:
+                self.terminal_output.append(f"\n[재연결 실패] {name} 서버 연결을 종료합니다.")
+                self._drop_connection(server_id, STATE_FAILED)
+
+    def _emit_manager_state(self, ssh_manager, old_state, new_state):
+        """SSHManager 상태 리스너 (임의 스레드) → GUI 스레드 시그널"""
+        self.manager_state_changed.emit(ssh_manager, old_state, new_state)
+
+    def _drop_connection(self, server_id, state=STATE_DISCONNECTED):
+        """끊어진 연결을 정리 (카드는 상태 변화로 다시 그려진다)"""
+        self._release_manager(server_id)
+        self.connection_states.set_state(server_id, state)
+
+    def _release_manager(self, server_id, close=False):
+        """
+        서버 항목의 공유 연결 참조와 그 항목이 연 터널을 반납
+        (같은 연결을 쓰는 다른 항목이 없으면 알림도 해제).
+        close=True면 사용자가 직접 끊은 것이므로 다른 참조가 없을 때 유예 없이 닫는다.
+        """
+        ssh_manager = self.ssh_managers.pop(server_id, None)
+        self.health_monitor.unwatch(server_id)
+        if ssh_manager is None:
+            return
+        if not any(m is ssh_manager for m in self.ssh_managers.values()):
+            ssh_manager.remove_state_listener(self._emit_manager_state)
+        self.connection_pool.registry.release(ssh_manager, owner=server_id, close=close)
+
+    def closeEvent(self, event):
+        self.health_monitor.stop()
+        super().closeEvent(event)
+
     def show_settings(self):
         """설정 다이얼로그 표시 (추후 구현)"""
         self.terminal_output.append("\n[정보] 설정 기능은 추후 구현 예정입니다.")
@@ -766,7 +840,7 @@ class MainWindow(QMainWindow):
     def update_dashboard_header(self):
         """상단 카드 헤더의 통계 텍스트를 갱신"""
         total_servers = len(self.servers)
-        connected_servers = len(self.connected_indices)
+        connected_servers = len(self.ssh_managers)
         self.dashboard_stats.setText(
             f"연결 {connected_servers} / 총 {total_servers} 서버"
         )
@@ -6,33 +6,86 @@
 
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QFrame, QScrollArea, QTextEdit, QLineEdit, QGridLayout, QSpacerItem, QSizePolicy,
-    QDialog, QMessageBox
+    QFrame, QTextEdit, QLineEdit, QGridLayout, QSpacerItem, QSizePolicy,
+    QDialog, QMessageBox, QPlainTextEdit, QListWidget, QListWidgetItem, QCheckBox
 )
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QPalette, QColor
 
-from core.tunnel_config import load_server_list, save_server_list
-from core.ssh_manager import SSHManager
+from core.connect_profiler import PHASE_LABELS
+from core.output_aggregator import OutputAggregator
+from core.tunnel_metrics import ThroughputMeter, format_bytes
+from core.remote_exec import STDERR, STDOUT
+from core.ssh_manager import (
+    STATE_CONNECTED, STATE_CONNECTING, STATE_DISCONNECTED, STATE_FAILED, STATE_RECONNECTING,
+)
+from core.server_inventory import ServerInventory
+from gui.connect_profile_dialog import ConnectProfileDialog
+from gui.connection_state import ConnectionStateModel
+from gui.connection_pool import ConnectionPool
+from gui.health_monitor import HealthMonitor
+from gui.script_runner import ScriptRunner
 from gui.icon_data import get_icon
 from gui.theme import Theme
 from gui.styled_message_box import StyledMessageBox
 from gui.components.server_form_inline import ServerFormInline
+from gui.components.server_list_view import ServerListModel, ServerListView
+
+
+# 스크립트 실행 결과 창에 보관하는 최대 줄 수
+SCRIPT_OUTPUT_MAX_LINES = 5000
+
+# 터널 트래픽 표시 갱신 주기 (ms)
+TUNNEL_METRICS_INTERVAL_MS = 1000
+
+# 서버 검색창 입력이 멈춘 뒤 목록을 거르기까지 기다리는 시간 (ms)
+SERVER_SEARCH_DELAY_MS = 150
 
 
 class MainWindow(QMainWindow):
     """피그마 App.tsx를 그대로 복제한 메인 윈도우"""
     
+    # SSHManager 상태 변화 (재연결 스레드에서 GUI 스레드로 전달)
+    manager_state_changed = pyqtSignal(object, str, str)
+    
     def __init__(self):
         super().__init__()
         
-        # 기능 관련 상태 변수
+        # 기능 관련 상태 변수 (연결은 목록 인덱스가 아닌 저장소 id로 기억)
         self.ssh_managers = {}
-        self.connected_indices = set()
         self.servers = []
-        self.editing_server_index = None
+        self.editing_server_id = None
         self.server_form = None  # 인라인 서버 폼
         
+        # 서버별 연결 상태 (바뀐 서버의 카드만 다시 그린다)
+        self.connection_states = ConnectionStateModel(self)
+        self.connection_states.state_changed.connect(self.on_connection_state_changed)
+        # 상태 변화가 몰려도 하단 상태·스크립트 대상은 이벤트 루프 한 바퀴에 한 번만 갱신
+        self.status_update_timer = QTimer(self)
+        self.status_update_timer.setSingleShot(True)
+        self.status_update_timer.setInterval(0)
+        self.status_update_timer.timeout.connect(self.update_connection_status)
+        
+        # 백그라운드 병렬 연결 풀
+        self.connection_pool = ConnectionPool(parent=self)
+        self.connection_pool.connect_started.connect(self.on_connect_started)
+        self.connection_pool.connect_finished.connect(self.on_connect_finished)
+        self.connection_pool.batch_progress.connect(self.on_connect_progress)
+        self.manager_state_changed.connect(self.on_manager_state_changed)
+        
+        # 여러 서버 동시 명령 실행기
+        self.script_runner = ScriptRunner(parent=self)
+        self.script_runner.host_output.connect(self.on_script_host_output)
+        self.script_runner.host_finished.connect(self.on_script_host_finished)
+        self.script_runner.run_finished.connect(self.on_script_run_finished)
+        self.script_run_id = None
+        # (run_id, server_id, stream) -> 아직 줄바꿈이 오지 않은 출력
+        self.script_partial_lines = {}
+        # 같은 출력을 낸 서버끼리 묶는 집계기 (실행마다 초기화)
+        self.script_aggregator = OutputAggregator()
+        self.script_target_count = 0
+        self.script_grouped = True
+        
         # 윈도우 기본 설정
         self.setWindowTitle("Hshell")
         self.setWindowIcon(get_icon())
@@ -42,13 +95,21 @@ class MainWindow(QMainWindow):
         self.init_ui()
         
         # 데이터 로드
-        self.servers = load_server_list()
+        # 목록은 요약만 필요한 만큼 읽고, 전체 레코드는 연결·수정할 때 한 대씩 읽는다
+        self.servers = ServerInventory()
         self.refresh_server_list()
         
-        # 연결 상태 확인 타이머
-        self.connection_check_timer = QTimer(self)
-        self.connection_check_timer.timeout.connect(self.check_all_connections)
-        self.connection_check_timer.start(5000)
+        # 연결 상태 감시 (백그라운드 헬스 모니터)
+        self.health_monitor = HealthMonitor(parent=self)
+        self.health_monitor.state_changed.connect(self.on_connection_health_changed)
+        self.health_monitor.start()
+        
+        # 터널 트래픽 (연결된 서버가 있을 때만 주기적으로 갱신)
+        self.traffic_meters = {}
+        self.traffic_summary = ""
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.setInterval(TUNNEL_METRICS_INTERVAL_MS)
+        self.metrics_timer.timeout.connect(self.update_tunnel_metrics)
     
     def init_ui(self):
         """피그마 디자인 기반 UI 구조 생성"""
@@ -163,28 +224,52 @@ class MainWindow(QMainWindow):
         body_layout.setContentsMargins(24, 16, 24, 24)
         body_layout.setSpacing(12)
         
-        # 서버 추가 버튼
+        # 서버 추가 / 전체 연결 버튼
+        action_layout = QHBoxLayout()
+        action_layout.setSpacing(12)
+        
         add_btn = QPushButton("+ 새 서버 추가")
         add_btn.setObjectName("addServerBtn")
         add_btn.setCursor(Qt.PointingHandCursor)
         add_btn.clicked.connect(self.show_add_form)
-        body_layout.addWidget(add_btn)
-        
-        # 서버 리스트 컨테이너 (스크롤 영역)
-        scroll = QScrollArea()
-        scroll.setObjectName("serverScrollArea")
-        scroll.setWidgetResizable(True)
-        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        
-        self.server_container = QWidget()
-        self.server_container.setObjectName("serverContainer")
-        self.server_layout = QVBoxLayout(self.server_container)
+        action_layout.addWidget(add_btn, stretch=1)
+        
+        connect_all_btn = QPushButton("▶ 전체 연결")
+        connect_all_btn.setObjectName("connectAllBtn")
+        connect_all_btn.setCursor(Qt.PointingHandCursor)
+        connect_all_btn.clicked.connect(self.connect_all_servers)
+        action_layout.addWidget(connect_all_btn)
+        
+        body_layout.addLayout(action_layout)
+        
+        # 서버 검색 (입력이 멈추면 색인으로 걸러 목록을 다시 그린다)
+        self.server_search = QLineEdit()
+        self.server_search.setObjectName("serverSearch")
+        self.server_search.setPlaceholderText("서버 검색 (이름, 호스트, 사용자, tag:태그, port:포트)")
+        self.server_search.setClearButtonEnabled(True)
+        self.server_search_timer = QTimer(self)
+        self.server_search_timer.setSingleShot(True)
+        self.server_search_timer.setInterval(SERVER_SEARCH_DELAY_MS)
+        self.server_search_timer.timeout.connect(self.refresh_server_list)
+        self.server_search.textChanged.connect(self.server_search_timer.start)
+        body_layout.addWidget(self.server_search)
+        
+        # 서버 리스트 (보이는 카드만 그리는 가상화 뷰, 수정 폼은 그 위에 끼운다)
+        self.server_layout = QVBoxLayout()
         self.server_layout.setContentsMargins(0, 0, 0, 0)
         self.server_layout.setSpacing(12)
-        self.server_layout.addStretch()
         
-        scroll.setWidget(self.server_container)
-        body_layout.addWidget(scroll, stretch=1)
+        self.server_model = ServerListModel(self.connection_states, self)
+        self.server_list = ServerListView()
+        self.server_list.setModel(self.server_model)
+        self.server_list.connect_clicked.connect(self.connect_server)
+        self.server_list.disconnect_clicked.connect(self.disconnect_server)
+        self.server_list.ssh_clicked.connect(self.open_ssh_console)
+        self.server_list.edit_clicked.connect(self.edit_server)
+        self.server_list.delete_clicked.connect(self.delete_server)
+        self.server_layout.addWidget(self.server_list, stretch=1)
+        
+        body_layout.addLayout(self.server_layout, stretch=1)
         
         card_layout.addWidget(body, stretch=1)
         layout.addWidget(card, stretch=1)
@@ -217,6 +302,13 @@ class MainWindow(QMainWindow):
         self.terminal_btn.clicked.connect(self.toggle_terminal_panel)
         controls_layout.addWidget(self.terminal_btn)
         
+        # 연결 단계별 소요 시간 보기
+        self.profile_btn = QPushButton("⏱ 연결 분석")
+        self.profile_btn.setObjectName("profileBtn")
+        self.profile_btn.setCursor(Qt.PointingHandCursor)
+        self.profile_btn.clicked.connect(self.show_connect_profiles)
+        controls_layout.addWidget(self.profile_btn)
+        
         layout.addWidget(controls)
     
     def create_connection_status(self):
@@ -293,18 +385,43 @@ class MainWindow(QMainWindow):
         body_layout.setContentsMargins(16, 16, 16, 16)
         body_layout.setSpacing(12)
         
+        # 실행 대상 서버 (연결된 서버만)
+        target_label = QLabel("실행 대상 서버:")
+        body_layout.addWidget(target_label)
+        
+        self.script_targets = QListWidget()
+        self.script_targets.setMaximumHeight(100)
+        body_layout.addWidget(self.script_targets)
+        
         # 스크립트 입력
         script_label = QLabel("실행할 명령어:")
         body_layout.addWidget(script_label)
         
-        self.script_input = QLineEdit()
+        self.script_input = QPlainTextEdit()
         self.script_input.setPlaceholderText("예: ls -la")
+        self.script_input.setMaximumHeight(80)
         body_layout.addWidget(self.script_input)
         
-        # 실행 버튼
-        run_btn = QPushButton("실행")
-        run_btn.clicked.connect(self.run_script)
-        body_layout.addWidget(run_btn)
+        # 실행 / 취소 버튼
+        button_layout = QHBoxLayout()
+        self.script_run_btn = QPushButton("실행")
+        self.script_run_btn.clicked.connect(self.run_script)
+        button_layout.addWidget(self.script_run_btn)
+        
+        self.script_cancel_btn = QPushButton("취소")
+        self.script_cancel_btn.setEnabled(False)
+        self.script_cancel_btn.clicked.connect(self.cancel_script)
+        button_layout.addWidget(self.script_cancel_btn)
+        
+        # 같은 결과 묶기: 서버별 출력을 흘려보내지 않고 완료 후 결과별로 한 번씩만 표시
+        self.script_group_check = QCheckBox("같은 결과 묶기")
+        self.script_group_check.setChecked(True)
+        button_layout.addWidget(self.script_group_check)
+        button_layout.addStretch()
+        
+        self.script_progress = QLabel("")
+        button_layout.addWidget(self.script_progress)
+        body_layout.addLayout(button_layout)
         
         # 결과 출력
         result_label = QLabel("실행 결과:")
@@ -313,6 +430,8 @@ class MainWindow(QMainWindow):
         self.script_output = QTextEdit()
         self.script_output.setReadOnly(True)
         self.script_output.setMaximumHeight(200)
+        # 서버가 많고 출력이 길어도 메모리가 계속 늘지 않도록 줄 수 제한
+        self.script_output.document().setMaximumBlockCount(SCRIPT_OUTPUT_MAX_LINES)
         body_layout.addWidget(self.script_output, stretch=1)
         
         panel_layout.addWidget(body, stretch=1)
@@ -452,13 +571,20 @@ class MainWindow(QMainWindow):
                 background-color: #1a1a2e;
             }}
             
-            #serverScrollArea {{
-                background: transparent;
-                border: none;
+            #connectAllBtn {{
+                background-color: {Theme.CARD};
+                color: {Theme.FOREGROUND};
+                border: 1px solid {Theme.BORDER_SOLID};
+                border-radius: {Theme.RADIUS_MD};
+                padding: 10px 20px;
+                font-size: {Theme.FONT_SIZE_BASE};
+                font-weight: {Theme.FONT_WEIGHT_MEDIUM};
+                min-height: 40px;
             }}
             
-            #serverContainer {{
-                background: transparent;
+            #connectAllBtn:hover {{
+                background-color: {Theme.ACCENT};
+                border: 1px solid {Theme.PRIMARY};
             }}
             
             /* ========== 하단 제어 패널 ========== */
@@ -491,7 +617,7 @@ class MainWindow(QMainWindow):
                 font-weight: {Theme.FONT_WEIGHT_MEDIUM};
             }}
             
-            #scriptToggleBtn, #terminalToggleBtn {{
+            #scriptToggleBtn, #terminalToggleBtn, #profileBtn {{
                 background-color: {Theme.CARD};
                 color: {Theme.FOREGROUND};
                 border: 1px solid {Theme.BORDER_SOLID};
@@ -502,7 +628,7 @@ class MainWindow(QMainWindow):
                 min-height: 40px;
             }}
             
-            #scriptToggleBtn:hover, #terminalToggleBtn:hover {{
+            #scriptToggleBtn:hover, #terminalToggleBtn:hover, #profileBtn:hover {{
                 background-color: {Theme.ACCENT};
                 border: 1px solid {Theme.PRIMARY};
             }}
@@ -673,195 +799,310 @@ class MainWindow(QMainWindow):
             self.script_btn.style().unpolish(self.script_btn)
             self.script_btn.style().polish(self.script_btn)
     
+    def refresh_script_targets(self):
+        """스크립트 실행 대상 목록을 연결된 서버로 갱신 (기존 체크 상태 유지)"""
+        unchecked = set()
+        for row in range(self.script_targets.count()):
+            item = self.script_targets.item(row)
+            if item.checkState() != Qt.Checked:
+                unchecked.add(item.data(Qt.UserRole))
+        
+        self.script_targets.clear()
+        # 목록 순서대로
+        positions = {server_id: self.servers.index_of(server_id) for server_id in self.ssh_managers}
+        for server_id in sorted(
+            (server_id for server_id, index in positions.items() if index is not None),
+            key=positions.get,
+        ):
+            server = self.servers.summary(positions[server_id])
+            item = QListWidgetItem(f"{server.name} ({server.host})")
+            item.setData(Qt.UserRole, server_id)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Unchecked if server_id in unchecked else Qt.Checked)
+            self.script_targets.addItem(item)
+    
     def run_script(self):
-        """스크립트 실행"""
-        command = self.script_input.text().strip()
+        """선택한 서버들에서 스크립트를 동시에 실행"""
+        command = self.script_input.toPlainText().strip()
         if not command:
             self.script_output.append("[오류] 명령어를 입력하세요.")
             return
+        if self.script_runner.is_running():
+            self.script_output.append("[경고] 이전 실행이 아직 끝나지 않았습니다.")
+            return
+        
+        targets = []
+        for row in range(self.script_targets.count()):
+            item = self.script_targets.item(row)
+            server_id = item.data(Qt.UserRole)
+            if item.checkState() == Qt.Checked and server_id in self.ssh_managers:
+                targets.append((server_id, self.ssh_managers[server_id]))
+        if not targets:
+            self.script_output.append("[오류] 실행할 연결된 서버를 선택하세요.")
+            return
         
         self.script_output.append(f"\n$ {command}")
-        self.script_output.append("[정보] 스크립트 실행 기능 (미구현)")
+        self.script_output.append(f"[정보] {len(targets)}개 서버에서 실행 중...")
+        self.script_aggregator.clear()
+        self.script_target_count = len(targets)
+        self.script_grouped = self.script_group_check.isChecked()
+        self.update_script_progress()
+        self.script_run_id = self.script_runner.run(command, targets)
+        self.script_run_btn.setEnabled(False)
+        self.script_cancel_btn.setEnabled(True)
     
-    def refresh_server_list(self):
-        """서버 리스트 새로고침"""
-        # 기존 서버 카드 제거
-        while self.server_layout.count() > 1:  # stretch 제외
-            item = self.server_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        # 서버 카드 생성
-        for idx, server in enumerate(self.servers):
-            is_connected = idx in self.connected_indices
-            card = self.create_server_card(idx, server, is_connected)
-            self.server_layout.insertWidget(self.server_layout.count() - 1, card)
-        
-        # ConnectionStatus 업데이트
-        self.update_connection_status()
+    def cancel_script(self):
+        """실행 중인 스크립트 취소"""
+        if self.script_run_id is not None:
+            self.script_runner.cancel(self.script_run_id)
     
-    def create_server_card(self, index, server, is_connected):
-        """서버 카드 생성"""
-        card = QFrame()
-        card.setObjectName("serverCard")
-        card.setStyleSheet(f"""
-            QFrame#serverCard {{
-                background-color: {Theme.CARD};
-                border: 1px solid {Theme.BORDER_SOLID};
-                border-radius: {Theme.RADIUS_LG};
-                padding: 20px;
-            }}
-            QFrame#serverCard:hover {{
-                border: 1px solid {Theme.PRIMARY};
-            }}
-        """)
-        
-        layout = QVBoxLayout(card)
-        layout.setSpacing(12)
-        
-        # 헤더: 서버명 + 상태
-        header_layout = QHBoxLayout()
-        
-        name_label = QLabel(server['name'])
-        name_label.setStyleSheet(f"""
-            font-size: {Theme.FONT_SIZE_LG};
-            font-weight: {Theme.FONT_WEIGHT_SEMIBOLD};
-            color: {Theme.FOREGROUND};
-        """)
-        header_layout.addWidget(name_label)
-        
-        status_badge = QLabel("연결됨" if is_connected else "연결 안됨")
-        status_badge.setStyleSheet(f"""
-            background-color: {Theme.STATUS_ACTIVE_BG if is_connected else Theme.STATUS_INACTIVE_BG};
-            color: {Theme.STATUS_ACTIVE_TEXT if is_connected else Theme.STATUS_INACTIVE_TEXT};
-            border: none;
-            border-radius: {Theme.RADIUS_SM};
-            padding: 4px 12px;
-            font-size: {Theme.FONT_SIZE_SM};
-            font-weight: {Theme.FONT_WEIGHT_MEDIUM};
-        """)
-        header_layout.addWidget(status_badge)
-        header_layout.addStretch()
-        
-        layout.addLayout(header_layout)
-        
-        # 서버 정보
-        info_label = QLabel(f"{server['username']}@{server['host']}:{server['port']}")
-        info_label.setStyleSheet(f"""
-            color: {Theme.MUTED_FOREGROUND};
-            font-size: {Theme.FONT_SIZE_SM};
-        """)
-        layout.addWidget(info_label)
-        
-        # 터널 정보
-        if server.get('tunnels'):
-            tunnel_label = QLabel(f"{len(server['tunnels'])}개 터널")
-            tunnel_label.setStyleSheet(f"""
-                background-color: {Theme.SECONDARY};
-                color: {Theme.FOREGROUND};
-                border: 1px solid {Theme.BORDER_SOLID};
-                border-radius: {Theme.RADIUS_SM};
-                padding: 2px 8px;
-                font-size: {Theme.FONT_SIZE_SM};
-            """)
-            layout.addWidget(tunnel_label, alignment=Qt.AlignLeft)
+    def _server_name(self, server_id):
+        server = self.servers.summary_for(server_id)
+        return server.name if server is not None else str(server_id)
+    
+    def update_script_progress(self):
+        aggregator = self.script_aggregator
+        self.script_progress.setText(
+            f"완료 {aggregator.finished_count}/{self.script_target_count} | 결과 {len(aggregator)}종류"
+        )
+    
+    def on_script_host_output(self, run_id, server_id, stream, text):
+        """서버별 출력은 줄 단위로 모아 [서버명] 접두어를 붙여 표시"""
+        if run_id != self.script_run_id:
+            return
+        self.script_aggregator.feed(server_id, stream, text)
+        if not self.script_grouped:
+            self.append_script_lines(run_id, server_id, stream, text)
+    
+    def append_script_lines(self, run_id, server_id, stream, text):
+        key = (run_id, server_id, stream)
+        lines = (self.script_partial_lines.pop(key, "") + text).split("\n")
+        if lines[-1]:
+            self.script_partial_lines[key] = lines[-1]
+        lines = lines[:-1]
+        if not lines:
+            return
         
-        # 구분선
-        separator = QFrame()
-        separator.setFrameShape(QFrame.HLine)
-        separator.setStyleSheet(f"background-color: {Theme.BORDER_SOLID}; max-height: 1px;")
-        layout.addWidget(separator)
+        name = self._server_name(server_id)
+        prefix = f"[{name}]" if stream == STDOUT else f"[{name} !]"
+        lines = [line.rstrip("\r") for line in lines]
+        self.script_output.append("\n".join(f"{prefix} {line}" for line in lines))
+    
+    def on_script_host_finished(self, run_id, server_id, exit_code, duration, error):
+        """서버 하나의 실행 완료: 남은 출력과 종료 코드·실행 시간 표시"""
+        if run_id != self.script_run_id:
+            return
+        self.script_aggregator.finish(server_id, exit_code, error)
+        self.update_script_progress()
+        if self.script_grouped:
+            return
         
-        # 버튼들
-        button_layout = QHBoxLayout()
-        button_layout.setSpacing(8)
+        for stream in (STDOUT, STDERR):
+            rest = self.script_partial_lines.pop((run_id, server_id, stream), None)
+            if rest:
+                self.append_script_lines(run_id, server_id, stream, rest + "\n")
         
-        if is_connected:
-            stop_btn = QPushButton("⏹ 중지")
-            stop_btn.setProperty("buttonStyle", "outline")
-            stop_btn.clicked.connect(lambda: self.disconnect_server(index))
-            button_layout.addWidget(stop_btn)
-            
-            ssh_btn = QPushButton("SSH")
-            ssh_btn.clicked.connect(lambda: self.open_ssh_console(index))
-            button_layout.addWidget(ssh_btn)
+        name = self._server_name(server_id)
+        if error:
+            self.script_output.append(f"[{name}] 실패: {error} ({duration:.2f}s)")
         else:
-            start_btn = QPushButton("▶ 시작")
-            start_btn.clicked.connect(lambda: self.connect_server(index))
-            button_layout.addWidget(start_btn)
-        
-        button_layout.addStretch()
-        
-        edit_btn = QPushButton("✏ 수정")
-        edit_btn.setProperty("buttonStyle", "outline")
-        edit_btn.clicked.connect(lambda: self.edit_server(index))
-        button_layout.addWidget(edit_btn)
-        
-        delete_btn = QPushButton("🗑 삭제")
-        delete_btn.setProperty("buttonStyle", "destructive")
-        delete_btn.clicked.connect(lambda: self.delete_server(index))
-        button_layout.addWidget(delete_btn)
-        
-        layout.addLayout(button_layout)
+            self.script_output.append(f"[{name}] 종료 코드 {exit_code} ({duration:.2f}s)")
+    
+    def on_script_run_finished(self, run_id, succeeded, failed, duration):
+        """전체 실행 완료 요약"""
+        if run_id == self.script_run_id and self.script_grouped:
+            self.show_script_groups()
+        self.script_output.append(
+            f"[완료] 성공 {succeeded}개, 실패 {failed}개 ({duration:.2f}s)"
+        )
+        if run_id == self.script_run_id:
+            self.script_run_id = None
+            self.script_run_btn.setEnabled(True)
+            self.script_cancel_btn.setEnabled(False)
+    
+    def show_script_groups(self):
+        """같은 출력·종료 코드를 낸 서버끼리 묶어 결과마다 한 번씩 표시"""
+        for group in self.script_aggregator.groups():
+            names = ", ".join(self._server_name(server_id) for server_id in group.keys)
+            status = f"실패: {group.error}" if group.error else f"종료 코드 {group.exit_code}"
+            self.script_output.append(f"\n---------- {names} ({len(group.keys)}개) | {status} ----------")
+            if group.stdout:
+                self.script_output.append(group.stdout.rstrip("\n"))
+            if group.stderr:
+                self.script_output.append("[stderr]\n" + group.stderr.rstrip("\n"))
+            if group.truncated:
+                self.script_output.append("[정보] 출력이 길어 앞부분만 표시합니다.")
+    
+    def refresh_server_list(self):
+        """서버 목록 자체(추가·수정·삭제·검색어)가 바뀌었을 때 모델을 다시 채운다"""
+        # 검색어가 있으면 맞는 서버만 (목록이 바뀌었을 수 있으니 매번 다시 검색)
+        rows = None
+        matched = self.servers.search(self.server_search.text())
+        if matched is not None:
+            # 맞은 id만 위치로 바꾼다 (전체 목록을 훑지 않음)
+            rows = sorted(
+                index for index in map(self.servers.index_of, matched) if index is not None
+            )
         
-        return card
+        self.server_model.set_servers(self.servers, rows)
+        self.update_connection_status()
+    
+    def on_connection_state_changed(self, server_id, old_state, new_state):
+        """서버 하나의 연결 상태 변화 (카드는 모델이 그 행만 다시 그린다)"""
+        self.status_update_timer.start()
     
     def update_connection_status(self):
         """ConnectionStatus 업데이트"""
-        connected_count = len(self.connected_indices)
-        total_tunnels = sum(len(s.get('tunnels', [])) for s in self.servers)
-        
-        self.status_detail.setText(f"활성 터널: {connected_count}개 | 총 {total_tunnels}개 터널")
-    
-    def connect_server(self, index):
-        """서버 연결"""
-        self.terminal_output.append(f"\n[연결] {self.servers[index]['name']} 연결 시도...")
-        try:
-            server = self.servers[index]
-            ssh_manager = SSHManager(
-                server['host'],
-                server['port'],
-                server['username'],
-                server.get('password', ''),
-                server.get('key_path', '')
-            )
+        if self.ssh_managers and not self.metrics_timer.isActive():
+            self.metrics_timer.start()
+        elif not self.ssh_managers and self.metrics_timer.isActive():
+            self.metrics_timer.stop()
+            self.traffic_meters.clear()
+            self.traffic_summary = ""
+        
+        self.update_status_detail()
+        self.refresh_script_targets()
+    
+    def update_status_detail(self):
+        connected_count = len(self.ssh_managers)
+        total_tunnels = self.servers.total_tunnels
+        
+        text = f"활성 터널: {connected_count}개 | 총 {total_tunnels}개 터널"
+        if self.traffic_summary:
+            text += f" | {self.traffic_summary}"
+        self.status_detail.setText(text)
+    
+    def update_tunnel_metrics(self):
+        """터널별 누적 지표를 읽어 서버 카드와 ConnectionStatus에 초당 전송량 표시"""
+        total_in = total_out = 0.0
+        active = 0
+        errors = 0
+        seen = set()
+        for server_id, ssh_manager in list(self.ssh_managers.items()):
+            meter = self.traffic_meters.setdefault(server_id, ThroughputMeter())
+            rates = meter.update(ssh_manager.tunnel_metrics())
+            rate_in = sum(r.rate_in for r in rates)
+            rate_out = sum(r.rate_out for r in rates)
+            connections = sum(r.stats.active_connections for r in rates)
+            failures = sum(r.stats.open_failures + r.stats.errors for r in rates)
+            
+            text = (f"↓ {format_bytes(rate_in)}/s  ↑ {format_bytes(rate_out)}/s  "
+                    f"| 연결 {connections}개")
+            if failures:
+                text += f" | 오류 {failures}회"
+            self.server_model.set_traffic(server_id, text)
             
-            if ssh_manager.connect():
-                self.ssh_managers[index] = ssh_manager
-                self.connected_indices.add(index)
-                
-                # 터널 설정
-                for tunnel in server.get('tunnels', []):
-                    ssh_manager.create_tunnel(
-                        tunnel['local'],
-                        tunnel['remote_host'],
-                        tunnel['remote_port']
-                    )
-                
-                self.terminal_output.append(f"[성공] {server['name']} 연결 완료!")
-                self.refresh_server_list()
+            # 같은 연결을 공유하는 서버 항목은 한 번만 합산
+            if id(ssh_manager) in seen:
+                continue
+            seen.add(id(ssh_manager))
+            total_in += rate_in
+            total_out += rate_out
+            active += connections
+            errors += failures
+        
+        for server_id in list(self.traffic_meters):
+            if server_id not in self.ssh_managers:
+                del self.traffic_meters[server_id]
+        
+        self.traffic_summary = (f"↓ {format_bytes(total_in)}/s ↑ {format_bytes(total_out)}/s"
+                                f" | 중계 연결 {active}개")
+        if errors:
+            self.traffic_summary += f" | 오류 {errors}회"
+        self.update_status_detail()
+    
+    def connect_server(self, server_id):
+        """서버 연결 (백그라운드)"""
+        server = self.servers.summary_for(server_id)
+        if server is None or server_id in self.ssh_managers:
+            return
+        if self.connection_pool.is_pending(server_id):
+            self.terminal_output.append(f"\n[경고] {server.name} 연결 시도 중입니다.")
+            return
+        
+        self.terminal_output.append(f"\n[연결] {server.name} 연결 시도...")
+        self.connection_pool.connect_server(server_id, self.servers.record_for(server_id))
+    
+    def connect_all_servers(self):
+        """연결되지 않은 모든 서버를 병렬로 연결"""
+        targets = [
+            (server.id, self.servers[i]) for i, server in enumerate(self.servers.summaries())
+            if server.id not in self.ssh_managers and not self.connection_pool.is_pending(server.id)
+        ]
+        if not targets:
+            self.terminal_output.append("\n[정보] 연결할 서버가 없습니다.")
+            return
+        
+        self.terminal_output.append(
+            f"\n[전체 연결] {len(targets)}개 서버 연결 시작 "
+            f"(동시 {self.connection_pool.max_parallel}개)"
+        )
+        self.connection_pool.connect_many(targets)
+    
+    def on_connect_started(self, server_id):
+        self.connection_states.set_state(server_id, STATE_CONNECTING)
+    
+    def on_connect_finished(self, server_id, server, ssh_manager, success, profile):
+        """백그라운드 연결 결과 반영"""
+        # 연결 중에 서버가 삭제/수정되었으면 결과를 버린다
+        if self.servers.record_for(server_id) is not server:
+            if success:
+                self.connection_pool.registry.release(ssh_manager, owner=server_id, close=True)
+            self.connection_states.set_state(server_id, STATE_DISCONNECTED)
+            return
+        
+        if success:
+            self.ssh_managers[server_id] = ssh_manager
+            self.health_monitor.watch(server_id, ssh_manager)
+            ssh_manager.add_state_listener(self._emit_manager_state)
+            # 재연결 중인 공유 연결에 합류했으면 재연결이 끝날 때 상태 알림으로 갱신된다
+            if ssh_manager.state == STATE_RECONNECTING:
+                self.connection_states.set_state(server_id, STATE_RECONNECTING)
             else:
-                self.terminal_output.append(f"[오류] {server['name']} 연결 실패")
-        except Exception as e:
-            self.terminal_output.append(f"[오류] {str(e)}")
+                self.connection_states.set_state(server_id, STATE_CONNECTED)
+            self.terminal_output.append(f"[성공] {server['name']} 연결 완료!")
+            self.append_connect_profile(profile)
+        else:
+            self.connection_states.set_state(server_id, STATE_FAILED)
+            self.terminal_output.append(f"[오류] {server['name']} 연결 실패")
+            self.append_connect_profile(profile)
+    
+    def append_connect_profile(self, profile):
+        """이번 연결 시도의 단계별 소요 시간 한 줄 요약 (공유 연결을 재사용했으면 생략)"""
+        if profile is None:
+            return
+        line = f"  ⏱ {profile.summary()}"
+        if profile.failed_phase:
+            line += f" (실패 단계: {PHASE_LABELS.get(profile.failed_phase, profile.failed_phase)})"
+        self.terminal_output.append(line)
+    
+    def show_connect_profiles(self):
+        """서버별 연결 단계 시간 표"""
+        ConnectProfileDialog(parent=self).exec_()
+    
+    def on_connect_progress(self, done, total):
+        """전체 연결 진행률 표시"""
+        if total > 1:
+            self.terminal_output.append(f"[전체 연결] {done}/{total} 완료")
     
-    def disconnect_server(self, index):
+    def disconnect_server(self, server_id):
         """서버 연결 해제"""
-        if index in self.ssh_managers:
-            self.ssh_managers[index].disconnect()
-            del self.ssh_managers[index]
-            self.connected_indices.remove(index)
-            self.terminal_output.append(f"\n[연결 종료] {self.servers[index]['name']}")
-            self.refresh_server_list()
+        if server_id in self.ssh_managers:
+            self._release_manager(server_id, close=True)
+            self.connection_states.set_state(server_id, STATE_DISCONNECTED)
+            self.terminal_output.append(f"\n[연결 종료] {self._server_name(server_id)}")
     
-    def edit_server(self, index):
+    def edit_server(self, server_id):
         """서버 수정 (인라인)"""
+        record = self.servers.record_for(server_id)
+        if record is None:
+            return
         if self.server_form:
             # 이미 폼이 열려있으면 닫기
             self.close_server_form()
         
-        self.editing_server_index = index
-        self.server_form = ServerFormInline(server_data=self.servers[index], parent=self)
+        self.editing_server_id = server_id
+        self.server_form = ServerFormInline(server_data=record, parent=self)
         self.server_form.save_clicked.connect(self.on_server_form_save)
         self.server_form.cancel_clicked.connect(self.close_server_form)
         
@@ -870,21 +1111,23 @@ class MainWindow(QMainWindow):
     
     def on_server_form_save(self, result):
         """서버 폼 저장 처리"""
-        if self.editing_server_index is not None:
-            # 수정
-            index = self.editing_server_index
-            if index in self.connected_indices:
-                self.disconnect_server(index)
-            
-            self.servers[index] = result
+        index = None
+        if self.editing_server_id is not None:
+            server_id = self.editing_server_id
+            if server_id in self.ssh_managers:
+                self.disconnect_server(server_id)
+            index = self.servers.index_of(server_id)
+        
+        if index is not None:
+            # 수정: 공유 연결이 옛 정보로 재사용되지 않도록 떼어 낸 뒤 저장소의 같은 행(id)을 덮어쓴다
+            self.connection_pool.registry.invalidate(self.servers[index])
+            self.servers.replace(index, result)
             self.terminal_output.append(f"\n[성공] {result['name']} 서버 정보가 수정되었습니다.")
-            self.editing_server_index = None
         else:
-            # 추가
-            self.servers.append(result)
+            # 추가 (수정 중에 삭제된 서버도 새로 추가)
+            self.servers.add(result)
             self.terminal_output.append(f"\n[성공] {result['name']} 서버가 추가되었습니다.")
         
-        save_server_list(self.servers)
         self.close_server_form()
         self.refresh_server_list()
     
@@ -894,48 +1137,85 @@ class MainWindow(QMainWindow):
             self.server_layout.removeWidget(self.server_form)
             self.server_form.deleteLater()
             self.server_form = None
-            self.editing_server_index = None
+            self.editing_server_id = None
     
-    def delete_server(self, index):
+    def delete_server(self, server_id):
         """서버 삭제"""
+        server = self.servers.summary_for(server_id)
+        if server is None:
+            return
         reply = QMessageBox.question(
             self, '삭제 확인',
-            f"{self.servers[index]['name']} 서버를 삭제하시겠습니까?",
+            f"{server.name} 서버를 삭제하시겠습니까?",
             QMessageBox.Yes | QMessageBox.No
         )
         
         if reply == QMessageBox.Yes:
-            if index in self.connected_indices:
-                self.disconnect_server(index)
+            if server_id in self.ssh_managers:
+                self.disconnect_server(server_id)
             
-            del self.servers[index]
-            save_server_list(self.servers)
+            # 다른 서버의 연결 상태는 id로 기억하므로 인덱스가 밀려도 그대로다
+            self.connection_states.forget(server_id)
+            self.servers.remove(self.servers.index_of(server_id))
             self.terminal_output.append(f"\n[삭제] 서버가 삭제되었습니다.")
             self.refresh_server_list()
     
-    def open_ssh_console(self, index):
+    def open_ssh_console(self, server_id):
         """SSH 콘솔 열기"""
-        self.terminal_output.append(f"\n[SSH] {self.servers[index]['name']} SSH 콘솔 (미구현)")
+        self.terminal_output.append(f"\n[SSH] {self._server_name(server_id)} SSH 콘솔 (미구현)")
         if not self.terminal_panel.isVisible():
             self.toggle_terminal_panel()
     
-    def check_all_connections(self):
-        """모든 연결 상태 확인"""
-        disconnected = set()
-        for index in list(self.connected_indices):
-            if index in self.ssh_managers:
-                if not self.ssh_managers[index].is_connected():
-                    disconnected.add(index)
-                    self.terminal_output.append(f"\n[경고] {self.servers[index]['name']} 연결 끊김")
-        
-        for index in disconnected:
-            if index in self.ssh_managers:
-                self.ssh_managers[index].disconnect()
-                del self.ssh_managers[index]
-            self.connected_indices.remove(index)
-        
-        if disconnected:
-            self.refresh_server_list()
+    def on_connection_health_changed(self, server_id, ssh_manager, alive):
+        """헬스 모니터가 감지한 연결 상태 변화 반영"""
+        if alive or self.ssh_managers.get(server_id) is not ssh_manager:
+            return
+        
+        self.terminal_output.append(f"\n[경고] {self._server_name(server_id)} 연결 끊김")
+        # 재연결은 SSHManager가 백오프로 처리하고, 불가능한 경우에만 정리
+        if not ssh_manager.start_reconnect():
+            self._drop_connection(server_id, STATE_FAILED)
+    
+    def on_manager_state_changed(self, ssh_manager, old_state, new_state):
+        """SSHManager 재연결 상태 변화 반영"""
+        # 같은 연결을 공유하는 서버 항목 모두에 반영
+        server_ids = [i for i, m in self.ssh_managers.items() if m is ssh_manager]
+        for server_id in server_ids:
+            name = self._server_name(server_id)
+            if new_state == STATE_RECONNECTING:
+                self.connection_states.set_state(server_id, STATE_RECONNECTING)
+                self.terminal_output.append(f"\n[재연결] {name} 재연결 중...")
+            elif new_state == STATE_CONNECTED and old_state == STATE_RECONNECTING:
+                self.connection_states.set_state(server_id, STATE_CONNECTED)
+                self.terminal_output.append(f"[성공] {name} 재연결 완료!")
+            elif new_state == STATE_FAILED:
+                self.terminal_output.append(f"[오류] {name} 재연결 실패")
+                self._drop_connection(server_id, STATE_FAILED)
+    
+    def _emit_manager_state(self, ssh_manager, old_state, new_state):
+        """SSHManager 상태 리스너 (임의 스레드) → GUI 스레드 시그널"""
+        self.manager_state_changed.emit(ssh_manager, old_state, new_state)
+    
+    def _drop_connection(self, server_id, state=STATE_DISCONNECTED):
+        """끊어진 연결 정리"""
+        self._release_manager(server_id)
+        self.connection_states.set_state(server_id, state)
+    
+    def _release_manager(self, server_id, close=False):
+        """공유 연결 참조 반납 (close=True: 사용자가 끊은 경우 유휴 유예 없이 닫기)"""
+        ssh_manager = self.ssh_managers.pop(server_id, None)
+        self.health_monitor.unwatch(server_id)
+        if ssh_manager is None:
+            return
+        if not any(m is ssh_manager for m in self.ssh_managers.values()):
+            ssh_manager.remove_state_listener(self._emit_manager_state)
+        self.connection_pool.registry.release(ssh_manager, owner=server_id, close=close)
+    
+    def closeEvent(self, event):
+        self.health_monitor.stop()
+        self.script_runner.cancel()
+        self.script_runner.wait_for_done(3000)
+        super().closeEvent(event)
     
     def show_settings(self):
         """설정 다이얼로그"""
@@ -0,0 +1,59 @@
+# gui/render_scheduler.py
+"""
+데이터가 도착할 때만 화면을 그리도록 예약하는 프레임 제한 렌더 스케줄러
+"""
+
+import time
+
+from PyQt5.QtCore import QObject, QTimer
+
+# 연속 출력 중 초당 최대 렌더 횟수
+DEFAULT_MAX_FPS = 60
+
+
+class RenderScheduler(QObject):
+    """
+    request()가 호출될 때만 render 콜백을 실행한다.
+
+    - 직전 프레임 후 프레임 간격 이상 지났으면(= 유휴 후 첫 데이터) 다음 이벤트 루프
+      차례에 바로 그린다. 키 입력 에코가 지연 없이 보인다.
+    - 그 안에 들어온 요청은 하나로 합쳐 다음 프레임 시점에 한 번만 그린다.
+    - 요청이 없으면 타이머도 돌지 않는다.
+    """
+
+    def __init__(self, render, max_fps=DEFAULT_MAX_FPS, parent=None):
+        super().__init__(parent)
+        self._render = render
+        self._last_frame = 0.0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._fire)
+        self.set_max_fps(max_fps)
+
+    @property
+    def max_fps(self):
+        return self._max_fps
+
+    def set_max_fps(self, max_fps):
+        self._max_fps = max(1, int(max_fps))
+        self._frame_interval = 1.0 / self._max_fps
+
+    def request(self):
+        """다음 프레임 렌더 예약 (이미 예약되어 있으면 합쳐진다)"""
+        if self._timer.isActive():
+            return
+        delay = self._last_frame + self._frame_interval - time.monotonic()
+        self._timer.start(max(0, int(delay * 1000 + 0.999)))
+
+    def flush(self):
+        """예약된 렌더가 있으면 지금 바로 실행"""
+        if self._timer.isActive():
+            self._timer.stop()
+            self._fire()
+
+    def stop(self):
+        self._timer.stop()
+
+    def _fire(self):
+        self._last_frame = time.monotonic()
+        self._render()
@@ -0,0 +1,148 @@
+# gui/script_runner.py
+"""
+여러 서버에서 같은 명령을 동시에 실행하고 결과를 시그널로 스트리밍하는 스크립트 실행기
+"""
+
+import itertools
+import threading
+import time
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from core.connection_registry import get_connection_registry
+from core.remote_exec import execute
+
+# 동시에 명령을 실행할 최대 서버 수
+DEFAULT_MAX_PARALLEL_RUNS = 16
+
+
+class _HostTask(QRunnable):
+    """서버 하나에서 명령을 실행하는 작업"""
+
+    def __init__(self, runner, run, key, ssh_manager, retained):
+        super().__init__()
+        self.runner = runner
+        self.run_state = run
+        self.key = key
+        self.ssh_manager = ssh_manager
+        self.retained = retained
+
+    def run(self):
+        run = self.run_state
+        runner = self.runner
+        if run.cancel.is_set():
+            result = None
+        else:
+            runner.host_started.emit(run.run_id, self.key)
+            result = execute(
+                self.ssh_manager,
+                run.command,
+                lambda stream, text: runner.host_output.emit(run.run_id, self.key, stream, text),
+                cancel=run.cancel,
+                timeout=run.timeout,
+            )
+        retained_manager = self.ssh_manager if self.retained else None
+        runner._task_done.emit(run.run_id, self.key, retained_manager, result)
+
+
+class _Run:
+    def __init__(self, run_id, command, keys, timeout):
+        self.run_id = run_id
+        self.command = command
+        self.pending = set(keys)
+        self.timeout = timeout
+        self.cancel = threading.Event()
+        self.started_at = time.monotonic()
+        self.succeeded = 0
+        self.failed = 0
+
+
+class ScriptRunner(QObject):
+    """
+    선택한 서버들의 SSHManager에서 exec_command로 명령을 실행한다.
+    서버마다 세션 채널을 하나씩 열며, 최대 max_parallel개가 동시에 실행된다.
+
+    host_started(run_id, key)                                : 서버 하나의 실행 시작
+    host_output(run_id, key, stream, text)                   : stdout/stderr 출력 조각
+    host_finished(run_id, key, exit_code, duration, error)   : 서버 하나의 실행 완료
+                                                               (exit_code는 실패 시 None)
+    run_finished(run_id, succeeded, failed, duration)        : 전체 실행 완료
+    """
+    host_started = pyqtSignal(int, object)
+    host_output = pyqtSignal(int, object, str, str)
+    host_finished = pyqtSignal(int, object, object, float, object)
+    run_finished = pyqtSignal(int, int, int, float)
+
+    _task_done = pyqtSignal(int, object, object, object)
+
+    def __init__(self, max_parallel=DEFAULT_MAX_PARALLEL_RUNS, parent=None, registry=None):
+        super().__init__(parent)
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(max(1, int(max_parallel)))
+        self.registry = registry if registry is not None else get_connection_registry()
+        self._runs = {}
+        self._run_ids = itertools.count(1)
+        self._task_done.connect(self._on_task_done)
+
+    @property
+    def max_parallel(self):
+        return self._thread_pool.maxThreadCount()
+
+    def set_max_parallel(self, max_parallel):
+        self._thread_pool.setMaxThreadCount(max(1, int(max_parallel)))
+
+    def is_running(self, run_id=None):
+        if run_id is None:
+            return bool(self._runs)
+        return run_id in self._runs
+
+    def run(self, command, targets, timeout=None):
+        """
+        targets: (key, ssh_manager) 목록. key는 결과를 구분하는 값(서버 인덱스 등).
+        실행 번호(run_id)를 반환한다. 대상이 없으면 None.
+        """
+        targets = list(targets)
+        if not targets:
+            return None
+
+        run = _Run(next(self._run_ids), command, [key for key, _ in targets], timeout)
+        self._runs[run.run_id] = run
+        for key, ssh_manager in targets:
+            # 실행 중에는 공유 연결이 유휴 종료되지 않도록 참조 유지
+            retained = self.registry.retain(ssh_manager)
+            self._thread_pool.start(_HostTask(self, run, key, ssh_manager, retained))
+        return run.run_id
+
+    def cancel(self, run_id=None):
+        """실행 중인 명령 취소 (run_id가 없으면 전부)"""
+        runs = self._runs.values() if run_id is None else [self._runs.get(run_id)]
+        for run in runs:
+            if run is not None:
+                run.cancel.set()
+
+    def wait_for_done(self, msecs=-1):
+        return self._thread_pool.waitForDone(msecs)
+
+    def _on_task_done(self, run_id, key, retained_manager, result):
+        if retained_manager is not None:
+            self.registry.release(retained_manager)
+        run = self._runs.get(run_id)
+        if run is None:
+            return
+
+        run.pending.discard(key)
+        if result is None:
+            run.failed += 1
+            self.host_finished.emit(run_id, key, None, 0.0, "취소됨")
+        else:
+            if result.exit_code == 0:
+                run.succeeded += 1
+            else:
+                run.failed += 1
+            self.host_finished.emit(run_id, key, result.exit_code, result.duration, result.error)
+
+        if not run.pending:
+            del self._runs[run_id]
+            self.run_finished.emit(
+                run_id, run.succeeded, run.failed, time.monotonic() - run.started_at
+            )
@@ -1,76 +1,171 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTextEdit
-from PyQt5.QtGui import QFont, QTextCursor
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
-from gui.theme import Theme
-import pyte
-import time
+from core.connection_registry import get_connection_registry
+from core.ssh_manager import STATE_CONNECTING, STATE_RECONNECTING
+from gui.components.terminal_view import TerminalView
+from gui.render_scheduler import DEFAULT_MAX_FPS, RenderScheduler
+from gui.terminal_emulator import TerminalEmulator
+from gui.terminal_scrollback import DEFAULT_SCROLLBACK_LINES
+import select
+import threading
+
+# 한 번의 recv로 읽는 최대 바이트 수
+READ_CHUNK_SIZE = 64 * 1024
+# 한 번에 모아서 파싱하는 최대 바이트 수
+MAX_COALESCE_SIZE = 512 * 1024
+# stop() 이후 스레드가 종료를 확인하는 최대 지연 (채널을 닫으면 즉시 깨어난다)
+STOP_CHECK_INTERVAL = 0.5
+# 창 크기 조절이 멈춘 뒤 원격 PTY 크기를 바꾸기까지 기다리는 시간 (ms)
+RESIZE_DEBOUNCE_MS = 150
+# 대량 출력 중 화면 갱신 횟수 상한
+FLOOD_MAX_FPS = 10
+# 스크롤백 한 줄에 해당하는 휠 회전량 (angleDelta 기준, 한 칸 = 120)
+WHEEL_DELTA_PER_LINE = 40
+
 
 class OutputThread(QThread):
-    data_received = pyqtSignal(bytes)
+    """
+    채널의 fileno를 select로 기다리다가, 데이터가 오면 쌓인 만큼 한꺼번에 읽어
+    이 스레드에서 바로 TerminalEmulator에 파싱시킨다.
+
+    GUI에는 화면이 바뀌었다는 screen_changed만 보내며, GUI가 이전 변경을 아직
+    가져가지 않았으면 보내지 않는다. 대량 출력 모드에 들어가거나 나오면
+    flood_changed(bool)을, 채널이 EOF/종료되면 channel_closed를 보낸다.
 
-    def __init__(self, channel):
+    discard_backlog()를 부르면 그 시점까지 채널에 쌓인 출력은 그리지 않고 넘긴다.
+    """
+    screen_changed = pyqtSignal()
+    flood_changed = pyqtSignal(bool)
+    channel_closed = pyqtSignal()
+
+    def __init__(self, channel, emulator):
         super().__init__()
         self.channel = channel
+        self.emulator = emulator
         self._running = True
+        # 그리지 않고 넘길 남은 바이트 수 (Ctrl+C 시점에 쌓여 있던 출력)
+        self._discard_lock = threading.Lock()
+        self._discard_bytes = 0
 
     def run(self):
+        channel = self.channel
+        flooding = False
         while self._running:
-            if self.channel.recv_ready():
-                data = self.channel.recv(1024)
-                self.data_received.emit(data)
-            time.sleep(0.02)
+            try:
+                readable, _, _ = select.select([channel], [], [], STOP_CHECK_INTERVAL)
+            except (OSError, ValueError):
+                break
+            if not readable:
+                # 출력이 멈춘 경우에도 flood 해제를 알린다
+                if flooding and not self.emulator.update_flood_state():
+                    flooding = False
+                    self.flood_changed.emit(False)
+                continue
+
+            chunks = []
+            size = 0
+            while size < MAX_COALESCE_SIZE and channel.recv_ready():
+                data = channel.recv(READ_CHUNK_SIZE)
+                if not data:
+                    break
+                chunks.append(data)
+                size += len(data)
+
+            if chunks:
+                data = b"".join(chunks)
+                with self._discard_lock:
+                    discard = min(self._discard_bytes, len(data))
+                    self._discard_bytes -= discard
+                try:
+                    notify = False
+                    if discard:
+                        notify = self.emulator.feed_bytes(data[:discard], drawing=False)
+                    if discard < len(data):
+                        notify = self.emulator.feed_bytes(data[discard:]) or notify
+                except Exception as e:
+                    print(f"[pyte decode error] {e}")
+                    notify = True
+                if notify:
+                    self.screen_changed.emit()
+                if self.emulator.flooding != flooding:
+                    flooding = not flooding
+                    self.flood_changed.emit(flooding)
+            elif channel.closed or channel.eof_received:
+                break
+
+        if self._running:
+            self.channel_closed.emit()
+
+    def discard_backlog(self):
+        """
+        지금 채널 버퍼에 쌓여 있는 출력과 파싱 중인 묶음을 그리지 않고 넘긴다 (GUI 스레드).
+        상태(색, 커서, 모드)는 유지되도록 파서에는 그대로 넣는다.
+        """
+        with self._discard_lock:
+            self._discard_bytes += len(self.channel.in_buffer)
+        self.emulator.skip_rest()
 
     def stop(self):
         self._running = False
 
 class SSHTerminalWidget(QWidget):
-    def __init__(self, ssh_manager, parent=None):
+    def __init__(self, ssh_manager, parent=None, font=None, max_fps=DEFAULT_MAX_FPS,
+                 scrollback_lines=DEFAULT_SCROLLBACK_LINES):
         super().__init__(parent)
         
         self.ssh_manager = ssh_manager
         self.channel = None
         self.output_thread = None
-        self._last_render = ""
-        
-        # Pyte 화면 구성
-        self.screen = pyte.Screen(80, 24)
-        self.stream = pyte.Stream(self.screen)
-
-        # 텍스트 표시용 위젯
-        self.text_area = QTextEdit()
-        self.text_area.setFont(QFont("Consolas, Monaco, monospace", 11))
-        self.text_area.setReadOnly(False)
-        self.text_area.setTextInteractionFlags(Qt.TextEditorInteraction)
+        self._waiting_reconnect = False
+        # 한 줄에 못 미친 휠 회전량 (다음 휠 이벤트에 더한다)
+        self._wheel_remainder = 0
+
+        # 탭이 열려 있는 동안 공유 연결이 유휴 종료되지 않도록 참조를 잡아 둔다
+        self._registry = get_connection_registry()
+        self._retained = ssh_manager is not None and self._registry.retain(ssh_manager)
         
-        # Figma 디자인 스타일 적용
-        self.text_area.setStyleSheet(f"""
-            QTextEdit {{
-                background-color: #1a1a1a;
-                color: #10b981;
-                border: none;
-                border-radius: {Theme.RADIUS_SM};
-                padding: {Theme.SPACING_MD};
-                font-family: Consolas, Monaco, monospace;
-                font-size: 13px;
-                selection-background-color: #334155;
-            }}
-        """)
+        # 디코딩·pyte 파싱·스크롤백은 출력 스레드에서 처리하고, GUI는 스냅샷만 그린다
+        self.emulator = TerminalEmulator(80, 24, scrollback_lines)
+
+        # 글리프 격자 터미널 뷰 (바뀐 줄만 다시 그림)
+        if font is None:
+            font = QFont("Consolas")
+            font.setStyleHint(QFont.Monospace)
+            font.setPixelSize(13)
+        columns, rows = self.emulator.size
+        self.terminal_view = TerminalView(columns, rows, font)
+
+        # 대량 출력 안내 (뷰 위에 겹쳐 표시)
+        self.flood_label = QLabel("대량 출력 중 - 중간 출력을 건너뛰고 있습니다 (Ctrl+C: 중단)",
+                                  self.terminal_view)
+        self.flood_label.setStyleSheet(
+            "background-color: #f59e0b; color: #1a1a1a; padding: 2px 8px; border-radius: 4px;"
+        )
+        self.flood_label.adjustSize()
+        self.flood_label.hide()
 
         layout = QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)  # 여백 제거
-        layout.addWidget(self.text_area)
+        layout.addWidget(self.terminal_view)
         self.setLayout(layout)
 
-        # 키보드 입력 이벤트 연결
-        self.text_area.installEventFilter(self)
+        # 키보드 입력/크기 변경 이벤트 연결
+        self.terminal_view.installEventFilter(self)
+
+        # 크기 조절 중에는 원격에 window-change를 보내지 않고, 멈춘 뒤 한 번만 보낸다
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(RESIZE_DEBOUNCE_MS)
+        self.resize_timer.timeout.connect(self.apply_terminal_size)
+
+        # 데이터가 올 때만 최대 max_fps로 화면 갱신
+        self.render_scheduler = RenderScheduler(self.update_screen, max_fps, self)
+        self._max_fps = max_fps
 
         # SSH 채널 초기화
         self.initialize_channel()
-
-        # 화면 주기적 갱신 (렌더링)
-        self.refresh_timer = QTimer(self)
-        self.refresh_timer.timeout.connect(self.update_screen)
-        self.refresh_timer.start(100)
+        self.render_scheduler.request()
 
         # 터미널 재연결 감시 타이머
         self.reconnect_timer = QTimer(self)
@@ -81,40 +176,92 @@ class SSHTerminalWidget(QWidget):
         """SSH 채널을 초기화하고 출력 스레드를 시작합니다."""
         self._stop_output_thread()
         if self.ssh_manager and self.ssh_manager.is_connected():
-            self.channel = self.ssh_manager.client.invoke_shell()
-            self.output_thread = OutputThread(self.channel)
-            self.output_thread.data_received.connect(self.handle_data)
+            columns, rows = self.emulator.size
+            self.channel = self.ssh_manager.open_shell(width=columns, height=rows)
+            self.emulator.reset()
+            self.render_scheduler.request()
+            self.output_thread = OutputThread(self.channel, self.emulator)
+            self.output_thread.screen_changed.connect(self.render_scheduler.request)
+            self.output_thread.flood_changed.connect(self.on_flood_changed)
+            # 채널이 닫히면 다음 감시 주기를 기다리지 않고 바로 상태를 확인
+            self.output_thread.channel_closed.connect(self.check_connection)
             self.output_thread.start()
-            self._last_render = ""
 
-    def handle_data(self, data):
-        try:
-            decoded = data.decode("utf-8", errors="replace")
-            self.stream.feed(decoded)
-        except Exception as e:
-            print(f"[pyte decode error] {e}")
+    def interrupt(self):
+        """Ctrl+C: 원격에 인터럽트를 보내고, 이미 받아 둔 출력은 그리지 않고 넘긴다"""
+        self.channel.send('\x03')
+        if self.output_thread is not None:
+            self.output_thread.discard_backlog()
+
+    def on_flood_changed(self, flooding):
+        """대량 출력 중에는 화면 갱신을 줄이고 안내를 표시"""
+        self.render_scheduler.set_max_fps(FLOOD_MAX_FPS if flooding else self._max_fps)
+        if flooding:
+            self.flood_label.move(self.terminal_view.width() - self.flood_label.width() - 8, 8)
+            self.flood_label.raise_()
+        self.flood_label.setVisible(flooding)
+        if not flooding:
+            self.render_scheduler.request()
 
     def update_screen(self):
-        content = "\n".join(self.screen.display)
-        if content == self._last_render:
+        """에뮬레이터가 마지막 스냅샷 이후 바뀐 줄만 뷰에 전달"""
+        frame = self.emulator.frame()
+        self.terminal_view.update_lines(frame.lines, frame.cursor, frame.cursor_visible)
+
+    def scroll_lines(self, delta):
+        """스크롤백 보기 위치 이동 (delta > 0 이면 위로)"""
+        if self.emulator.scroll(delta):
+            self.render_scheduler.request()
+
+    def apply_terminal_size(self):
+        """뷰 크기에 맞춰 pyte 화면과 원격 PTY 크기를 맞춘다."""
+        columns, rows = self.terminal_view.fitting_grid_size()
+        if not self.emulator.resize(columns, rows):
             return
-        self._last_render = content
-        cursor = self.text_area.textCursor()
-        self.text_area.blockSignals(True)
-        self.text_area.setPlainText(content)
-        self.text_area.blockSignals(False)
-        cursor.movePosition(QTextCursor.End)
-        self.text_area.setTextCursor(cursor)
+        self.terminal_view.set_grid_size(columns, rows)
+        if self.channel is not None and not self.channel.closed:
+            try:
+                self.channel.resize_pty(width=columns, height=rows)
+            except Exception as e:
+                print(f"[!] 터미널 크기 변경 실패: {e}")
+        self.render_scheduler.request()
+
+    def scrollback_memory_bytes(self):
+        """이 탭의 스크롤백이 사용하는 대략적인 메모리"""
+        return self.emulator.scrollback_memory_bytes()
 
     def eventFilter(self, source, event):
-        if source == self.text_area and event.type() == event.KeyPress:
-            if not self.channel:
-                return True
+        if source == self.terminal_view and event.type() == event.Resize:
+            self.resize_timer.start()
+            return False
+
+        if source == self.terminal_view and event.type() == event.Wheel:
+            # 한 칸(120) 당 3줄. 트랙패드의 작은 delta는 누적했다가 양방향 모두 0 쪽으로 자른다
+            total = self._wheel_remainder + event.angleDelta().y()
+            lines = int(total / WHEEL_DELTA_PER_LINE)
+            self._wheel_remainder = total - lines * WHEEL_DELTA_PER_LINE
+            if lines:
+                self.scroll_lines(lines)
+            return True
 
+        if source == self.terminal_view and event.type() == event.KeyPress:
             key = event.key()
             text = event.text()
 
-            if key == Qt.Key_Backspace:
+            if event.modifiers() & Qt.ShiftModifier and key in (Qt.Key_PageUp, Qt.Key_PageDown):
+                page = self.emulator.size[1] - 1
+                self.scroll_lines(page if key == Qt.Key_PageUp else -page)
+                return True
+
+            if not self.channel:
+                return True
+
+            # 입력하면 최신 화면으로 돌아온다
+            self.scroll_lines(-self.emulator.scroll_offset)
+
+            if key == Qt.Key_C and event.modifiers() & Qt.ControlModifier:
+                self.interrupt()
+            elif key == Qt.Key_Backspace:
                 self.channel.send('\x7f')
             elif key == Qt.Key_Return or key == Qt.Key_Enter:
                 self.channel.send('\n')
@@ -125,42 +272,60 @@ class SSHTerminalWidget(QWidget):
         return super().eventFilter(source, event)
 
     def check_connection(self):
-        """연결 상태를 확인하고 필요한 경우 재연결을 시도합니다."""
-        if not self.ssh_manager or not self.ssh_manager.is_connected():
-            self._stop_output_thread()
-            if self.channel:
-                self.channel.close()
-                self.channel = None
+        """
+        연결 상태를 확인합니다. 재연결은 SSHManager가 백그라운드에서 처리하며,
+        트랜스포트가 복구되면 셸 채널만 다시 엽니다.
+        """
+        if not self.ssh_manager:
+            return
 
-            try:
-                if self.ssh_manager.connect():
-                    self.initialize_channel()
-                    self.screen.reset()
-                    self.stream = pyte.Stream(self.screen)
-                    self._last_render = ""
-                    self.append_system_message("[ 재연결 성공 ]\n")
-                else:
-                    self.append_system_message("[ 재연결 실패 - 연결 종료 ]\n")
-                    self.parent().close()  # 탭 닫기
-            except Exception as e:
-                self.append_system_message(f"[ 재연결 오류: {e} ]\n")
-                self.parent().close()  # 탭 닫기
+        if self.ssh_manager.state in (STATE_RECONNECTING, STATE_CONNECTING):
+            if not self._waiting_reconnect:
+                self._waiting_reconnect = True
+                self.append_system_message("[ 재연결 중... ]\n")
+            return
+
+        if not self.ssh_manager.is_connected():
+            if self.ssh_manager.start_reconnect():
+                return
+            self._close_channel()
+            self.append_system_message("[ 재연결 실패 - 연결 종료 ]\n")
+            self.parent().close()  # 탭 닫기
+            return
+
+        if self.channel is None or self.channel.closed:
+            self.initialize_channel()
+            if self._waiting_reconnect:
+                self.append_system_message("[ 재연결 성공 ]\n")
+        self._waiting_reconnect = False
 
     def append_system_message(self, message):
-        self.text_area.moveCursor(QTextCursor.End)
-        self.text_area.insertPlainText(message)
-        self.text_area.moveCursor(QTextCursor.End)
+        """원격 출력과 같은 화면에 안내 문구를 표시"""
+        self.emulator.feed_text("\r\n" + message.replace("\n", "\r\n"))
+        self.render_scheduler.request()
 
     def close_connection(self):
         """연결을 정리하고 리소스를 해제합니다."""
-        self._stop_output_thread()
+        self._close_channel()
+        self.render_scheduler.stop()
+        self.resize_timer.stop()
+        self.reconnect_timer.stop()
+        if self._retained:
+            self._retained = False
+            self._registry.release(self.ssh_manager)
+
+    def _close_channel(self):
+        """채널을 닫아 select 대기 중인 출력 스레드를 깨운 뒤 종료를 기다린다."""
+        self.on_flood_changed(False)
+        if self.output_thread:
+            self.output_thread.stop()
         if self.channel:
             self.channel.close()
-        self.refresh_timer.stop()
-        self.reconnect_timer.stop()
+            self.channel = None
+        self._stop_output_thread()
 
     def _stop_output_thread(self):
         if self.output_thread:
             self.output_thread.stop()
-            self.output_thread.wait(1)
+            self.output_thread.wait(int(STOP_CHECK_INTERVAL * 1000) + 100)
             self.output_thread = None
\ No newline at end of file
@@ -0,0 +1,288 @@
+# gui/terminal_emulator.py
+"""
+터미널 에뮬레이션(UTF-8 디코딩 + pyte 파싱 + 화면 상태)을 GUI 스레드 밖에서 처리하는 모듈.
+GUI는 frame()으로 바뀐 줄만 담긴 불변 스냅샷을 받아 그린다.
+"""
+
+import codecs
+import collections
+import threading
+import time
+
+import pyte
+
+from gui.terminal_scrollback import DEFAULT_SCROLLBACK_LINES, ScrollbackScreen
+
+# 한 번에 잠금을 잡고 파싱하는 최대 바이트 수 (GUI의 frame() 대기 시간을 짧게 유지)
+FEED_SLICE_SIZE = 16 * 1024
+
+# 대량 출력(flood) 판정: 측정 구간마다 처리량을 재서, 임계값을 넘는 구간이
+# FLOOD_ENTER_WINDOWS번 이어지면 진입하고 임계값의 1/4 아래로 떨어지면 해제
+# 파싱은 출력 스레드에서 하므로 측정되는 속도는 pyte 처리 속도(수백 KB/s)를 넘지 못한다.
+FLOOD_RATE_THRESHOLD = 256 * 1024  # 바이트/초
+FLOOD_WINDOW = 0.25
+FLOOD_ENTER_WINDOWS = 2
+
+# flood 중 한 묶음에서 실제로 그리는 끝부분 줄 수 (화면 줄 수의 배수)
+FLOOD_TAIL_SCREENS = 2
+
+# GUI에 넘기는 화면 스냅샷.
+# lines: {줄 번호: span 튜플} (바뀐 줄만), cursor: (x, y)
+TerminalFrame = collections.namedtuple("TerminalFrame", "lines cursor cursor_visible")
+
+
+def line_spans(line, columns):
+    """
+    pyte 화면의 한 줄을 같은 속성끼리 묶은 span 튜플 목록으로 변환한다.
+    span: (col, cells, text, fg, bg, bold, underscore, reverse)  - cells는 차지하는 칸 수
+
+    폭이 넓은 문자(한글 등)와 ASCII 밖의 문자는 격자 정렬을 위해 각각 별도 span으로 둔다.
+    """
+    spans = []
+    start = 0
+    text = []
+    attrs = None
+    for x in range(columns):
+        char = line[x]
+        if not char.data:
+            # 넓은 문자의 오른쪽 절반 자리
+            continue
+        key = (char.fg, char.bg, char.bold, char.underscore, char.reverse)
+        single = char.data.isascii()
+        if text and (key != attrs or not single):
+            spans.append((start, len(text), "".join(text), *attrs))
+            text = []
+        if not single:
+            cells = 2 if x + 1 < columns and not line[x + 1].data else 1
+            spans.append((x, cells, char.data, *key))
+            continue
+        if not text:
+            start = x
+            attrs = key
+        text.append(char.data)
+    if text:
+        spans.append((start, len(text), "".join(text), *attrs))
+    return tuple(spans)
+
+
+class FloodDetector:
+    """짧은 구간별 처리량으로 지속적인 대량 출력을 감지한다."""
+
+    def __init__(self, threshold=FLOOD_RATE_THRESHOLD, window=FLOOD_WINDOW,
+                 enter_windows=FLOOD_ENTER_WINDOWS, clock=time.monotonic):
+        self.threshold = threshold
+        self.window = window
+        self.enter_windows = enter_windows
+        self._clock = clock
+        self._window_start = clock()
+        self._window_bytes = 0
+        self._hot_windows = 0
+        self.flooding = False
+
+    def add(self, nbytes):
+        self._window_bytes += nbytes
+        return self.update()
+
+    def update(self):
+        """측정 구간이 지났으면 상태를 갱신. 현재 flood 여부를 반환"""
+        now = self._clock()
+        elapsed = now - self._window_start
+        if elapsed < self.window:
+            return self.flooding
+        rate = self._window_bytes / elapsed
+        self._window_start = now
+        self._window_bytes = 0
+
+        if rate >= self.threshold:
+            self._hot_windows += 1
+            if self._hot_windows >= self.enter_windows:
+                self.flooding = True
+        else:
+            self._hot_windows = 0
+            if rate < self.threshold / 4:
+                self.flooding = False
+        return self.flooding
+
+
+class TerminalEmulator:
+    """
+    채널 출력 하나에 대한 디코더·pyte 화면·스크롤백 상태를 소유한다.
+
+    feed_bytes()는 출력 스레드에서, 나머지는 GUI 스레드에서 호출하며 모든 화면 접근은
+    잠금으로 보호된다. 큰 출력은 FEED_SLICE_SIZE 단위로 나누어 파싱하므로 GUI가
+    frame()을 얻기 위해 오래 기다리지 않는다.
+
+    대량 출력이 이어지는 동안(flood)에는 읽어 온 묶음마다 마지막 몇 화면 분량만
+    그린다. 그 앞부분도 파서에는 모두 넣되 글자 출력만 생략하므로 색·커서·스크롤
+    영역·대체 화면 같은 상태는 이어지고, 건너뛴 줄은 스크롤백에 남지 않는다.
+    """
+
+    def __init__(self, columns=80, lines=24, scrollback_lines=DEFAULT_SCROLLBACK_LINES):
+        self._lock = threading.Lock()
+        self._screen = ScrollbackScreen(columns, lines, scrollback_lines)
+        self._stream = pyte.Stream(self._screen)
+        # 청크 경계에서 잘린 멀티바이트 문자(한글 등)를 다음 청크와 이어서 디코딩
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        # GUI에 아직 가져가지 않은 변경이 있는지 (알림 합치기용)
+        self._pending = False
+        # 스크롤백을 보고 있을 때 화면 아래에서부터 올라간 줄 수
+        self._scroll_offset = 0
+        self._scroll_anchor = 0
+        self._flood = FloodDetector()
+        # flood 중이거나 Ctrl+C로 버려 그리지 않고 파싱만 한 바이트 수 (누적)
+        self.skipped_bytes = 0
+        # 진행 중인 feed_bytes()의 남은 부분을 그리지 않을지 (Ctrl+C 중단)
+        self._skip_rest = False
+
+    # ---------- 출력 스레드 ----------
+
+    @property
+    def flooding(self):
+        return self._flood.flooding
+
+    def update_flood_state(self):
+        """출력이 없을 때도 flood 해제를 판정하도록 주기적으로 호출"""
+        return self._flood.update()
+
+    def feed_bytes(self, data, drawing=True):
+        """
+        원격 출력 바이트를 디코딩·파싱한다. drawing=False면 글자는 그리지 않고
+        제어·이스케이프 시퀀스만 반영한다 (사용자가 중단해 버리는 출력).
+        GUI에 새로 알려야 하면 True (이전 변경을 아직 가져가지 않았으면 False).
+        """
+        self._skip_rest = False
+        flooding = self._flood.add(len(data))
+        if not drawing:
+            tail = len(data)
+        elif flooding:
+            tail = self._flood_tail_start(data)
+        else:
+            tail = 0
+        if tail:
+            self.skipped_bytes += tail
+            self._feed(data[:tail], drawing=False)
+            data = data[tail:]
+        self._feed(data)
+        return self._mark_pending()
+
+    def _feed(self, data, drawing=True):
+        for start in range(0, len(data), FEED_SLICE_SIZE):
+            with self._lock:
+                text = self._decoder.decode(data[start:start + FEED_SLICE_SIZE])
+                if text:
+                    self._screen.drawing = drawing and not self._skip_rest
+                    try:
+                        self._stream.feed(text)
+                    finally:
+                        self._screen.drawing = True
+
+    def _flood_tail_start(self, data):
+        """
+        마지막 몇 화면 분량이 시작하는 위치 (줄바꿈 바로 뒤). 그만큼의 줄이 없으면 0.
+        앞부분도 같은 디코더·파서로 이어서 처리하므로 어디서 나누어도 문자나
+        이스케이프 시퀀스가 깨지지 않는다.
+        """
+        keep_lines = self._screen.lines * FLOOD_TAIL_SCREENS
+        cut = len(data)
+        for _ in range(keep_lines):
+            cut = data.rfind(b"\n", 0, cut)
+            if cut <= 0:
+                return 0
+        return cut + 1
+
+    # ---------- GUI 스레드 ----------
+
+    def skip_rest(self):
+        """파싱 중인 묶음의 남은 부분을 그리지 않는다 (Ctrl+C 중단)"""
+        self._skip_rest = True
+
+    def feed_text(self, text):
+        """이미 디코딩된 텍스트(안내 문구 등)를 화면에 출력"""
+        with self._lock:
+            self._stream.feed(text)
+        return self._mark_pending()
+
+    @property
+    def size(self):
+        with self._lock:
+            return self._screen.columns, self._screen.lines
+
+    @property
+    def scroll_offset(self):
+        return self._scroll_offset
+
+    def scrollback_memory_bytes(self):
+        with self._lock:
+            return self._screen.scrollback.memory_bytes
+
+    def reset(self):
+        """새 채널용으로 화면과 디코더를 초기화 (스크롤백은 유지)"""
+        with self._lock:
+            self._screen.reset()
+            self._stream = pyte.Stream(self._screen)
+            self._decoder.reset()
+
+    def resize(self, columns, lines):
+        with self._lock:
+            if (columns, lines) == (self._screen.columns, self._screen.lines):
+                return False
+            self._screen.resize(lines, columns)
+            return True
+
+    def scroll(self, delta):
+        """스크롤백 보기 위치 이동 (delta > 0 이면 위로). 위치가 바뀌면 True"""
+        with self._lock:
+            history = self._screen.scrollback
+            offset = max(0, min(len(history), self._scroll_offset + delta))
+            if offset == self._scroll_offset:
+                return False
+            if self._scroll_offset == 0:
+                self._scroll_anchor = history.appended
+            self._scroll_offset = offset
+            if offset == 0:
+                self._screen.dirty.update(range(self._screen.lines))
+            return True
+
+    def frame(self):
+        """마지막 frame() 이후 바뀐 줄과 커서 위치를 담은 스냅샷"""
+        with self._lock:
+            self._pending = False
+            screen = self._screen
+            if self._scroll_offset:
+                return self._scrollback_frame()
+            lines = {
+                y: line_spans(screen.buffer[y], screen.columns)
+                for y in screen.dirty
+                if y < screen.lines
+            }
+            screen.dirty.clear()
+            cursor = screen.cursor
+            return TerminalFrame(lines, (cursor.x, cursor.y), not cursor.hidden)
+
+    def _scrollback_frame(self):
+        """스크롤백 위치에서 보이는 줄 전체 (스크롤 중에는 커서를 숨김)"""
+        screen = self._screen
+        history = screen.scrollback
+        # 보는 동안 새 줄이 밀려 들어와도 같은 내용을 유지
+        self._scroll_offset = min(
+            len(history), self._scroll_offset + history.appended - self._scroll_anchor
+        )
+        self._scroll_anchor = history.appended
+
+        start = len(history) - self._scroll_offset
+        lines = {}
+        for y in range(screen.lines):
+            i = start + y
+            if i < len(history):
+                lines[y] = history.spans(i)
+            else:
+                lines[y] = line_spans(screen.buffer[i - len(history)], screen.columns)
+        screen.dirty.clear()
+        return TerminalFrame(lines, (0, 0), False)
+
+    def _mark_pending(self):
+        with self._lock:
+            if self._pending:
+                return False
+            self._pending = True
+            return True
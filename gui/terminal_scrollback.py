@@ -0,0 +1,201 @@
+# gui/terminal_scrollback.py
+"""
+pyte 터미널용 스크롤백 버퍼.
+화면 위로 밀려난 줄을 Char 객체 대신 (텍스트, 속성 run-length) 형태로 압축해 보관한다.
+"""
+
+import array
+import collections
+import sys
+
+import pyte
+from wcwidth import wcwidth
+
+# 탭마다 보관하는 기본 스크롤백 줄 수
+DEFAULT_SCROLLBACK_LINES = 10000
+
+_DEFAULT_ATTRS = ("default", "default", False, False, False)
+
+
+def _char_cells(ch):
+    return max(0, wcwidth(ch[0])) if ch else 0
+
+
+class ScrollbackBuffer:
+    """
+    최대 max_lines 줄을 보관하는 스크롤백.
+
+    한 줄은 뒤쪽 기본 속성 공백을 잘라낸 str 하나로 저장하고, 기본 속성이 아닌
+    글자가 있을 때만 (글자 수, 속성 번호) run 목록을 uint32 배열 bytes로 함께 둔다.
+    속성 조합(fg, bg, bold, underscore, reverse)은 버퍼 단위로 번호를 매겨 공유한다.
+    """
+
+    def __init__(self, max_lines=DEFAULT_SCROLLBACK_LINES):
+        self._lines = collections.deque()
+        self._max_lines = max(0, int(max_lines))
+        self._attr_ids = {_DEFAULT_ATTRS: 0}
+        self._attrs = [_DEFAULT_ATTRS]
+        self._memory = 0
+        # 지금까지 추가된 전체 줄 수 (스크롤 위치 고정용)
+        self.appended = 0
+
+    def __len__(self):
+        return len(self._lines)
+
+    @property
+    def max_lines(self):
+        return self._max_lines
+
+    @property
+    def memory_bytes(self):
+        """보관 중인 줄이 차지하는 대략적인 메모리 (바이트)"""
+        return self._memory
+
+    def set_max_lines(self, max_lines):
+        self._max_lines = max(0, int(max_lines))
+        self._trim()
+
+    def clear(self):
+        self._lines.clear()
+        self._memory = 0
+
+    def append(self, line, columns):
+        """pyte 화면의 한 줄(buffer[y])을 압축해 추가"""
+        if self._max_lines == 0:
+            return
+        chars = []
+        runs = []
+        run_attr = 0
+        run_length = 0
+        for x in range(columns):
+            char = line[x]
+            if not char.data:
+                continue
+            attr = self._attr_id((char.fg, char.bg, char.bold, char.underscore, char.reverse))
+            chars.append(char.data)
+            if attr == run_attr:
+                run_length += len(char.data)
+            else:
+                if run_length:
+                    runs.append((run_length, run_attr))
+                run_attr = attr
+                run_length = len(char.data)
+
+        text = "".join(chars)
+        if run_attr == 0:
+            # 기본 속성으로 끝나는 뒤쪽 공백은 버린다
+            trailing = min(run_length, len(text) - len(text.rstrip(" ")))
+            run_length -= trailing
+            text = text[:len(text) - trailing]
+        if run_length:
+            runs.append((run_length, run_attr))
+
+        if any(attr for _, attr in runs):
+            entry = (text, array.array("I", [v for run in runs for v in run]).tobytes())
+        else:
+            entry = text
+        self._lines.append(entry)
+        self._memory += self._entry_size(entry)
+        self.appended += 1
+        self._trim()
+
+    def spans(self, index):
+        """index번째 줄을 terminal_emulator.line_spans()와 같은 span 튜플로 복원"""
+        entry = self._lines[index]
+        if isinstance(entry, str):
+            text, runs = entry, ((len(entry), 0),)
+        else:
+            text, packed = entry
+            flat = array.array("I")
+            flat.frombytes(packed)
+            runs = zip(flat[::2], flat[1::2])
+
+        spans = []
+        col = 0
+        pos = 0
+        for length, attr_id in runs:
+            attrs = self._attrs[attr_id]
+            segment = text[pos:pos + length]
+            pos += length
+            ascii_run = []
+            for ch in segment:
+                if ch.isascii():
+                    ascii_run.append(ch)
+                    continue
+                cells = _char_cells(ch)
+                if cells == 0:
+                    # 결합 문자는 앞 글자에 붙인다
+                    if ascii_run:
+                        ascii_run[-1] += ch
+                        continue
+                    if spans:
+                        prev = spans[-1]
+                        spans[-1] = (prev[0], prev[1], prev[2] + ch, *prev[3:])
+                        continue
+                if ascii_run:
+                    spans.append((col, len(ascii_run), "".join(ascii_run), *attrs))
+                    col += len(ascii_run)
+                    ascii_run = []
+                spans.append((col, max(1, cells), ch, *attrs))
+                col += max(1, cells)
+            if ascii_run:
+                spans.append((col, len(ascii_run), "".join(ascii_run), *attrs))
+                col += len(ascii_run)
+        return tuple(spans)
+
+    def _attr_id(self, attrs):
+        attr_id = self._attr_ids.get(attrs)
+        if attr_id is None:
+            attr_id = len(self._attrs)
+            self._attr_ids[attrs] = attr_id
+            self._attrs.append(attrs)
+        return attr_id
+
+    def _trim(self):
+        while len(self._lines) > self._max_lines:
+            self._memory -= self._entry_size(self._lines.popleft())
+
+    @staticmethod
+    def _entry_size(entry):
+        # deque 슬롯(포인터) + 객체 크기
+        if isinstance(entry, str):
+            return 8 + sys.getsizeof(entry)
+        text, packed = entry
+        return 8 + sys.getsizeof(entry) + sys.getsizeof(text) + sys.getsizeof(packed)
+
+
+class ScrollbackScreen(pyte.Screen):
+    """
+    전체 화면이 위로 스크롤될 때 맨 윗줄을 ScrollbackBuffer에 보관하는 pyte 화면.
+    스크롤 영역(margins)이 화면 일부로 제한된 경우(vim 등)는 보관하지 않는다.
+
+    drawing이 False인 동안에는 글자를 그리지 않는다. 제어 문자와 이스케이프
+    시퀀스(커서 이동, SGR, 스크롤 영역, 모드 전환)는 그대로 반영되므로 출력을
+    건너뛰어도 화면 상태는 이어진다. 이때 밀려나는 줄 중 건너뛰기 전에 그려진
+    내용이 있는 줄은 스크롤백에 보관하고, 건너뛰는 동안 생긴 빈 줄만 버린다.
+    """
+
+    def __init__(self, columns, lines, scrollback_lines=DEFAULT_SCROLLBACK_LINES):
+        self.scrollback = ScrollbackBuffer(scrollback_lines)
+        self.drawing = True
+        super().__init__(columns, lines)
+
+    def draw(self, data):
+        if self.drawing:
+            super().draw(data)
+
+    def index(self):
+        top, bottom = self.margins or (0, self.lines - 1)
+        if top == 0 and bottom == self.lines - 1 and self.cursor.y == bottom:
+            line = self.buffer[top]
+            if self.drawing or self._has_content(line):
+                self.scrollback.append(line, self.columns)
+        super().index()
+
+    @staticmethod
+    def _has_content(line):
+        """글자나 배경·반전 속성이 있는 줄인지 (스크롤로 새로 생긴 줄은 비어 있다)"""
+        return any(
+            char.data.strip() or char.bg != "default" or char.reverse
+            for char in line.values()
+        )
@@ -0,0 +1,135 @@
+# tools/bench_terminal_decode.py
+# 터미널 출력 디코딩 처리량 벤치마크 (ASCII/한글 혼합 로그)
+#
+# 채널에서 임의 크기 청크로 나뉘어 들어오는 출력을 흉내 내어,
+# 청크별 decode(errors="replace")와 증분 디코더를 비교합니다.
+#
+#   python tools/bench_terminal_decode.py --payload-mb 16 --hangul-ratio 0.3
+#
+# 측정 항목: 디코딩 처리량(MB/s), 깨진 문자(U+FFFD) 수, pyte 파싱 포함 처리량(--with-pyte)
+
+import argparse
+import codecs
+import random
+import time
+
+_ASCII_WORDS = ["INFO", "WARN", "request", "id=42", "GET", "/api/v1/servers", "200", "ms", "done"]
+_HANGUL_WORDS = ["서버", "연결", "성공", "실패", "재시도", "로그", "터널", "사용자", "요청"]
+
+
+def build_payload(size_bytes, hangul_ratio, seed=0):
+    rng = random.Random(seed)
+    lines = []
+    total = 0
+    n = 0
+    while total < size_bytes:
+        words = [
+            rng.choice(_HANGUL_WORDS if rng.random() < hangul_ratio else _ASCII_WORDS)
+            for _ in range(rng.randint(4, 14))
+        ]
+        line = f"[{n:08d}] " + " ".join(words) + "\r\n"
+        encoded = line.encode("utf-8")
+        lines.append(encoded)
+        total += len(encoded)
+        n += 1
+    return b"".join(lines)
+
+
+def split_chunks(payload, min_chunk, max_chunk, seed=1):
+    """채널 recv처럼 글자 경계와 무관한 위치에서 자른다."""
+    rng = random.Random(seed)
+    chunks = []
+    pos = 0
+    while pos < len(payload):
+        size = rng.randint(min_chunk, max_chunk)
+        chunks.append(payload[pos:pos + size])
+        pos += size
+    return chunks
+
+
+def _naive_decode(chunks):
+    return [chunk.decode("utf-8", errors="replace") for chunk in chunks]
+
+
+def _incremental_decode(chunks):
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    out = [decoder.decode(chunk) for chunk in chunks]
+    out.append(decoder.decode(b"", final=True))
+    return out
+
+
+def _measure(label, decode, chunks, payload_mb, repeat, feed=None):
+    best = None
+    texts = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        texts = decode(chunks)
+        if feed is not None:
+            for text in texts:
+                if text:
+                    feed(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    broken = sum(text.count("\ufffd") for text in texts)
+    return {
+        "label": label,
+        "seconds": best,
+        "mb_per_s": payload_mb / best if best else 0.0,
+        "replacement_chars": broken,
+    }
+
+
+def run_benchmark(args):
+    payload = build_payload(int(args.payload_mb * 1024 * 1024), args.hangul_ratio)
+    chunks = split_chunks(payload, args.min_chunk, args.max_chunk)
+    payload_mb = len(payload) / (1024 * 1024)
+
+    runs = [
+        _measure("청크별 decode", _naive_decode, chunks, payload_mb, args.repeat),
+        _measure("증분 디코더", _incremental_decode, chunks, payload_mb, args.repeat),
+    ]
+
+    if args.with_pyte:
+        import pyte
+
+        screen = pyte.Screen(200, 50)
+        stream = pyte.Stream(screen)
+        runs.append(_measure("증분 + pyte", _incremental_decode, chunks, payload_mb, 1,
+                             feed=stream.feed))
+
+    return {
+        "payload_mb": payload_mb,
+        "chunks": len(chunks),
+        "hangul_ratio": args.hangul_ratio,
+        "runs": runs,
+    }
+
+
+def print_report(results):
+    print()
+    print("=" * 60)
+    print(" Hshell 터미널 디코딩 벤치마크 결과")
+    print("=" * 60)
+    print(f" 입력               : {results['payload_mb']:.1f} MB, 청크 {results['chunks']}개,"
+          f" 한글 단어 비율 {results['hangul_ratio']:.0%}")
+    for run in results["runs"]:
+        print(f" {run['label']:<14}: {run['mb_per_s']:8.1f} MB/s"
+              f"  ({run['seconds']:.3f} s, 깨진 문자 {run['replacement_chars']}개)")
+    print("=" * 60)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="터미널 출력 UTF-8 디코딩 처리량 벤치마크")
+    parser.add_argument("--payload-mb", type=float, default=16.0, help="전체 출력 크기 (MB)")
+    parser.add_argument("--hangul-ratio", type=float, default=0.3, help="한글 단어 비율 (0~1)")
+    parser.add_argument("--min-chunk", type=int, default=512, help="최소 청크 크기 (바이트)")
+    parser.add_argument("--max-chunk", type=int, default=64 * 1024, help="최대 청크 크기 (바이트)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 측정 횟수 (최솟값 사용)")
+    parser.add_argument("--with-pyte", action="store_true", help="pyte 파싱까지 포함해 측정")
+    args = parser.parse_args(argv)
+
+    print_report(run_benchmark(args))
+
+
+if __name__ == '__main__':
+    main()
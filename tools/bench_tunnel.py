@@ -0,0 +1,389 @@
+# tools/bench_tunnel.py
+# SSHManager 터널의 처리량/지연 시간 벤치마크
+#
+# 별도 프로세스에서 paramiko 기반 로컬 SSH 서버와 echo/sink TCP 서버를 띄운 뒤,
+# SSHManager로 실제 터널을 열고 N개의 동시 연결을 흘려 보내 결과를 출력합니다.
+#
+#   python tools/bench_tunnel.py --connections 50 --payload-mb 8
+#
+# 측정 항목: SSH 연결 시간, 터널 연결 설정 시간, 업로드/에코 처리량(MB/s),
+#            왕복 지연 p50/p99, 측정 중 스레드 수와 메모리 사용량
+
+import argparse
+import multiprocessing
+import os
+import select
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_IO_CHUNK = 256 * 1024
+_BENCH_PASSWORD = "bench"
+
+
+# ==================== 서버 측 (별도 프로세스) ====================
+
+def _serve_echo(conn):
+    try:
+        while True:
+            data = conn.recv(_IO_CHUNK)
+            if not data:
+                break
+            conn.sendall(data)
+    except OSError:
+        pass
+    finally:
+        conn.close()
+
+
+def _serve_sink(conn):
+    """EOF까지 읽어서 버린 뒤, 받은 바이트 수를 돌려준다."""
+    total = 0
+    try:
+        while True:
+            data = conn.recv(_IO_CHUNK)
+            if not data:
+                break
+            total += len(data)
+        conn.sendall(f"{total}\n".encode())
+    except OSError:
+        pass
+    finally:
+        conn.close()
+
+
+def _start_tcp_server(handler):
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind(("127.0.0.1", 0))
+    server.listen(512)
+
+    def accept_loop():
+        while True:
+            conn, _ = server.accept()
+            threading.Thread(target=handler, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=accept_loop, daemon=True).start()
+    return server.getsockname()[1]
+
+
+def _pump_channel(channel, dest):
+    """SSH 서버 측 direct-tcpip 채널을 목적지 TCP 소켓에 연결 (half-close 지원)"""
+    try:
+        sock = socket.create_connection(dest)
+    except OSError:
+        channel.close()
+        return
+
+    readers = [sock, channel]
+    try:
+        while readers:
+            readable, _, _ = select.select(readers, [], [])
+            if sock in readable:
+                data = sock.recv(_IO_CHUNK)
+                if data:
+                    channel.sendall(data)
+                else:
+                    readers.remove(sock)
+                    channel.shutdown_write()
+            if channel in readable:
+                data = channel.recv(_IO_CHUNK)
+                if data:
+                    sock.sendall(data)
+                else:
+                    readers.remove(channel)
+                    sock.shutdown(socket.SHUT_WR)
+    except (OSError, EOFError):
+        pass
+    finally:
+        sock.close()
+        channel.close()
+
+
+def _run_ssh_server(ready_queue):
+    import paramiko
+
+    host_key = paramiko.RSAKey.generate(2048)
+
+    class BenchServer(paramiko.ServerInterface):
+        def __init__(self):
+            self.destinations = {}
+
+        def get_allowed_auths(self, username):
+            return "password"
+
+        def check_auth_password(self, username, password):
+            if password == _BENCH_PASSWORD:
+                return paramiko.AUTH_SUCCESSFUL
+            return paramiko.AUTH_FAILED
+
+        def check_channel_request(self, kind, chanid):
+            return paramiko.OPEN_SUCCEEDED
+
+        def check_channel_direct_tcpip_request(self, chanid, origin, destination):
+            self.destinations[chanid] = destination
+            return paramiko.OPEN_SUCCEEDED
+
+    def serve_transport(conn):
+        transport = paramiko.Transport(conn)
+        transport.add_server_key(host_key)
+        server = BenchServer()
+        transport.start_server(server=server)
+        while transport.is_active():
+            channel = transport.accept(1)
+            if channel is None:
+                continue
+            dest = server.destinations.pop(channel.get_id(), None)
+            if dest is None:
+                channel.close()
+                continue
+            threading.Thread(target=_pump_channel, args=(channel, dest), daemon=True).start()
+
+    ssh_port = _start_tcp_server(serve_transport)
+    echo_port = _start_tcp_server(_serve_echo)
+    sink_port = _start_tcp_server(_serve_sink)
+    ready_queue.put((ssh_port, echo_port, sink_port))
+
+    threading.Event().wait()
+
+
+# ==================== 클라이언트 측 측정 ====================
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _recv_exact(sock, size):
+    remaining = size
+    while remaining:
+        data = sock.recv(min(remaining, _IO_CHUNK))
+        if not data:
+            raise ConnectionError(f"예상보다 일찍 연결이 끊겼습니다 ({size - remaining}/{size})")
+        remaining -= len(data)
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _rss_mb():
+    """현재 RSS (Linux /proc 기준, 없으면 최대 RSS)"""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+class _ResourceSampler:
+    """벤치마크 드라이버 스레드(bench-*)를 제외한 스레드 수와 RSS의 최대값을 기록"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak_threads = 0
+        self.peak_rss_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="bench-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+
+    def sample(self):
+        threads = [t for t in threading.enumerate() if not t.name.startswith("bench-")]
+        self.peak_threads = max(self.peak_threads, len(threads))
+        self.peak_rss_mb = max(self.peak_rss_mb, _rss_mb())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+
+def _measure_setup(port):
+    """터널 연결 설정 시간: connect부터 첫 에코 바이트 수신까지"""
+    start = time.perf_counter()
+    with socket.create_connection(("127.0.0.1", port)) as sock:
+        sock.sendall(b"x")
+        _recv_exact(sock, 1)
+    return time.perf_counter() - start
+
+
+def _measure_rtt(port, samples, message_size):
+    payload = b"p" * message_size
+    rtts = []
+    with socket.create_connection(("127.0.0.1", port)) as sock:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        for _ in range(samples):
+            start = time.perf_counter()
+            sock.sendall(payload)
+            _recv_exact(sock, message_size)
+            rtts.append(time.perf_counter() - start)
+    return rtts
+
+
+def _upload_to_sink(port, payload):
+    with socket.create_connection(("127.0.0.1", port)) as sock:
+        sock.sendall(payload)
+        sock.shutdown(socket.SHUT_WR)
+        reply = b""
+        while not reply.endswith(b"\n"):
+            data = sock.recv(64)
+            if not data:
+                break
+            reply += data
+    if int(reply or b"0") != len(payload):
+        raise ConnectionError(f"sink 수신 바이트 불일치: {reply!r}")
+
+
+def _echo_roundtrip(port, payload):
+    with socket.create_connection(("127.0.0.1", port)) as sock:
+        writer = threading.Thread(target=sock.sendall, args=(payload,), name="bench-writer")
+        writer.start()
+        _recv_exact(sock, len(payload))
+        writer.join()
+
+
+def _run_concurrent(label, func, port, payload, connections):
+    with ThreadPoolExecutor(max_workers=connections, thread_name_prefix="bench-client") as pool:
+        start = time.perf_counter()
+        futures = [pool.submit(func, port, payload) for _ in range(connections)]
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - start
+    total_mb = len(payload) * connections / (1024 * 1024)
+    return {
+        "label": label,
+        "connections": connections,
+        "total_mb": total_mb,
+        "seconds": elapsed,
+        "mb_per_s": total_mb / elapsed if elapsed else 0.0,
+    }
+
+
+def run_benchmark(args):
+    from core.encryption import encrypt_password
+    from core.ssh_manager import SSHManager
+
+    ready = multiprocessing.Queue()
+    server_process = multiprocessing.Process(target=_run_ssh_server, args=(ready,), daemon=True)
+    server_process.start()
+    ssh_port, echo_port, sink_port = ready.get(timeout=30)
+
+    echo_local = _free_port()
+    sink_local = _free_port()
+    server_info = {
+        "name": "bench",
+        "host": "127.0.0.1",
+        "port": ssh_port,
+        "username": "bench",
+        "password": encrypt_password(_BENCH_PASSWORD),
+        "tunnels": [
+            {"name": "bench-echo", "local": echo_local,
+             "remote_host": "127.0.0.1", "remote_port": echo_port},
+            {"name": "bench-sink", "local": sink_local,
+             "remote_host": "127.0.0.1", "remote_port": sink_port},
+        ],
+    }
+
+    manager_kwargs = {}
+    if args.workers is not None:
+        manager_kwargs["relay_workers"] = args.workers
+    if args.buffer_kb is not None:
+        manager_kwargs["relay_buffer_size"] = args.buffer_kb * 1024
+    manager = SSHManager(server_info, **manager_kwargs)
+    known_hosts_dir = tempfile.TemporaryDirectory()
+    manager.known_hosts_file = os.path.join(known_hosts_dir.name, "known_hosts")
+
+    baseline_threads = len([t for t in threading.enumerate() if not t.name.startswith("bench-")])
+    baseline_rss = _rss_mb()
+    results = {}
+    try:
+        start = time.perf_counter()
+        if not manager.connect():
+            raise RuntimeError("SSH 연결 실패")
+        results["ssh_connect_ms"] = (time.perf_counter() - start) * 1000
+
+        setups = [_measure_setup(echo_local) for _ in range(args.setup_samples)]
+        results["setup_p50_ms"] = statistics.median(setups) * 1000
+        results["setup_p99_ms"] = _percentile(setups, 99) * 1000
+
+        rtts = _measure_rtt(echo_local, args.rtt_samples, args.rtt_size)
+        results["rtt_p50_ms"] = statistics.median(rtts) * 1000
+        results["rtt_p99_ms"] = _percentile(rtts, 99) * 1000
+
+        payload = os.urandom(int(args.payload_mb * 1024 * 1024))
+        with _ResourceSampler() as sampler:
+            upload = _run_concurrent("upload(sink)", _upload_to_sink, sink_local,
+                                     payload, args.connections)
+            echo = _run_concurrent("echo", _echo_roundtrip, echo_local,
+                                   payload, args.connections)
+        results["runs"] = [upload, echo]
+        results["threads_baseline"] = baseline_threads
+        results["threads_peak"] = sampler.peak_threads
+        results["rss_baseline_mb"] = baseline_rss
+        results["rss_peak_mb"] = sampler.peak_rss_mb
+    finally:
+        manager.disconnect()
+        server_process.terminate()
+        known_hosts_dir.cleanup()
+
+    return results
+
+
+def print_report(results):
+    print()
+    print("=" * 60)
+    print(" Hshell 터널 벤치마크 결과")
+    print("=" * 60)
+    print(f" SSH 연결 시간      : {results['ssh_connect_ms']:8.1f} ms")
+    print(f" 터널 연결 설정     : p50 {results['setup_p50_ms']:7.2f} ms"
+          f" | p99 {results['setup_p99_ms']:7.2f} ms")
+    print(f" 왕복 지연 (RTT)    : p50 {results['rtt_p50_ms']:7.3f} ms"
+          f" | p99 {results['rtt_p99_ms']:7.3f} ms")
+    for run in results["runs"]:
+        print(f" 처리량 {run['label']:<12}: {run['mb_per_s']:8.1f} MB/s"
+              f"  ({run['connections']}개 연결, {run['total_mb']:.1f} MB, {run['seconds']:.2f} s)")
+    print(f" 스레드 수          : 기준 {results['threads_baseline']} → 최대 {results['threads_peak']}")
+    print(f" 메모리 (RSS)       : 기준 {results['rss_baseline_mb']:.1f} MB"
+          f" → 최대 {results['rss_peak_mb']:.1f} MB")
+    print("=" * 60)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SSHManager 터널 처리량/지연 벤치마크")
+    parser.add_argument("--connections", type=int, default=20, help="동시 연결 수")
+    parser.add_argument("--payload-mb", type=float, default=4.0, help="연결당 전송량 (MB)")
+    parser.add_argument("--rtt-samples", type=int, default=500, help="RTT 측정 횟수")
+    parser.add_argument("--rtt-size", type=int, default=64, help="RTT 측정 메시지 크기 (바이트)")
+    parser.add_argument("--setup-samples", type=int, default=50, help="연결 설정 시간 측정 횟수")
+    parser.add_argument("--workers", type=int, default=None, help="SSHManager 릴레이 워커 수")
+    parser.add_argument("--buffer-kb", type=int, default=None, help="SSHManager 릴레이 버퍼 크기 (KiB)")
+    args = parser.parse_args(argv)
+
+    print_report(run_benchmark(args))
+
+
+if __name__ == '__main__':
+    main()